@@ -1,15 +1,18 @@
 const express = require('express');
-const multer = require('multer');
-const path = require('path');
+const busboy = require('busboy');
 const cors = require('cors');
-const fs = require('fs');
 const axios = require('axios');
-const FormData = require('form-data');
 
 const app = express();
 const port = process.env.PORT || 3001;
 // This points to your Python Transcription/Orchestrator API
 const PYTHON_API_URL = process.env.PYTHON_API_URL || 'http://127.0.0.1:8001/process-interview';
+// Raw-body variant of /process-interview that streams straight to Python's audio store
+const PYTHON_STREAM_URL = process.env.PYTHON_STREAM_URL || `${PYTHON_API_URL.replace(/\/$/, '')}/stream`;
+// Job status lives next to /process-interview on the same Python API
+const PYTHON_JOBS_URL = process.env.PYTHON_JOBS_URL || new URL('/jobs', PYTHON_API_URL).toString();
+const JOB_POLL_INTERVAL_MS = parseInt(process.env.JOB_POLL_INTERVAL_MS || '3000', 10);
+const JOB_WAIT_TIMEOUT_MS = parseInt(process.env.JOB_WAIT_TIMEOUT_MS || '1800000', 10);
 
 // Enable CORS — restrict to known origins in production via ALLOWED_ORIGINS env var
 const allowedOrigins = (process.env.ALLOWED_ORIGINS || '*').split(',').map(s => s.trim());
@@ -17,51 +20,67 @@ app.use(cors({
     origin: allowedOrigins.includes('*') ? '*' : allowedOrigins,
 }));
 
-// Create audio directory if it doesn't exist
-// AUDIO_DIR env var lets you override the path; defaults to a local 'audio' folder
-const audioDir = process.env.AUDIO_DIR || path.join(__dirname, 'audio');
-if (!fs.existsSync(audioDir)) {
-    fs.mkdirSync(audioDir, { recursive: true });
-}
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
 
-// Configure multer for audio file storage
-const storage = multer.diskStorage({
-    destination: function (req, file, cb) {
-        cb(null, audioDir);
-    },
-    filename: function (req, file, cb) {
-        cb(null, file.originalname);
+/**
+ * Polls the Python job status endpoint until the queued job finishes
+ * and returns the job result.
+ */
+async function waitForPythonJob(jobId, authorization) {
+    const deadline = Date.now() + JOB_WAIT_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+        const response = await axios.get(`${PYTHON_JOBS_URL}/${jobId}`, {
+            headers: { 'Authorization': authorization },
+            timeout: 30000
+        });
+        const job = response.data;
+        if (job.status === 'completed') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            const failedError = new Error(job.error || 'Interview processing failed');
+            failedError.statusCode = 500;
+            throw failedError;
+        }
+        await sleep(JOB_POLL_INTERVAL_MS);
     }
-});
-
-const upload = multer({ storage: storage });
+    const timeoutError = new Error(`Interview processing job ${jobId} did not finish in time`);
+    timeoutError.statusCode = 504;
+    throw timeoutError;
+}
 
 /**
- * Sends the audio file to the running Python FastAPI server (Port 8000)
- * and returns the processed Q&A + Evaluation JSON.
+ * Streams the audio to the running Python FastAPI server as it arrives, which stores
+ * and queues it as a background job, then waits for that job's submission status.
  */
-async function getTranscriptionFromPython(filePath, roomId, authorization, evaluate) {
-    const form = new FormData();
-    // Append text fields before the file to ensure reliable multipart parsing
-    form.append('room_id', roomId);
-    form.append('evaluate', evaluate);
-    form.append('file', fs.createReadStream(filePath));
-
+async function getTranscriptionFromPython(audio, filename, mimeType, roomId, authorization, evaluate, useCache) {
     try {
-        // Send POST request to Python API
-        // This request now takes longer (up to 60s) because of the LLM step
-        const response = await axios.post(PYTHON_API_URL, form, {
+        // The upload returns 202 with a job id as soon as the file is stored
+        const response = await axios.post(PYTHON_STREAM_URL, audio, {
+            params: {
+                room_id: roomId,
+                filename,
+                evaluate,
+                use_cache: useCache
+            },
             headers: {
-                'Content-Type': `multipart/form-data; boundary=${form.getBoundary()}`,
+                'Content-Type': mimeType || 'application/octet-stream',
                 'Authorization': authorization
             },
             maxContentLength: Infinity,
             maxBodyLength: Infinity,
-            timeout: 120000 // Set timeout to 2 minutes to be safe
+            timeout: 120000 // Only covers the upload itself, not the processing
         });
 
+        if (response.status === 202 && response.data.job_id) {
+            console.log(`Python API queued job ${response.data.job_id}. Waiting for it to finish...`);
+            return await waitForPythonJob(response.data.job_id, authorization);
+        }
         return response.data;
     } catch (error) {
+        if (error.statusCode) {
+            throw error;
+        }
         console.error('Python API Error:', error.code || error.message);
         if (error.response) {
             console.error('API Response:', error.response.data);
@@ -72,69 +91,89 @@ async function getTranscriptionFromPython(filePath, roomId, authorization, evalu
     }
 }
 
-// Endpoint to save audio file and trigger analysis
-app.post('/save-audio', upload.single('audio'), async (req, res) => {
-    if (!req.file) {
-        return res.status(400).json({ error: 'No audio file received' });
-    }
+const badRequest = (message) => Object.assign(new Error(message), { statusCode: 400 });
 
+/**
+ * Parses the multipart upload and pipes the audio part straight on to the
+ * Python API, so the recording is never held in the bridge's memory or on
+ * its disk. The form fields must come before the audio part.
+ * Resolves with the room id, the file name and the Python API's result.
+ */
+function forwardUpload(req) {
+    return new Promise((resolve, reject) => {
+        let parser;
+        try {
+            parser = busboy({ headers: req.headers, limits: { files: 1 } });
+        } catch (error) {
+            reject(badRequest(error.message));
+            return;
+        }
+        const fields = {};
+        let received = false;
+
+        parser.on('field', (name, value) => { fields[name] = value; });
+        parser.on('file', (name, stream, info) => {
+            if (name !== 'audio' || received) {
+                stream.resume();
+                return;
+            }
+            received = true;
+            const roomId = fields.room_id || fields.roomId;
+            if (!roomId) {
+                stream.resume();
+                reject(badRequest('room_id is required before the audio file'));
+                return;
+            }
+            const evaluate = fields.evaluate || 'true';
+            console.log(`Receiving ${info.filename}. Streaming to Python API... (evaluate=${evaluate})`);
+            getTranscriptionFromPython(
+                stream, info.filename, info.mimeType, roomId, req.headers.authorization, evaluate, fields.use_cache || 'true'
+            ).then(
+                (apiResult) => resolve({ roomId, filename: info.filename, apiResult }),
+                (error) => {
+                    // Let the rest of the request drain once Python stops reading it.
+                    stream.resume();
+                    reject(error);
+                }
+            );
+        });
+        parser.on('error', (error) => reject(badRequest(error.message)));
+        parser.on('close', () => {
+            if (!received) {
+                reject(badRequest('No audio file received'));
+            }
+        });
+        req.pipe(parser);
+    });
+}
+
+// Endpoint to save audio file and trigger analysis
+app.post('/save-audio', async (req, res) => {
     if (!req.headers.authorization) {
         return res.status(401).json({ error: 'Authorization header is required' });
     }
 
-    const roomId = req.body.room_id || req.body.roomId;
-    if (!roomId) {
-        return res.status(400).json({ error: 'room_id is required' });
-    }
-
-    const evaluate = req.body.evaluate || 'true';
-    const audioPath = req.file.path;
-    console.log(`File uploaded: ${req.file.filename}. Sending to Python API... (evaluate=${evaluate})`);
-
     try {
-        // 1. Send file to Python API (Port 8000)
-        // This will now return { transcript, qa_pairs, evaluation_report }
-        const apiResult = await getTranscriptionFromPython(audioPath, roomId, req.headers.authorization, evaluate);
-        
-        console.log("API RESULT RAW:", apiResult);
-        console.log("API RESULT KEYS:", Object.keys(apiResult));
-        
-        // 2. Prepare data to save
-        const resultData = {
-            audioFile: req.file.filename,
-            roomId,
-            timestamp: new Date().toISOString(),
+        // 1. Stream the file to the Python API as it arrives. Its processing job
+        // transcribes this side only and returns the room's submission status;
+        // the merge and evaluation run later as their own job.
+        const { roomId, filename, apiResult } = await forwardUpload(req);
+        console.log(`Recording ${filename} for room ${roomId} submitted: ${apiResult.status}`);
+
+        // 2. Send the status back to the frontend; results are read from the API once ready
+        res.json({
+            message: 'Recording submitted',
+            filename,
+            room_id: roomId,
             status: apiResult.status,
-            full_transcript: apiResult.full_transcript,
-            qa_pairs: apiResult.qa_pairs,
-            evaluation_report: apiResult.evaluation_report,
-            interview_id: apiResult.interview_id
-        };
-
-        // 3. Save the result as a JSON file next to the audio
-        const jsonFileName = req.file.filename.replace(/\.[^/.]+$/, '.json');
-        const jsonFilePath = path.join(audioDir, jsonFileName);
-        
-        fs.writeFileSync(jsonFilePath, JSON.stringify(resultData, null, 2));
-        console.log(`Analysis and Evaluation saved to ${jsonFileName}`);
-
-        // 4. Send response back to Frontend
-        res.json({ 
-            message: 'Interview processed successfully',
-            filename: req.file.filename,
-            jsonFilename: jsonFileName,
-            path: req.file.path,
             interview_id: apiResult.interview_id,
-            room_id: roomId,
-            transcription: apiResult.full_transcript,
-            qa_pairs: apiResult.qa_pairs,
-            evaluation_report: apiResult.evaluation_report // <--- SEND GRADES TO FRONTEND
+            merge_job_id: apiResult.merge_job_id
         });
 
     } catch (error) {
         console.error('Error during processing:', error.message);
         res.status(error.statusCode || 500).json({ 
-            message: 'Audio saved, but analysis failed.', 
+            message: 'Audio received, but processing failed.', 
             error: error.message 
         });
     }
@@ -20,6 +20,8 @@ function App() {
   const [joinCode, setJoinCode] = useState('');
   const [rooms, setRooms] = useState([]);
   const [interviews, setInterviews] = useState([]);
+  const [roomsCursor, setRoomsCursor] = useState(null);
+  const [interviewsCursor, setInterviewsCursor] = useState(null);
   const [selectedInterview, setSelectedInterview] = useState(null);
   const [activeRoom, setActiveRoom] = useState(null);
   const [errorMessage, setErrorMessage] = useState('');
@@ -31,6 +33,8 @@ function App() {
     setSession(null);
     setRooms([]);
     setInterviews([]);
+    setRoomsCursor(null);
+    setInterviewsCursor(null);
     setSelectedInterview(null);
     setActiveRoom(null);
     setErrorMessage('');
@@ -42,7 +46,7 @@ function App() {
     if (!tokenOverride) return;
     setLoadingWorkspace(true);
     try {
-      const [me, roomList, interviewList] = await Promise.all([
+      const [me, roomPage, interviewPage] = await Promise.all([
         apiRequest('/auth/me', { token: tokenOverride }),
         apiRequest('/rooms/mine', { token: tokenOverride }),
         apiRequest('/interviews', { token: tokenOverride }),
@@ -51,8 +55,10 @@ function App() {
       const nextSession = { token: tokenOverride, user: me };
       setSession(nextSession);
       persistSession(nextSession);
-      setRooms(roomList);
-      setInterviews(interviewList.map(normalizeInterview));
+      setRooms(roomPage.items);
+      setRoomsCursor(roomPage.next_cursor);
+      setInterviews(interviewPage.items.map(normalizeInterview));
+      setInterviewsCursor(interviewPage.next_cursor);
     } catch (error) {
       signOut();
       setErrorMessage(error.message);
@@ -62,6 +68,40 @@ function App() {
     }
   }, [session?.token, signOut]);
 
+  const loadMoreRooms = async () => {
+    if (!roomsCursor) return;
+    try {
+      const page = await apiRequest(`/rooms/mine?cursor=${encodeURIComponent(roomsCursor)}`, { token: session.token });
+      setRooms((current) => [...current, ...page.items]);
+      setRoomsCursor(page.next_cursor);
+    } catch (error) {
+      setErrorMessage(error.message);
+    }
+  };
+
+  const loadMoreInterviews = async () => {
+    if (!interviewsCursor) return;
+    try {
+      const page = await apiRequest(`/interviews?cursor=${encodeURIComponent(interviewsCursor)}`, { token: session.token });
+      setInterviews((current) => [...current, ...page.items.map(normalizeInterview)]);
+      setInterviewsCursor(page.next_cursor);
+    } catch (error) {
+      setErrorMessage(error.message);
+    }
+  };
+
+  // The list only carries summaries; transcripts and per-question scores are fetched on open
+  const openInterview = async (summary) => {
+    setSelectedInterview(summary);
+    setView('results');
+    try {
+      const detail = await apiRequest(`/interviews/${summary.id}`, { token: session.token });
+      setSelectedInterview(normalizeInterview(detail));
+    } catch (error) {
+      setErrorMessage(error.message);
+    }
+  };
+
   useEffect(() => {
     if (session?.token) {
       refreshWorkspace(session.token);
@@ -202,7 +242,7 @@ function App() {
         interview={selectedInterview || interviews[0] || null}
         interviews={interviews}
         onBack={() => setView('dashboard')}
-        onSelectInterview={(interview) => setSelectedInterview(interview)}
+        onSelectInterview={openInterview}
         onInterviewUpdate={(updated) => {
           setSelectedInterview(updated);
           setInterviews((current) => current.map((i) => i.id === updated.id ? updated : i));
@@ -230,10 +270,9 @@ function App() {
       onCreateRoom={createRoom}
       onJoinRoom={joinRoom}
       onCloseRoom={closeRoom}
-      onSelectInterview={(interview) => {
-        setSelectedInterview(interview);
-        setView('results');
-      }}
+      onSelectInterview={openInterview}
+      onLoadMoreRooms={roomsCursor ? loadMoreRooms : null}
+      onLoadMoreInterviews={interviewsCursor ? loadMoreInterviews : null}
       onSignOut={signOut}
     />
   );
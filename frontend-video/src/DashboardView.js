@@ -1,11 +1,12 @@
 import React from 'react';
 import { Icons } from './Icons';
-import { formatTimestamp, normalizeInterview, readAverageScore, scoreTone } from './utils';
+import { formatTimestamp, normalizeInterview, scoreTone } from './utils';
 
 export function DashboardView({
   user, rooms, interviews, roomName, setRoomName, roomJobRole, setRoomJobRole,
   roomPosition, setRoomPosition, joinCode, setJoinCode, loading, errorMessage,
   statusMessage, onCreateRoom, onJoinRoom, onCloseRoom, onSelectInterview, onSignOut,
+  onLoadMoreRooms, onLoadMoreInterviews,
 }) {
   return (
     <div className="dashboard-shell">
@@ -94,6 +95,7 @@ export function DashboardView({
               ))}
             </div>
           )}
+          {onLoadMoreRooms && <button className="ghost-btn compact" onClick={onLoadMoreRooms}>Load more</button>}
         </article>
 
         <article className="card list-card">
@@ -109,8 +111,8 @@ export function DashboardView({
                     <span className="row-date">{formatTimestamp(interview.created_at)}</span>
                   </div>
                   <div className="row-meta">
-                    <span className={`score-chip ${scoreTone(interview.evaluation_report?.total_score)}`}>
-                      {Math.round(readAverageScore(interview.evaluation_report))}
+                    <span className={`score-chip ${scoreTone(interview.score)}`}>
+                      {Math.round(interview.score)}
                     </span>
                     <Icons.Arrow />
                   </div>
@@ -118,6 +120,7 @@ export function DashboardView({
               ))}
             </div>
           )}
+          {onLoadMoreInterviews && <button className="ghost-btn compact" onClick={onLoadMoreInterviews}>Load more</button>}
         </article>
       </section>
     </div>
@@ -1,6 +1,7 @@
 import React, { useEffect, useRef, useState } from 'react';
 import { Icons } from './Icons';
-import { SCALEDRONE_ID, UPLOAD_BASE } from './config';
+import { LIVE_SEGMENTS, SCALEDRONE_ID, SEGMENT_MS, UPLOAD_BASE } from './config';
+import { apiRequest } from './utils';
 
 export function InterviewRoom({ user, token, room, onExit }) {
   const localVideoRef = useRef(null);
@@ -11,6 +12,7 @@ export function InterviewRoom({ user, token, room, onExit }) {
   const mediaRecorderRef = useRef(null);
   const audioChunksRef = useRef([]);
   const shouldEvaluateRef = useRef(false);
+  const segmentStateRef = useRef({ seq: 0, startedAt: 0, registered: null, uploads: [], ending: false, timer: null });
 
   const isInterviewer = user.role === 'interviewer';
 
@@ -36,6 +38,7 @@ export function InterviewRoom({ user, token, room, onExit }) {
     let peerConnection = null;
 
     const stopRecording = () => {
+      segmentStateRef.current.ending = true;
       if (mediaRecorderRef.current && mediaRecorderRef.current.state !== 'inactive') {
         mediaRecorderRef.current.stop();
       }
@@ -54,10 +57,11 @@ export function InterviewRoom({ user, token, room, onExit }) {
         const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
         const extension = mimeType.split('/')[1].split(';')[0];
         const fileName = `interview-${timestamp}.${extension}`;
+        // Fields first: the bridge forwards the audio while it is still arriving.
         const formData = new FormData();
-        formData.append('audio', audioBlob, fileName);
         formData.append('room_id', room.code);
         formData.append('evaluate', evaluate ? 'true' : 'false');
+        formData.append('audio', audioBlob, fileName);
 
         const response = await fetch(UPLOAD_BASE, {
           method: 'POST',
@@ -68,19 +72,83 @@ export function InterviewRoom({ user, token, room, onExit }) {
         const payload = await response.json().catch(() => ({}));
         if (!response.ok) throw new Error(payload.error || payload.message || 'Failed to upload interview audio');
 
-        if (payload.status === 'pending_merge') {
-          // First to upload — go back to dashboard; ResultsView will poll
-          onExitRef.current();
-        } else {
-          // Second to upload — merge already happened, go back to dashboard
-          onExitRef.current();
-        }
+        // pending_merge (first to upload) or merging (second): either way the
+        // merge and evaluation run in the background and ResultsView polls for them.
+        onExitRef.current();
+      } catch (error) {
+        setRoomError(error.message);
+        setIsProcessing(false);
+      }
+    };
+
+    const uploadSegment = async (blob, extension, seq, startMs) => {
+      const formData = new FormData();
+      formData.append('file', blob, `segment-${seq}.${extension}`);
+      formData.append('seq', String(seq));
+      formData.append('start_ms', String(Math.round(startMs)));
+      const send = async () => {
+        // Segments are placed on the call's clock, so the server needs this recording's start first.
+        await segmentStateRef.current.registered;
+        return apiRequest(`/rooms/${room.id}/segments`, { method: 'POST', body: formData, token, isForm: true });
+      };
+      // Retry once; the server ignores duplicate segment numbers.
+      return send().catch(send);
+    };
+
+    const finishSegmentedRecording = async () => {
+      if (!shouldEvaluateRef.current) {
+        onExitRef.current();
+        return;
+      }
+      setIsProcessing(true);
+      try {
+        await Promise.all(segmentStateRef.current.uploads);
+        await apiRequest(`/rooms/${room.id}/finalize`, { method: 'POST', body: { evaluate: true }, token });
+        onExitRef.current();
       } catch (error) {
         setRoomError(error.message);
         setIsProcessing(false);
       }
     };
 
+    // Records back-to-back standalone segments so each one can be decoded and transcribed on its own.
+    const startSegmentedRecording = (audioStream, mimeType) => {
+      const state = segmentStateRef.current;
+      const extension = mimeType.split('/')[1].split(';')[0];
+      state.startedAt = Date.now();
+      const registerStart = () => apiRequest(`/rooms/${room.id}/recording`, {
+        method: 'POST', body: { elapsed_ms: Date.now() - state.startedAt }, token,
+      });
+      state.registered = registerStart().catch(registerStart);
+
+      const recordSegment = () => {
+        const seq = state.seq;
+        state.seq += 1;
+        const segmentStart = Date.now() - state.startedAt;
+        const chunks = [];
+        const recorder = new MediaRecorder(audioStream, { mimeType, audioBitsPerSecond: 128000 });
+        mediaRecorderRef.current = recorder;
+        recorder.ondataavailable = (e) => { if (e.data.size > 0) chunks.push(e.data); };
+        recorder.onstop = async () => {
+          clearTimeout(state.timer);
+          if (chunks.length) {
+            state.uploads.push(uploadSegment(new Blob(chunks, { type: mimeType }), extension, seq, segmentStart));
+          }
+          if (state.ending) {
+            await finishSegmentedRecording();
+          } else if (mounted) {
+            recordSegment();
+          }
+        };
+        recorder.start(1000);
+        state.timer = setTimeout(() => {
+          if (recorder.state !== 'inactive') recorder.stop();
+        }, SEGMENT_MS);
+      };
+
+      recordSegment();
+    };
+
     const startRecording = async (stream) => {
       if (!stream || !mounted) return;
       audioChunksRef.current = [];
@@ -92,6 +160,11 @@ export function InterviewRoom({ user, token, room, onExit }) {
       const selectedMimeType = mimeTypes.find((t) => window.MediaRecorder.isTypeSupported(t));
       if (!selectedMimeType) return;
 
+      if (LIVE_SEGMENTS) {
+        startSegmentedRecording(audioStream, selectedMimeType);
+        return;
+      }
+
       const mediaRecorder = new MediaRecorder(audioStream, { mimeType: selectedMimeType, audioBitsPerSecond: 128000 });
       mediaRecorderRef.current = mediaRecorder;
       mediaRecorder.ondataavailable = (e) => { if (e.data.size > 0) audioChunksRef.current.push(e.data); };
@@ -169,6 +242,7 @@ export function InterviewRoom({ user, token, room, onExit }) {
           setCallEndedByInterviewer(true);
           setCallActive(false);
           // Stop recording — onstop will check shouldEvaluateRef
+          segmentStateRef.current.ending = true;
           if (mediaRecorderRef.current && mediaRecorderRef.current.state !== 'inactive') {
             mediaRecorderRef.current.stop();
           }
@@ -224,6 +298,7 @@ export function InterviewRoom({ user, token, room, onExit }) {
     }
 
     // Stop own recording — onstop handler will upload or exit
+    segmentStateRef.current.ending = true;
     if (mediaRecorderRef.current && mediaRecorderRef.current.state !== 'inactive') {
       mediaRecorderRef.current.stop();
     }
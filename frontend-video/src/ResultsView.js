@@ -1,55 +1,75 @@
-import React, { useEffect, useState, useRef } from 'react';
+import React, { useEffect, useState } from 'react';
 import { Icons } from './Icons';
 import { API_BASE } from './config';
-import { formatTimestamp, scoreTone, readAverageScore, normalizeInterview } from './utils';
+import { formatTimestamp, formatTalkTime, scoreTone, readAverageScore, normalizeInterview } from './utils';
 
 export function ResultsView({ user, token, interview, interviews, onBack, onSelectInterview, onInterviewUpdate }) {
   const [liveInterview, setLiveInterview] = useState(interview);
-  const [pollFailed, setPollFailed] = useState(false);
-  const pollRef = useRef(null);
-  const failTimerRef = useRef(null);
+  const [streamFailed, setStreamFailed] = useState(false);
 
-  const isLoading = liveInterview && liveInterview.status === 'pending_merge' && !pollFailed;
+  const isEvaluating = liveInterview && (liveInterview.status === 'pending_merge' || liveInterview.status === 'evaluating');
+  const isLoading = isEvaluating && !streamFailed && !(liveInterview.evaluation_report?.results || []).some(Boolean);
 
   useEffect(() => {
     setLiveInterview(interview);
-    setPollFailed(false);
+    setStreamFailed(false);
   }, [interview]);
 
   useEffect(() => {
-    if (!liveInterview?.id || liveInterview.status !== 'pending_merge') return;
+    if (!liveInterview?.id || !isEvaluating) return;
 
-    const poll = async () => {
+    // Verdicts arrive one pair at a time while the rest are still being scored
+    const source = new EventSource(`${API_BASE}/interviews/${liveInterview.id}/events?token=${encodeURIComponent(token)}`);
+
+    const updateReport = (update) => {
+      setLiveInterview((current) => {
+        const report = current.evaluation_report || {};
+        return { ...current, status: 'evaluating', evaluation_report: { ...report, ...update(report) } };
+      });
+    };
+
+    source.addEventListener('verdict', (event) => {
+      const { index, total, result } = JSON.parse(event.data);
+      updateReport((report) => {
+        const results = Array.from({ length: total }, (_, i) => (report.results || [])[i] || null);
+        results[index] = result;
+        return { results };
+      });
+    });
+
+    source.addEventListener('score', (event) => {
+      const { total_score: totalScore, completed, total } = JSON.parse(event.data);
+      updateReport(() => ({ total_score: totalScore, completed, total }));
+    });
+
+    source.addEventListener('complete', async () => {
+      source.close();
       try {
         const res = await fetch(`${API_BASE}/interviews/${liveInterview.id}`, {
           headers: { Authorization: `Bearer ${token}` },
         });
-        if (!res.ok) return;
-        const data = await res.json();
-        if (data.status === 'completed' || data.status === 'skipped') {
-          clearInterval(pollRef.current);
-          clearTimeout(failTimerRef.current);
-          const updated = normalizeInterview(data);
-          setLiveInterview(updated);
-          if (onInterviewUpdate) onInterviewUpdate(updated);
-        }
-      } catch (_) { /* retry next tick */ }
-    };
+        if (!res.ok) throw new Error('Failed to load interview');
+        const updated = normalizeInterview(await res.json());
+        setLiveInterview(updated);
+        if (onInterviewUpdate) onInterviewUpdate(updated);
+      } catch (_) {
+        setStreamFailed(true);
+      }
+    });
 
-    pollRef.current = setInterval(poll, 5000);
-    failTimerRef.current = setTimeout(() => {
-      clearInterval(pollRef.current);
-      setPollFailed(true);
-    }, 120000); // 2 minutes timeout
+    source.addEventListener('error', (event) => {
+      // Network drops are retried by EventSource itself; only give up on server-reported failures
+      if (event.data || source.readyState === EventSource.CLOSED) {
+        source.close();
+        setStreamFailed(true);
+      }
+    });
 
-    return () => {
-      clearInterval(pollRef.current);
-      clearTimeout(failTimerRef.current);
-    };
-  }, [liveInterview?.id, liveInterview?.status, token, onInterviewUpdate]);
+    return () => source.close();
+  }, [liveInterview?.id, isEvaluating, token, onInterviewUpdate]);
 
   const report = liveInterview?.evaluation_report || {};
-  const results = report.results || [];
+  const results = (report.results || []).filter(Boolean);
   const score = readAverageScore(report);
 
   if (isLoading) {
@@ -68,14 +88,14 @@ export function ResultsView({ user, token, interview, interviews, onBack, onSele
           <div className="loading-panel">
             <Icons.Loader />
             <h2>Evaluating interview…</h2>
-            <p>The AI is analyzing the recordings. This may take a minute or two.</p>
+            <p>The AI is analyzing the recordings. Scores will appear here as each answer is evaluated.</p>
           </div>
         </div>
       </div>
     );
   }
 
-  if (pollFailed) {
+  if (streamFailed && !results.length) {
     return (
       <div className="results-shell">
         <header className="results-topbar">
@@ -124,6 +144,10 @@ export function ResultsView({ user, token, interview, interviews, onBack, onSele
             <div><span>Room</span><strong>{liveInterview?.room_code || liveInterview?.room_id}</strong></div>
             <div><span>Recorded</span><strong>{formatTimestamp(liveInterview?.created_at)}</strong></div>
           </div>
+          <div className="summary-row">
+            <div><span>Interviewer talk time</span><strong>{formatTalkTime(liveInterview?.interviewer_talk_ms, liveInterview?.interviewer_speech_ratio)}</strong></div>
+            <div><span>Candidate talk time</span><strong>{formatTalkTime(liveInterview?.candidate_talk_ms, liveInterview?.candidate_speech_ratio)}</strong></div>
+          </div>
           {liveInterview?.full_transcript && (
             <div className="transcript-block">
               <h3>Transcript</h3>
@@ -144,8 +168,8 @@ export function ResultsView({ user, token, interview, interviews, onBack, onSele
                   <strong>{item.room_code || item.room_id}</strong>
                   <span>{formatTimestamp(item.created_at)}</span>
                 </div>
-                <span className={`score-chip ${scoreTone(item.evaluation_report?.total_score)}`}>
-                  {Math.round(readAverageScore(item.evaluation_report))}
+                <span className={`score-chip ${scoreTone(item.score)}`}>
+                  {Math.round(item.score)}
                 </span>
               </button>
             ))}
@@ -156,7 +180,9 @@ export function ResultsView({ user, token, interview, interviews, onBack, onSele
       <section className="card questions-panel">
         <div className="card-header">
           <h3>Interview breakdown</h3>
-          <span className="count-badge">{results.length} scored</span>
+          <span className="count-badge">
+            {isEvaluating && report.total ? `${results.length} of ${report.total} scored` : `${results.length} scored`}
+          </span>
         </div>
 
         <div className="result-cards">
@@ -174,7 +200,9 @@ export function ResultsView({ user, token, interview, interviews, onBack, onSele
                     </div>
                     <h4>{item.question}</h4>
                   </div>
-                  <span className={`score-chip ${scoreTone(item.score)}`}>{item.score}/100</span>
+                  <span className={`score-chip ${scoreTone(item.score)}`}>
+                    {item.score === null || item.score === undefined ? 'Not scored' : `${item.score}/100`}
+                  </span>
                 </div>
                 <p className="answer-text"><strong>Answer:</strong> {item.candidate_answer || item.answer}</p>
                 {item.feedback && <div className="feedback-box">{item.feedback}</div>}
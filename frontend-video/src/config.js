@@ -2,3 +2,6 @@ export const API_BASE = process.env.REACT_APP_API_URL || 'http://127.0.0.1:8001'
 export const UPLOAD_BASE = process.env.REACT_APP_UPLOAD_URL || 'http://localhost:3001/save-audio';
 export const SCALEDRONE_ID = process.env.REACT_APP_SCALEDRONE_ID || 'yiS12Ts5RdNhebyM';
 export const STORAGE_KEY = 'fair-view-session';
+// Upload the recording in timed segments during the call so only merge + evaluation remain at the end
+export const LIVE_SEGMENTS = process.env.REACT_APP_LIVE_SEGMENTS === 'true';
+export const SEGMENT_MS = Number(process.env.REACT_APP_SEGMENT_MS || 60000);
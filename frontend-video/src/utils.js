@@ -44,6 +44,13 @@ export function formatTimestamp(value) {
   }).format(date);
 }
 
+export function formatTalkTime(talkMs, speechRatio) {
+  if (talkMs == null) return '—';
+  const seconds = Math.round(talkMs / 1000);
+  const clock = `${Math.floor(seconds / 60)}:${String(seconds % 60).padStart(2, '0')}`;
+  return speechRatio == null ? clock : `${clock} (${Math.round(speechRatio * 100)}% of recording)`;
+}
+
 export function scoreTone(score) {
   const numericScore = Number(score || 0);
   if (numericScore >= 80) return 'success';
@@ -62,7 +69,8 @@ export function normalizeInterview(item) {
   return {
     ...item,
     evaluation_report: report,
-    score: readAverageScore(report),
+    // List summaries carry total_score directly; full interviews carry the report
+    score: item.total_score ?? readAverageScore(report),
     qa_pairs: item.qa_pairs || [],
   };
 }
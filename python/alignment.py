@@ -0,0 +1,176 @@
+import os
+import re
+
+import numpy as np
+from pydub import AudioSegment
+
+from vad import NOISE_FLOOR_PERCENTILE, VAD_ENERGY_OFFSET_DB, frame_features
+
+
+ALIGN_FRAME_MS = 20
+# Largest difference between the two recordings' start times that is searched.
+ALIGN_MAX_OFFSET_SECONDS = float(os.getenv("ALIGN_MAX_OFFSET_SECONDS", "120"))
+# How many standard deviations the correlation peak must stand above the other lags to be trusted.
+ALIGN_MIN_PEAK_Z = float(os.getenv("ALIGN_MIN_PEAK_Z", "8"))
+# A segment is bleed-through when, in nearly all of its speech frames, the other
+# microphone is this much louder (relative to each microphone's speech level).
+BLEED_MARGIN_DB = float(os.getenv("BLEED_MARGIN_DB", "6"))
+BLEED_MIN_FRACTION = 0.8
+# Turns overlapping by more than this leave their order to the LLM.
+TURN_OVERLAP_TOLERANCE_MS = int(os.getenv("TURN_OVERLAP_TOLERANCE_MS", "1000"))
+# Turns paired without the LLM must each have at least this many words; shorter ones are usually filler.
+TURN_MIN_WORDS = int(os.getenv("TURN_MIN_WORDS", "4"))
+ENVELOPE_FLOOR_DB = -100
+# Percentile of a recording's frame energies taken as its speaking level.
+SPEECH_LEVEL_PERCENTILE = 90
+# Speech-to-text output is mostly unpunctuated, so a question is also recognised by how it opens.
+QUESTION_OPENING = re.compile(
+    r"^(?:(?:so|and|okay|ok|now|next|alright|right)\b\W*)*"
+    r"(?:what|why|how|when|where|which|who|whose|can|could|would|will|do|does|did|is|are|have|has|should"
+    r"|tell me|describe|explain|walk me|talk me|give me|share|imagine|suppose)\b",
+    re.IGNORECASE,
+)
+
+
+def energy_envelope(audio: AudioSegment) -> list[int]:
+    """Energy of every ALIGN_FRAME_MS frame in whole dBFS: small enough to keep with the job, fine enough to align."""
+    pcm = audio.set_channels(1).set_sample_width(2)
+    energy, _ = frame_features(np.frombuffer(pcm.raw_data, dtype=np.int16), pcm.frame_rate * ALIGN_FRAME_MS // 1000)
+    return np.clip(np.round(energy), ENVELOPE_FLOOR_DB, 0).astype(int).tolist()
+
+
+def place_envelopes(pieces: list[tuple[int, list[int]]]) -> list[int]:
+    """Join the envelopes of recordings starting at the given call times into one envelope on the call's clock.
+
+    Time not covered by any recording is filled with the covered part's noise
+    floor, so it reads as silence without skewing the levels ``suppress_bleed`` derives.
+    """
+    if not pieces:
+        return []
+    floor = int(np.percentile(np.concatenate([envelope for _, envelope in pieces]), NOISE_FLOOR_PERCENTILE))
+    starts = [max(0, start_ms) // ALIGN_FRAME_MS for start_ms, _ in pieces]
+    joined = np.full(max(start + len(envelope) for start, (_, envelope) in zip(starts, pieces)), floor, dtype=int)
+    for start, (_, envelope) in zip(starts, pieces):
+        joined[start:start + len(envelope)] = envelope
+    return joined.tolist()
+
+
+def _activity(envelope: np.ndarray) -> np.ndarray:
+    # Level above the noise floor, zero-mean: shared speech and shared silence line up, hiss doesn't.
+    floored = np.maximum(envelope, np.percentile(envelope, NOISE_FLOOR_PERCENTILE)).astype(np.float64)
+    return floored - floored.mean()
+
+
+def estimate_offset(reference: np.ndarray, other: np.ndarray) -> tuple[int, float]:
+    """Return ``(offset_ms, peak_z)`` such that ``other`` time + ``offset_ms`` = ``reference`` time.
+
+    The envelopes are cross-correlated at every lag at once through one FFT.
+    Each microphone hears some of the other speaker, so both envelopes rise
+    and fall together at the true lag. ``peak_z`` says how clearly that lag
+    beats the others.
+    """
+    a, b = _activity(reference), _activity(other)
+    size = 1 << (len(a) + len(b) - 1).bit_length()
+    correlation = np.fft.irfft(np.fft.rfft(a, size) * np.conj(np.fft.rfft(b, size)), size)
+    max_lag = min(int(ALIGN_MAX_OFFSET_SECONDS * 1000 / ALIGN_FRAME_MS), size // 2 - 1)
+    # Negative lags wrap around to the end of the circular correlation.
+    lags = np.concatenate((np.arange(0, max_lag + 1), np.arange(-max_lag, 0)))
+    values = correlation[lags]
+    best = int(np.argmax(values))
+    peak_z = (values[best] - values.mean()) / (values.std() + 1e-9)
+    return int(lags[best]) * ALIGN_FRAME_MS, float(peak_z)
+
+
+def suppress_bleed(segments: list[dict], own: np.ndarray, other: np.ndarray, shift_ms: int) -> tuple[list[dict], int]:
+    """Drop the segments in which this microphone mostly picked up the other speaker.
+
+    ``shift_ms`` maps this recording's time onto the other's. Levels are taken
+    relative to each microphone's speaking level, so a louder mic or a quieter
+    voice doesn't count as bleed. Returns the kept segments and how many were dropped.
+    """
+    threshold = np.percentile(own, NOISE_FLOOR_PERCENTILE) + VAD_ENERGY_OFFSET_DB
+    own_level, other_level = np.percentile(own, SPEECH_LEVEL_PERCENTILE), np.percentile(other, SPEECH_LEVEL_PERCENTILE)
+    shift = round(shift_ms / ALIGN_FRAME_MS)
+    kept, dropped = [], 0
+    for segment in segments:
+        frames = np.arange(segment["start_ms"] // ALIGN_FRAME_MS, min(len(own), segment["end_ms"] // ALIGN_FRAME_MS))
+        mine = own[frames]
+        speaking = mine > threshold
+        if speaking.any():
+            theirs_index = frames[speaking] + shift
+            inside = (theirs_index >= 0) & (theirs_index < len(other))
+            theirs = np.full(len(theirs_index), ENVELOPE_FLOOR_DB, dtype=np.float64)
+            theirs[inside] = other[theirs_index[inside]]
+            louder = (theirs - other_level) - (mine[speaking] - own_level) >= BLEED_MARGIN_DB
+            if louder.mean() >= BLEED_MIN_FRACTION:
+                dropped += 1
+                continue
+        kept.append(segment)
+    return kept, dropped
+
+
+def build_turns(interviewer: list[dict], candidate: list[dict], candidate_shift_ms: int) -> list[dict]:
+    """Interleave both participants' timed segments into speaker turns on the interviewer's clock."""
+    tagged = [{**segment, "speaker": "interviewer"} for segment in interviewer] + [
+        {**segment, "speaker": "candidate", "start_ms": segment["start_ms"] + candidate_shift_ms, "end_ms": segment["end_ms"] + candidate_shift_ms}
+        for segment in candidate
+    ]
+    turns: list[dict] = []
+    for segment in sorted(tagged, key=lambda item: item["start_ms"]):
+        if turns and turns[-1]["speaker"] == segment["speaker"]:
+            turns[-1]["end_ms"] = max(turns[-1]["end_ms"], segment["end_ms"])
+            turns[-1]["text"] = f"{turns[-1]['text']} {segment['text']}"
+            continue
+        turns.append({key: segment[key] for key in ("speaker", "start_ms", "end_ms", "text")})
+    return turns
+
+
+def is_question(text: str) -> bool:
+    text = text.strip()
+    return "?" in text or QUESTION_OPENING.match(text) is not None
+
+
+def turns_are_unambiguous(turns: list[dict]) -> bool:
+    """True when the turns can be paired as they stand, without the LLM.
+
+    The speakers must strictly alternate, from an interviewer question to
+    the candidate's answer, with nobody talking over anyone. Every turn must
+    be at least TURN_MIN_WORDS long and every interviewer turn must read as a
+    question, so greetings and "okay, next" don't become evaluated questions.
+    """
+    return (
+        len(turns) >= 2
+        and turns[0]["speaker"] == "interviewer"
+        and turns[-1]["speaker"] == "candidate"
+        and all(current["speaker"] != following["speaker"] for current, following in zip(turns, turns[1:]))
+        and all(current["end_ms"] - following["start_ms"] <= TURN_OVERLAP_TOLERANCE_MS for current, following in zip(turns, turns[1:]))
+        and all(len(turn["text"].split()) >= TURN_MIN_WORDS for turn in turns)
+        and all(is_question(turn["text"]) for turn in turns if turn["speaker"] == "interviewer")
+    )
+
+
+def _sentence(text: str, ending: str) -> str:
+    # The cleanup the LLM merge would otherwise do: one capitalised sentence with closing punctuation.
+    text = " ".join(text.split())
+    if not text:
+        return text
+    text = text[0].upper() + text[1:]
+    return text if text[-1] in ".?!" else text + ending
+
+
+def pair_turns(turns: list[dict]) -> list[dict]:
+    """Each interviewer turn is a question; the candidate turn after it is the answer."""
+    pairs = []
+    for index, turn in enumerate(turns):
+        if turn["speaker"] != "interviewer":
+            continue
+        following = turns[index + 1] if index + 1 < len(turns) else None
+        pairs.append({"question": _sentence(turn["text"], "?"), "answer": _sentence(following["text"], ".") if following else ""})
+    return pairs
+
+
+def format_turns(turns: list[dict]) -> str:
+    return "\n".join(
+        f"[{turn['start_ms'] // 60000:02d}:{turn['start_ms'] // 1000 % 60:02d}] {turn['speaker'].upper()}: {turn['text']}"
+        for turn in turns
+    )
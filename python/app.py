@@ -1,56 +1,113 @@
+import asyncio
+import base64
+import hmac
 import json
 import logging
 import os
-import re
-import shutil
-import time
 import uuid
 from contextlib import asynccontextmanager
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Callable, Optional
 
-import google.generativeai as genai
-import speech_recognition as sr
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, UploadFile
+from fastapi import Depends, FastAPI, File, Form, Header, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydub import AudioSegment
-from sqlalchemy import desc, or_
+from fastapi.responses import Response, StreamingResponse
+import numpy as np
+from sqlalchemy import and_, desc, or_, select, union, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from database import Base, engine, get_db
-from models import Interview, Room, User
-from schemas import AuthResponse, AuthSigninIn, AuthSignupIn, InterviewOut, RoomCreateIn, RoomJoinIn, RoomOut, UserOut
-from security import create_access_token, decode_access_token, get_password_hash, parse_bearer_token, verify_password
+# Load .env before the local modules below read their settings at import time.
+load_dotenv()
 
+from alignment import (
+    ALIGN_MIN_PEAK_Z,
+    build_turns,
+    energy_envelope,
+    estimate_offset,
+    format_turns,
+    pair_turns,
+    place_envelopes,
+    suppress_bleed,
+    turns_are_unambiguous,
+)
+from archive import schedule_archive
+from artifacts import read_artifacts, read_artifacts_async, store_artifact
+from audio_storage import AUDIO_DIR, ContentAddressedWriter, decode_pcm
+from auth import CurrentUser, check_login_rate, get_current_user, get_stream_user, issue_access_token, revoke_tokens
+from database import SessionLocal, dispose_async_engine, get_async_sessionmaker, get_db
+from evaluation import EVALUATION_MODE, evaluate_pairs
+from executors import ExecutorSaturated, configure_threadpool, run_password_hash, shutdown_cpu_executor
+from init_db import upgrade_database
+from jobs import JOB_WORKERS, JobContext, JobDeferred, JobWorkerPool, enqueue, register_handler
+from llm import GEMINI_MODEL, LLMUsage, estimate_tokens, generate_validated
+from llm_cache import cache_key, read_cache, write_cache
+from metrics import render_metrics
+from models import Interview, Job, Room, RoomSubmission, TranscriptSegment, User
+from schemas import (
+    AuthResponse,
+    AuthSigninIn,
+    AuthSignupIn,
+    InterviewOut,
+    InterviewPage,
+    InterviewSummaryOut,
+    JobOut,
+    PasswordChangeIn,
+    RoomCreateIn,
+    RoomFinalizeIn,
+    RoomRecordingIn,
+    RoomJoinIn,
+    RoomOut,
+    RoomPage,
+    TranscriptSegmentOut,
+    UserOut,
+)
+from security import get_password_hash, verify_and_update, verify_password
+from structured import QA_PAIRS_SCHEMA, OutputError, QAPair, parse_items
+from transcription import get_transcriber, join_segments, speech_summary, transcribe_segments
+from windowing import map_windows, plan_windows, stitch_pairs, text_windows, transcript_pair_windows
 
-load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-model = None
-
-
-def get_gemini_model():
-    global model
-    if model is None:
-        if not GEMINI_API_KEY:
-            raise HTTPException(status_code=503, detail="GEMINI_API_KEY is not configured")
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-2.5-flash")
-    return model
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Initializing database...")
-    Base.metadata.create_all(bind=engine)
+    configure_threadpool()
+    if DB_AUTO_MIGRATE:
+        upgrade_database()
+    if JOB_WORKERS:
+        # Load the speech-to-text backend up front so the first job doesn't pay for it.
+        get_transcriber()
+        with SessionLocal() as db:
+            schedule_archive(db)
+    workers = JobWorkerPool(JOB_WORKERS)
+    workers.start()
     yield
-
-
+    workers.stop()
+    shutdown_cpu_executor()
+    await dispose_async_engine()
+
+
+# Run pending migrations at startup; disable when several workers share one database.
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "true").lower() != "false"
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# How long a finalized live recording waits for its outstanding segment transcriptions.
+LIVE_SEGMENT_WAIT_SECONDS = int(os.getenv("LIVE_SEGMENT_WAIT_SECONDS", "600"))
+# How long the first submission waits for the other participant before it is evaluated alone.
+RENDEZVOUS_TIMEOUT_SECONDS = int(os.getenv("RENDEZVOUS_TIMEOUT_SECONDS", "900"))
+RENDEZVOUS_RECHECK_SECONDS = 30
+EVALUATION_STREAM_POLL_SECONDS = float(os.getenv("EVALUATION_STREAM_POLL_SECONDS", "1.0"))
+EVALUATION_STREAM_HEARTBEAT_SECONDS = 15.0
+PAGE_SIZE_DEFAULT = 20
+PAGE_SIZE_MAX = 100
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
+# When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
 
 app = FastAPI(lifespan=lifespan)
 app.add_middleware(
@@ -62,7 +119,7 @@ app.add_middleware(
 )
 
 
-def user_out(user: User) -> UserOut:
+def user_out(user: User | CurrentUser) -> UserOut:
     return UserOut.model_validate(user)
 
 
@@ -70,7 +127,12 @@ def room_out(room: Room) -> RoomOut:
     return RoomOut.model_validate(room)
 
 
-def interview_out(interview: Interview, room: Optional[Room] = None) -> InterviewOut:
+def interview_out(db: Session, interview: Interview, room: Optional[Room] = None) -> InterviewOut:
+    refs = (interview.transcript_ref, interview.qa_pairs_ref, interview.report_ref)
+    blobs = read_artifacts(db, refs)
+    transcript, qa_pairs, report = (blobs.get(ref) for ref in refs)
+    if report is None and interview.status == "evaluating":
+        report = evaluation_progress(db.execute(merge_job_query(interview.id)).scalars().first())
     return InterviewOut(
         id=interview.id,
         room_id=interview.room_id,
@@ -79,101 +141,87 @@ def interview_out(interview: Interview, room: Optional[Room] = None) -> Intervie
         candidate_id=interview.candidate_id,
         created_by_id=interview.created_by_id,
         audio_file=interview.audio_file,
-        json_file=interview.json_file,
-        full_transcript=interview.full_transcript,
-        qa_pairs=interview.qa_pairs or [],
-        evaluation_report=interview.evaluation_report or {},
+        interviewer_talk_ms=interview.interviewer_talk_ms,
+        interviewer_speech_ratio=interview.interviewer_speech_ratio,
+        candidate_talk_ms=interview.candidate_talk_ms,
+        candidate_speech_ratio=interview.candidate_speech_ratio,
+        full_transcript=transcript,
+        qa_pairs=qa_pairs or [],
+        evaluation_report=report or {},
         status=interview.status,
         created_at=interview.created_at,
         completed_at=interview.completed_at,
     )
 
 
-def get_current_user(authorization: Optional[str], db: Session) -> User:
-    try:
-        token = parse_bearer_token(authorization)
-        payload = decode_access_token(token)
-        user_id = payload.get("sub")
-        if not user_id:
-            raise ValueError("Missing subject")
-    except Exception as exc:
-        raise HTTPException(status_code=401, detail="Invalid or missing token") from exc
-
-    user = db.get(User, user_id)
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
-    return user
-
-
-def convert_to_wav(input_path, output_path):
-    if input_path.endswith(".webm"):
-        AudioSegment.from_file(input_path, format="webm").export(output_path, format="wav")
-    else:
-        AudioSegment.from_file(input_path).export(output_path, format="wav")
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{item_id}".encode()).decode()
 
 
-def transcribe_audio(wav_path):
-    recognizer = sr.Recognizer()
-    with sr.AudioFile(wav_path) as source:
-        audio = recognizer.record(source)
-        try:
-            return recognizer.recognize_google(audio)
-        except Exception:
-            pass
-
-    # Fallback: split long recordings into smaller chunks to improve recognition reliability.
-    try:
-        audio_segment = AudioSegment.from_wav(wav_path)
-        chunk_ms = 30_000
-        transcripts = []
-
-        for start in range(0, len(audio_segment), chunk_ms):
-            chunk = audio_segment[start : start + chunk_ms]
-            if chunk.rms < 120:
-                continue
-
-            chunk_path = f"{wav_path}.chunk.{start}.wav"
-            chunk.export(chunk_path, format="wav")
-
-            try:
-                with sr.AudioFile(chunk_path) as source:
-                    chunk_audio = recognizer.record(source)
-                text = recognizer.recognize_google(chunk_audio)
-                if text:
-                    transcripts.append(text)
-            except Exception:
-                pass
-            finally:
-                if os.path.exists(chunk_path):
-                    os.remove(chunk_path)
-
-        return " ".join(transcripts).strip()
-    except Exception:
-        return ""
-
-
-def process_qa(raw_text):
-    """Extract Q&A pairs from a raw interview transcript using Gemini."""
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
     try:
-        qa_pairs = _extract_qa_with_llm(raw_text)
-        if qa_pairs:
-            full_text = " ".join(
-                f"{p['question']} {p['answer']}" for p in qa_pairs
-            ).strip()
-            return full_text, qa_pairs
+        created_at, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), item_id
     except Exception as exc:
-        logger.warning("LLM Q&A extraction failed: %s", exc)
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def keyset_page(model, branches: list, cursor: Optional[str], limit: int):
+    """Select the ids of one newest-first page from the union of ``branches``.
+
+    Each branch is a ``select`` over ``model`` that one composite index can
+    serve, which a single query with ``OR``ed filters cannot. The cursor and
+    limit are applied inside every branch so each index scan stops early, and
+    UNION drops rows matched by more than one branch.
+    """
+    order = (desc(model.created_at), desc(model.id))
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        after = or_(model.created_at < created_at, and_(model.created_at == created_at, model.id < item_id))
+        branches = [branch.where(after) for branch in branches]
+    parts = [select(*branch.order_by(*order).limit(limit + 1).subquery().c) for branch in branches]
+    merged = union(*parts).subquery()
+    return select(merged.c.id).order_by(desc(merged.c.created_at), desc(merged.c.id)).limit(limit + 1).subquery()
+
+
+def page_rows(rows: list, limit: int) -> tuple[list, Optional[str]]:
+    """Trim the look-ahead row fetched by ``keyset_page`` and return the next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+# Bump a template version whenever its prompt changes so cached outputs are not reused.
+EXTRACT_QA_TEMPLATE = "extract_qa/v1"
+MERGE_TRANSCRIPTS_TEMPLATE = "merge_transcripts/v1"
+MERGE_TURNS_TEMPLATE = "merge_turns/v1"
+# Added to any of the above when the prompt holds one window of a longer transcript.
+EXCERPT_TEMPLATE = "excerpt/v1"
+EXCERPT_NOTE = """
+This is one excerpt of a longer interview, and neighbouring excerpts overlap.
+If it opens partway through an answer whose question is not included, leave
+that answer out. If it ends partway through an answer, include the question
+with as much of the answer as is there.
+"""
 
-    return raw_text, []
 
+def _template(name: str, excerpt: bool) -> str:
+    return f"{name}+{EXCERPT_TEMPLATE}" if excerpt else name
+
+
+def _extract_qa_with_llm(raw_text: str, use_cache: bool = True, excerpt: bool = False) -> list[dict]:
+    template = _template(EXTRACT_QA_TEMPLATE, excerpt)
+    cached = read_cache(cache_key(GEMINI_MODEL, template, raw_text), use_cache)
+    if cached is not None:
+        return cached
 
-def _extract_qa_with_llm(raw_text: str) -> list[dict]:
     prompt = f"""You are an expert at analysing interview transcripts.
 
 The following is a raw, unpunctuated transcript of a technical interview.
 It contains one or more questions asked by the interviewer, each followed
 by the candidate's answer.
-
+{EXCERPT_NOTE if excerpt else ""}
 Your task:
 1. Identify every distinct question the interviewer asked.
 2. For each question, extract the candidate's answer that follows it.
@@ -190,29 +238,22 @@ Return ONLY a JSON array (no markdown, no explanation) in this exact format:
 Transcript:
 {raw_text}
 """
-    response = get_gemini_model().generate_content(prompt)
-    parsed = clean_json(response.text, fallback=[])
-    if isinstance(parsed, list) and parsed:
-        # Validate each entry has the required keys
-        valid = []
-        for item in parsed:
-            if isinstance(item, dict) and "question" in item:
-                valid.append({
-                    "question": str(item["question"]).strip(),
-                    "answer": str(item.get("answer", "")).strip(),
-                })
-        return valid
-    return []
-
-
-def _merge_transcripts_with_llm(interviewer_text: str, candidate_text: str) -> list[dict]:
+    return _generate_qa_pairs(prompt, "extract_qa", template, raw_text)
+
+
+def _merge_transcripts_with_llm(interviewer_text: str, candidate_text: str, use_cache: bool = True, excerpt: bool = False) -> list[dict]:
     """Merge two separate audio transcripts (one per participant) into Q&A pairs."""
+    template = _template(MERGE_TRANSCRIPTS_TEMPLATE, excerpt)
+    cached = read_cache(cache_key(GEMINI_MODEL, template, interviewer_text, candidate_text), use_cache)
+    if cached is not None:
+        return cached
+
     prompt = f"""You are an expert at combining interview transcripts from a two-person video call.
 
 Two participants recorded their audio separately during the same interview session.
 Each person's microphone primarily captured their own voice, though there may be
 some bleed-through of the other person's voice.
-
+{EXCERPT_NOTE if excerpt else ""}
 Transcript from the INTERVIEWER's microphone (primarily contains questions):
 {interviewer_text}
 
@@ -233,155 +274,178 @@ Return ONLY a JSON array (no markdown, no explanation):
   {{"question": "...", "answer": "..."}}
 ]
 """
-    response = get_gemini_model().generate_content(prompt)
-    parsed = clean_json(response.text, fallback=[])
-    if isinstance(parsed, list) and parsed:
-        valid = []
-        for item in parsed:
-            if isinstance(item, dict) and "question" in item:
-                valid.append({
-                    "question": str(item["question"]).strip(),
-                    "answer": str(item.get("answer", "")).strip(),
-                })
-        return valid
-    return []
-
-
-def clean_json(text, fallback=None):
-    if fallback is None:
-        fallback = {"score": 0, "feedback": "Parsing error"}
-    try:
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if match:
-            return json.loads(match.group())
-    except Exception:
-        pass
-    try:
-        match = re.search(r"\[.*\]", text, re.DOTALL)
-        if match:
-            return json.loads(match.group())
-    except Exception:
-        pass
-    return fallback
+    return _generate_qa_pairs(prompt, "merge_transcripts", template, interviewer_text, candidate_text)
 
 
-def evaluate_single_pair(pair: dict, job_role: str, position: str) -> dict:
-    """Evaluate a single Q&A pair using Gemini, considering job role and position level."""
-    prompt = f"""You are a strict technical interview evaluator.
+def _merge_turns_with_llm(turns: list[dict], use_cache: bool = True, excerpt: bool = False) -> list[dict]:
+    """Turn an aligned, speaker-tagged conversation whose turns overlap into Q&A pairs."""
+    conversation = format_turns(turns)
+    template = _template(MERGE_TURNS_TEMPLATE, excerpt)
+    cached = read_cache(cache_key(GEMINI_MODEL, template, conversation), use_cache)
+    if cached is not None:
+        return cached
 
-Context:
-- Target Job Role: {job_role}
-- Position Level: {position}
+    prompt = f"""You are an expert at analysing interview transcripts.
 
-Interviewer's Question:
-{pair["question"]}
+Below is a two-person technical interview, one speaker turn per line, in the
+order spoken. Each line starts with the time the turn began and who spoke it.
+Both participants were recorded on their own microphone and the recordings
+were aligned, so the speakers are known; where they talked over each other
+the order of neighbouring lines may be slightly off.
+{EXCERPT_NOTE if excerpt else ""}
+Your task:
+1. Identify every distinct question the INTERVIEWER asked.
+2. For each question, collect the CANDIDATE's answer to it, joining answer
+   turns that were split by short interjections.
+3. Clean up grammar and punctuation in both the question and the answer.
+4. If a question has no answer, set the answer to an empty string.
 
-Candidate's Answer:
-{pair["answer"]}
+Return ONLY a JSON array (no markdown, no explanation):
+[
+  {{"question": "...", "answer": "..."}},
+  {{"question": "...", "answer": "..."}}
+]
 
-Evaluate TWO things:
+Conversation:
+{conversation}
+"""
+    return _generate_qa_pairs(prompt, "merge_turns", template, conversation)
 
-1. **Question Relevance** – Is this question relevant to the target job role ({job_role})?
-   Rate as: "Highly Relevant", "Somewhat Relevant", or "Not Relevant".
 
-2. **Question Difficulty** – Given the position level ({position}), is this question's difficulty appropriate?
-   Rate as: "Too Easy", "Appropriate", or "Too Hard".
+def _generate_qa_pairs(prompt: str, operation: str, template: str, *inputs: str) -> list[dict]:
+    """Ask Gemini for Q&A pairs, keep the entries that validate, and cache a non-empty result.
 
-3. **Answer Score** – Score the candidate's answer from 0-100.
-   - 90-100: Excellent, thorough and accurate
-   - 70-89: Good, mostly correct with minor gaps
-   - 50-69: Partial understanding, missing key details
-   - 0-49: Poor or incorrect
+    The cache entry is keyed on the model that answered, so a fallback model's
+    pairs are never served as the primary's.
+    """
+    try:
+        (pairs, rejected), model_name = generate_validated(
+            prompt,
+            lambda text: parse_items(text, QAPair),
+            operation=operation,
+            response_schema=QA_PAIRS_SCHEMA,
+        )
+    except OutputError as exc:
+        logger.warning("No usable Q&A pairs in the %s reply: %s", operation, exc)
+        return []
+    if rejected:
+        logger.warning("Dropped %d malformed Q&A pairs from the %s reply", rejected, operation)
+    valid = [pair.model_dump() for pair in pairs]
+    if valid:
+        write_cache(cache_key(model_name, template, *inputs), valid)
+    return valid
 
-4. **Feedback** – Give brief, specific technical feedback on the answer.
 
-Return ONLY a JSON object (no markdown, no explanation):
-{{
-  "question_relevance": "Highly Relevant" | "Somewhat Relevant" | "Not Relevant",
-  "difficulty_assessment": "Too Easy" | "Appropriate" | "Too Hard",
-  "score": <int 0-100>,
-  "feedback": "<brief feedback>"
-}}
-"""
+def average_score(results: list[dict]) -> float:
+    """Mean score of the evaluated pairs; pairs whose evaluation failed (score None) don't count."""
+    scores = [result["score"] for result in results if result["score"] is not None]
+    return sum(scores) / len(scores) if scores else 0
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/metrics")
+def prometheus_metrics(authorization: Optional[str] = Header(default=None)):
+    """Prometheus text exposition; set METRICS_TOKEN to require it as a bearer token."""
+    if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid or missing metrics token")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+async def run_password_work(func, *args):
+    """Hash or verify in the password pool; a full queue means the server is saturated with sign-ins."""
     try:
-        response = get_gemini_model().generate_content(prompt)
-        data = clean_json(response.text)
-    except Exception as exc:
-        data = {"score": 0, "feedback": str(exc), "question_relevance": "Unknown", "difficulty_assessment": "Unknown"}
+        return await run_password_hash(func, *args)
+    except ExecutorSaturated as exc:
+        raise HTTPException(status_code=503, detail="Too many sign-ins in progress; try again shortly", headers={"Retry-After": "1"}) from exc
 
-    return {
-        "topic": job_role,
-        "position": position,
-        "question_relevance": data.get("question_relevance", "Unknown"),
-        "difficulty_assessment": data.get("difficulty_assessment", "Unknown"),
-        "score": data.get("score", 0),
-        "feedback": data.get("feedback", ""),
-    }
 
+def find_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
 
-def persist_interview(db: Session, current_user: User, room: Room, audio_file: str, json_file: str, full_text: str, qa_pairs: list[dict], evaluation_report: dict) -> Interview:
-    interview = Interview(
-        room_id=room.id,
-        interviewer_id=room.interviewer_id,
-        candidate_id=room.candidate_id,
-        created_by_id=current_user.id,
-        audio_file=audio_file,
-        json_file=json_file,
-        full_transcript=full_text,
-        qa_pairs=qa_pairs,
-        evaluation_report=evaluation_report,
-        status="completed",
-        completed_at=datetime.utcnow(),
-    )
-    db.add(interview)
-    room.status = "completed"
-    room.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(interview)
-    return interview
+
+def save_user(db: Session, user: User) -> None:
+    db.add(user)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
+    db.refresh(user)
 
 
+# The auth endpoints are async so a user waiting on the password pool holds
+# no API thread; their short database calls go to the threadpool.
 @app.post("/auth/signup", response_model=AuthResponse)
-def signup(payload: AuthSignupIn, db: Session = Depends(get_db)):
+async def signup(payload: AuthSignupIn, request: Request, db: Session = Depends(get_db)):
     role = payload.role.strip().lower()
     if role not in {"interviewer", "candidate"}:
         raise HTTPException(status_code=400, detail="Role must be interviewer or candidate")
 
-    existing_user = db.query(User).filter(User.email == payload.email.lower()).first()
+    email = payload.email.lower()
+    check_login_rate(request, email)
+    existing_user = await run_in_threadpool(find_user_by_email, db, email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     user = User(
-        email=payload.email.lower(),
-        password_hash=get_password_hash(payload.password),
+        email=email,
+        password_hash=await run_password_work(get_password_hash, payload.password),
         role=role,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await run_in_threadpool(save_user, db, user)
 
-    token = create_access_token(user.id, {"role": user.role, "email": user.email})
-    return AuthResponse(access_token=token, user=user_out(user))
+    return AuthResponse(access_token=issue_access_token(user), user=user_out(user))
 
 
 @app.post("/auth/signin", response_model=AuthResponse)
-def signin(payload: AuthSigninIn, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email.lower()).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def signin(payload: AuthSigninIn, request: Request, db: Session = Depends(get_db)):
+    email = payload.email.lower()
+    check_login_rate(request, email)
+    user = await run_in_threadpool(find_user_by_email, db, email)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    verified, new_hash = await run_password_work(verify_and_update, payload.password, user.password_hash)
+    if not verified:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    if new_hash:
+        # PASSWORD_HASH_ROUNDS changed since this hash was made; store one with the current rounds.
+        user.password_hash = new_hash
+        await run_in_threadpool(save_user, db, user)
+    return AuthResponse(access_token=issue_access_token(user), user=user_out(user))
+
+
+@app.post("/auth/password", response_model=AuthResponse)
+async def change_password(
+    payload: PasswordChangeIn,
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Change the password and revoke every other token; the response carries a fresh one."""
+    check_login_rate(request, current_user.email)
+    user = await run_in_threadpool(db.get, User, current_user.id)
+    if not await run_password_work(verify_password, payload.current_password, user.password_hash):
+        raise HTTPException(status_code=401, detail="Current password is incorrect")
 
-    token = create_access_token(user.id, {"role": user.role, "email": user.email})
-    return AuthResponse(access_token=token, user=user_out(user))
+    user.password_hash = await run_password_work(get_password_hash, payload.new_password)
+    await run_in_threadpool(revoke_tokens, db, user)
+    await run_in_threadpool(db.refresh, user)
+    return AuthResponse(access_token=issue_access_token(user), user=user_out(user))
 
 
 @app.get("/auth/me", response_model=UserOut)
-def me(authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    return user_out(get_current_user(authorization, db))
+def me(user: CurrentUser = Depends(get_current_user)):
+    return user_out(user)
 
 
 @app.post("/rooms/create", response_model=RoomOut)
-def create_room(payload: RoomCreateIn, authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    user = get_current_user(authorization, db)
+def create_room(payload: RoomCreateIn, user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
     if user.role != "interviewer":
         raise HTTPException(status_code=403, detail="Only interviewers can create rooms")
 
@@ -401,8 +465,7 @@ def create_room(payload: RoomCreateIn, authorization: Optional[str] = Header(def
 
 
 @app.post("/rooms/join", response_model=RoomOut)
-def join_room(payload: RoomJoinIn, authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    user = get_current_user(authorization, db)
+def join_room(payload: RoomJoinIn, user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
     room = db.query(Room).filter(Room.code == payload.room_code.upper()).first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -426,8 +489,7 @@ def join_room(payload: RoomJoinIn, authorization: Optional[str] = Header(default
 
 
 @app.post("/rooms/{room_id}/close", response_model=RoomOut)
-def close_room(room_id: str, authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    user = get_current_user(authorization, db)
+def close_room(room_id: str, user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
     room = db.query(Room).filter(or_(Room.id == room_id, Room.code == room_id.upper())).first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -441,70 +503,210 @@ def close_room(room_id: str, authorization: Optional[str] = Header(default=None)
     return room_out(room)
 
 
-@app.get("/rooms/mine", response_model=list[RoomOut])
-def my_rooms(authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    user = get_current_user(authorization, db)
-    rooms = (
-        db.query(Room)
-        .filter(or_(Room.interviewer_id == user.id, Room.candidate_id == user.id))
-        .order_by(desc(Room.created_at))
-        .all()
+def user_rooms_query(user_id: str, cursor: Optional[str], limit: int):
+    mine = select(Room.id, Room.created_at)
+    page = keyset_page(Room, [mine.where(Room.interviewer_id == user_id), mine.where(Room.candidate_id == user_id)], cursor, limit)
+    return select(Room).join(page, page.c.id == Room.id).order_by(desc(Room.created_at), desc(Room.id))
+
+
+def interview_summaries_query(user_id: str, cursor: Optional[str], limit: int, min_score: Optional[float] = None):
+    visible = select(Interview.id, Interview.created_at).where(Interview.status != "pending_merge")
+    if min_score is not None:
+        visible = visible.where(Interview.total_score >= min_score)
+    # Interviews copy the room's interviewer; the candidate may have joined the room after the first upload.
+    page = keyset_page(
+        Interview,
+        [
+            visible.where(Interview.interviewer_id == user_id),
+            visible.where(Interview.candidate_id == user_id),
+            visible.join(Room, Room.id == Interview.room_id).where(Room.candidate_id == user_id),
+        ],
+        cursor,
+        limit,
+    )
+    return (
+        select(
+            Interview.id,
+            Interview.room_id,
+            Room.code.label("room_code"),
+            Interview.status,
+            Interview.total_score,
+            Interview.created_at,
+            Interview.completed_at,
+        )
+        .join(page, page.c.id == Interview.id)
+        .join(Room, Room.id == Interview.room_id)
+        .order_by(desc(Interview.created_at), desc(Interview.id))
     )
-    return [room_out(room) for room in rooms]
 
 
-@app.get("/interviews", response_model=list[InterviewOut])
-def list_interviews(authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    user = get_current_user(authorization, db)
-    interviews = (
-        db.query(Interview)
-        .join(Room, Room.id == Interview.room_id)
-        .filter(
-            Interview.status != "pending_merge",
-            or_(
-                Interview.interviewer_id == user.id,
-                Interview.candidate_id == user.id,
-                Room.interviewer_id == user.id,
-                Room.candidate_id == user.id,
-            )
-        )
-        .order_by(desc(Interview.created_at))
-        .all()
+@app.get("/rooms/mine", response_model=RoomPage)
+def my_rooms(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    rooms, next_cursor = page_rows(db.execute(user_rooms_query(user.id, cursor, limit)).scalars().all(), limit)
+    return RoomPage(items=[room_out(room) for room in rooms], next_cursor=next_cursor)
+
+
+@app.get("/interviews", response_model=InterviewPage)
+def list_interviews(
+    cursor: Optional[str] = None,
+    limit: int = Query(default=PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    min_score: Optional[float] = None,
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """List interview summaries; transcripts and reports come from ``/interviews/{id}``."""
+    rows = db.execute(interview_summaries_query(user.id, cursor, limit, min_score)).all()
+    rows, next_cursor = page_rows(rows, limit)
+    return InterviewPage(
+        items=[InterviewSummaryOut(**{**row._asdict(), "total_score": row.total_score or 0}) for row in rows],
+        next_cursor=next_cursor,
     )
-    room_ids = [item.room_id for item in interviews]
-    rooms = db.query(Room).filter(Room.id.in_(room_ids)).all() if room_ids else []
-    rooms_by_id = {room.id: room for room in rooms}
-    return [interview_out(interview, rooms_by_id.get(interview.room_id)) for interview in interviews]
 
 
-@app.get("/interviews/{interview_id}", response_model=InterviewOut)
-def get_interview(interview_id: str, authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    user = get_current_user(authorization, db)
-    interview = db.get(Interview, interview_id)
-    if not interview:
+def find_interview(db: Session, user: CurrentUser, interview_id: str) -> tuple[Interview, Optional[Room]]:
+    """Load an interview and its room in one query, checking the user may see it."""
+    row = db.execute(
+        select(Interview, Room).outerjoin(Room, Room.id == Interview.room_id).where(Interview.id == interview_id)
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Interview not found")
 
+    interview, room = row
     if user.id not in {interview.interviewer_id, interview.candidate_id, interview.created_by_id}:
         raise HTTPException(status_code=403, detail="You do not have access to this interview")
+    return interview, room
+
 
-    room = db.get(Room, interview.room_id)
-    return interview_out(interview, room)
+@app.get("/interviews/{interview_id}", response_model=InterviewOut)
+def get_interview(interview_id: str, user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    return interview_out(db, *find_interview(db, user, interview_id))
 
 
 @app.get("/results/{interview_id}", response_model=InterviewOut)
-def get_result(interview_id: str, authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)):
-    return get_interview(interview_id, authorization, db)
+def get_result(interview_id: str, user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    return interview_out(db, *find_interview(db, user, interview_id))
 
 
-@app.post("/process-interview")
-async def process_interview(
-    file: UploadFile = File(...),
-    room_id: str = Form(...),
-    evaluate: str = Form(default="true"),
-    authorization: Optional[str] = Header(default=None),
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def merge_job_query(interview_id: str):
+    return (
+        select(Job)
+        .join(RoomSubmission, RoomSubmission.merge_job_id == Job.id)
+        .where(RoomSubmission.interview_id == interview_id)
+    )
+
+
+def evaluation_progress(merge_job: Optional[Job]) -> dict:
+    """Partial report of an interview still being evaluated, from its merge job's checkpointed verdicts."""
+    results = ((merge_job.state if merge_job else None) or {}).get("results") or []
+    finished = [item for item in results if item is not None]
+    if not results:
+        return {}
+    return {"total_score": average_score(finished), "results": results, "completed": len(finished), "total": len(results)}
+
+
+async def read_evaluation_snapshot(interview_id: str) -> Optional[dict]:
+    """Load an interview's status and (partial) report, plus the error of a failed merge job.
+
+    Each poll uses a short-lived async session so an open stream holds no
+    pooled connection or threadpool slot while it sleeps.
+    """
+    async with get_async_sessionmaker()() as db:
+        interview = await db.get(Interview, interview_id)
+        if not interview:
+            return None
+        if interview.status == "completed":
+            report = (await read_artifacts_async(db, [interview.report_ref])).get(interview.report_ref)
+            return {"status": interview.status, "report": report or {}, "error": None}
+        merge_job = (await db.execute(merge_job_query(interview.id))).scalars().first()
+        error = None
+        if merge_job and merge_job.status == "failed":
+            error = merge_job.error or "Interview processing failed"
+        return {"status": interview.status, "report": evaluation_progress(merge_job), "error": error}
+
+
+async def evaluation_events(request: Request, interview_id: str):
+    """Yield status, per-pair verdict, running score and completion events for one interview."""
+    sent: set[int] = set()
+    last_status = None
+    idle_seconds = 0.0
+    while not await request.is_disconnected():
+        snapshot = await read_evaluation_snapshot(interview_id)
+        if snapshot is None:
+            yield sse_event("error", {"detail": "Interview not found"})
+            return
+
+        report = snapshot["report"]
+        if snapshot["status"] != last_status:
+            last_status = snapshot["status"]
+            yield sse_event("status", {"status": last_status})
+
+        results = report.get("results") or []
+        fresh = [index for index, result in enumerate(results) if result is not None and index not in sent]
+        for index in fresh:
+            sent.add(index)
+            yield sse_event("verdict", {"index": index, "total": len(results), "result": results[index]})
+        if fresh:
+            yield sse_event("score", {"total_score": report.get("total_score", 0), "completed": len(sent), "total": len(results)})
+
+        if snapshot["status"] == "completed":
+            yield sse_event("complete", {"interview_id": interview_id, "evaluation_report": report})
+            return
+        if snapshot["error"]:
+            yield sse_event("error", {"detail": snapshot["error"]})
+            return
+
+        idle_seconds = 0.0 if fresh else idle_seconds + EVALUATION_STREAM_POLL_SECONDS
+        if idle_seconds >= EVALUATION_STREAM_HEARTBEAT_SECONDS:
+            idle_seconds = 0.0
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(EVALUATION_STREAM_POLL_SECONDS)
+
+
+@app.get("/interviews/{interview_id}/events")
+def interview_events(
+    interview_id: str,
+    request: Request,
+    user: CurrentUser = Depends(get_stream_user),
     db: Session = Depends(get_db),
 ):
-    current_user = get_current_user(authorization, db)
+    """Stream evaluation progress as Server-Sent Events.
+
+    EventSource cannot send headers, so the access token may be passed as ``?token=`` instead.
+    """
+    find_interview(db, user, interview_id)
+    return StreamingResponse(
+        evaluation_events(request, interview_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/jobs/{job_id}", response_model=JobOut)
+def get_job(job_id: str, user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    row = db.execute(select(Job, Room).outerjoin(Room, Room.id == Job.room_id).where(Job.id == job_id)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job, room = row
+    allowed = {job.created_by_id}
+    if room:
+        allowed |= {room.interviewer_id, room.candidate_id}
+    if user.id not in allowed:
+        raise HTTPException(status_code=403, detail="You do not have access to this job")
+
+    return JobOut.model_validate(job)
+
+
+def authorize_upload(room_id: str, current_user: CurrentUser, db: Session) -> Room:
     room = db.query(Room).filter(or_(Room.id == room_id, Room.code == room_id.upper())).first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -520,181 +722,710 @@ async def process_interview(
             db.refresh(room)
         else:
             raise HTTPException(status_code=403, detail="You are not a participant in this room")
+    return room
+
+
+def queue_interview_job(db: Session, current_user: CurrentUser, room: Room, audio_path: Optional[str], evaluate: bool, use_cache: bool) -> dict:
+    """Queue processing of one participant's recording, or of their live segments when ``audio_path`` is None."""
+    job = enqueue(
+        db,
+        "process_interview",
+        {
+            "room_id": room.id,
+            "user_id": current_user.id,
+            "audio_path": audio_path,
+            "evaluate": evaluate,
+            "use_cache": use_cache,
+        },
+        room_id=room.id,
+        created_by_id=current_user.id,
+    )
+    logger.info("Queued job %s for room %s by %s (%s).", job.id, room.code, current_user.email, current_user.role)
+
+    return {
+        "status": "queued",
+        "job_id": job.id,
+        "room_id": room.id,
+    }
 
-    uid = str(uuid.uuid4())
-    temp_in = f"temp_{uid}"
-    temp_wav = f"{temp_in}.wav"
-    audio_dir = os.getenv("AUDIO_DIR", "./audio")
-    os.makedirs(audio_dir, exist_ok=True)
 
+def store_upload(source, filename: Optional[str]) -> str:
+    """Copy an uploaded file object into content-addressed storage and return its path."""
+    writer = ContentAddressedWriter(extension=os.path.splitext(filename or "")[1])
     try:
-        with open(temp_in, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        convert_to_wav(temp_in, temp_wav)
-        raw_text = transcribe_audio(temp_wav)
-
-        # Save audio to persistent storage
-        audio_file_name = f"{os.path.splitext(os.path.basename(file.filename))[0]}-{uid}{os.path.splitext(file.filename)[1]}"
-        audio_path = os.path.join(audio_dir, audio_file_name)
-        with open(temp_in, "rb") as source, open(audio_path, "wb") as target:
-            shutil.copyfileobj(source, target)
-
-        # Check if there is already a pending submission for this room
-        pending = db.query(Interview).filter(
-            Interview.room_id == room.id,
-            Interview.status == "pending_merge",
-        ).first()
-
-        if not pending:
-            # ── FIRST UPLOAD: save transcript and wait for the other participant ──
-            interview = Interview(
-                room_id=room.id,
-                interviewer_id=room.interviewer_id,
-                candidate_id=room.candidate_id,
-                created_by_id=current_user.id,
-                audio_file=audio_path,
-                full_transcript=raw_text or "",
-                status="pending_merge",
-            )
-            db.add(interview)
-            db.commit()
-            db.refresh(interview)
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            writer.write(chunk)
+        return writer.commit()
+    except Exception as exc:
+        logger.exception("Failed to store uploaded audio")
+        writer.abort()
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-            logger.info(
-                "First submission for room %s by %s (%s). Waiting for second participant.",
-                room.code, current_user.email, current_user.role,
-            )
 
-            return {
-                "status": "pending_merge",
-                "interview_id": interview.id,
-                "room_id": room.id,
-            }
+# Upload endpoints are plain functions so FastAPI runs their database and
+# disk work on the threadpool instead of the event loop.
+@app.post("/process-interview", status_code=202)
+def process_interview(
+    file: UploadFile = File(...),
+    room_id: str = Form(...),
+    evaluate: str = Form(default="true"),
+    use_cache: str = Form(default="true"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    room = authorize_upload(room_id, current_user, db)
 
+    # Save audio straight to content-addressed storage; the job worker reads it from there.
+    audio_path = store_upload(file.file, file.filename)
+    return queue_interview_job(db, current_user, room, audio_path, evaluate.lower() != "false", use_cache.lower() != "false")
+
+
+@app.post("/process-interview/stream", status_code=202)
+async def process_interview_stream(
+    request: Request,
+    room_id: str,
+    filename: str = "recording.webm",
+    evaluate: str = "true",
+    use_cache: str = "true",
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Accept the raw audio as the request body and stream it to storage without spooling.
+
+    Reading the body needs the event loop; the blocking work is handed to the threadpool.
+    """
+    room = await run_in_threadpool(authorize_upload, room_id, current_user, db)
+
+    writer = await run_in_threadpool(ContentAddressedWriter, AUDIO_DIR, os.path.splitext(filename)[1])
+    try:
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer += chunk
+            if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                await run_in_threadpool(writer.write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await run_in_threadpool(writer.write, bytes(buffer))
+        if writer.size == 0:
+            raise HTTPException(status_code=400, detail="Request body is empty")
+        audio_path = await run_in_threadpool(writer.commit)
+    except HTTPException:
+        writer.abort()
+        raise
+    except Exception as exc:
+        logger.exception("Failed to store streamed audio")
+        writer.abort()
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    return await run_in_threadpool(
+        queue_interview_job, db, current_user, room, audio_path, evaluate.lower() != "false", use_cache.lower() != "false"
+    )
+
+
+def participant_slot(room: Room, user_id: str) -> str:
+    return "interviewer" if user_id == room.interviewer_id else "candidate"
+
+
+def call_offset_ms(room: Room, user_id: str) -> Optional[int]:
+    """Milliseconds from the room's creation to the participant's recording start, or None if it wasn't registered.
+
+    Adding it to a time in their recording gives the call's clock, which both participants share.
+    """
+    started_at = getattr(room, f"{participant_slot(room, user_id)}_recording_started_at")
+    if started_at is None:
+        return None
+    return round((started_at - room.created_at).total_seconds() * 1000)
+
+
+@app.post("/rooms/{room_id}/recording")
+def start_recording(
+    room_id: str,
+    payload: RoomRecordingIn,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Register when a participant's live recording started, by the server's clock.
+
+    Each browser times its segments from its own start, so this puts both
+    participants' segments on one clock. The first registration wins, so a
+    retried request doesn't move it.
+    """
+    room = authorize_upload(room_id, current_user, db)
+    column = getattr(Room, f"{participant_slot(room, current_user.id)}_recording_started_at")
+    db.execute(
+        update(Room)
+        .where(Room.id == room.id, column.is_(None))
+        .values({column: datetime.utcnow() - timedelta(milliseconds=payload.elapsed_ms)})
+    )
+    db.commit()
+    db.refresh(room)
+    return {"room_id": room.id, "call_offset_ms": call_offset_ms(room, current_user.id)}
+
+
+@app.post("/rooms/{room_id}/segments", status_code=202)
+def upload_segment(
+    room_id: str,
+    file: UploadFile = File(...),
+    seq: int = Form(...),
+    start_ms: int = Form(...),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Accept one audio segment during a live call and transcribe it in the background.
+
+    ``start_ms`` is measured from the participant's own recording start and
+    stored on the call's clock.
+    """
+    room = authorize_upload(room_id, current_user, db)
+    offset_ms = call_offset_ms(room, current_user.id)
+    if offset_ms is None:
+        raise HTTPException(status_code=409, detail="Register the recording start before uploading segments")
+
+    existing = db.query(TranscriptSegment).filter(
+        TranscriptSegment.room_id == room.id,
+        TranscriptSegment.user_id == current_user.id,
+        TranscriptSegment.seq == seq,
+    ).first()
+    if existing:
+        return {"status": existing.status, "segment_id": existing.id, "job_id": existing.job_id}
+
+    audio_path = store_upload(file.file, file.filename)
+    segment = TranscriptSegment(
+        room_id=room.id,
+        user_id=current_user.id,
+        seq=seq,
+        start_ms=start_ms + offset_ms,
+        audio_file=audio_path,
+    )
+    db.add(segment)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A retried upload of the same segment won the race.
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Segment already uploaded")
+
+    job = enqueue(db, "transcribe_segment", {"segment_id": segment.id}, room_id=room.id, created_by_id=current_user.id)
+    segment.job_id = job.id
+    db.commit()
+    return {"status": "queued", "segment_id": segment.id, "job_id": job.id}
+
+
+@app.get("/rooms/{room_id}/transcript", response_model=list[TranscriptSegmentOut])
+def room_transcript(room_id: str, user: CurrentUser = Depends(get_current_user), db: Session = Depends(get_db)):
+    room = db.query(Room).filter(or_(Room.id == room_id, Room.code == room_id.upper())).first()
+    if not room:
+        raise HTTPException(status_code=404, detail="Room not found")
+    if user.id not in {room.interviewer_id, room.candidate_id}:
+        raise HTTPException(status_code=403, detail="You are not a participant in this room")
+
+    segments = (
+        db.query(TranscriptSegment)
+        .filter(TranscriptSegment.room_id == room.id)
+        .order_by(TranscriptSegment.user_id, TranscriptSegment.seq)
+        .all()
+    )
+    return [TranscriptSegmentOut.model_validate(segment) for segment in segments]
+
+
+@app.post("/rooms/{room_id}/finalize", status_code=202)
+def finalize_recording(
+    room_id: str,
+    payload: RoomFinalizeIn,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """End a participant's live recording; only the merge and evaluation remain."""
+    room = authorize_upload(room_id, current_user, db)
+    has_segments = db.query(TranscriptSegment.id).filter(
+        TranscriptSegment.room_id == room.id,
+        TranscriptSegment.user_id == current_user.id,
+    ).first()
+    if not has_segments:
+        raise HTTPException(status_code=400, detail="No audio segments were uploaded for this room")
+
+    return queue_interview_job(db, current_user, room, None, payload.evaluate, payload.use_cache)
+
+
+@register_handler("transcribe_segment")
+def run_segment_job(ctx: JobContext, db: Session) -> dict:
+    """Transcribe one live segment and store it, with call-relative timestamps, against the room."""
+    segment = db.get(TranscriptSegment, ctx.payload["segment_id"])
+    with ctx.stage("decode"):
+        audio = decode_pcm(segment.audio_file)
+    with ctx.stage("transcribe"):
+        timed = [
+            {**item, "start_ms": item["start_ms"] + segment.start_ms, "end_ms": item["end_ms"] + segment.start_ms}
+            for item in transcribe_segments(audio)
+        ]
+
+    segment.segments = timed
+    segment.text = join_segments(timed)
+    segment.envelope_ref = store_artifact(db, energy_envelope(audio))
+    segment.end_ms = segment.start_ms + len(audio)
+    segment.status = "transcribed"
+    segment.transcribed_at = datetime.utcnow()
+    db.commit()
+    return {"segment_id": segment.id, "text": segment.text}
+
+
+def collect_live_segments(ctx: JobContext, db: Session, room_id: str, user_id: str) -> tuple[list[dict], int, Optional[list[int]]]:
+    """Return a participant's timed live transcript, recorded milliseconds and energy envelope on the call's clock.
+
+    Defers while segments are still being transcribed. The envelope is None
+    when a segment was transcribed before envelopes were kept.
+    """
+    rows = (
+        db.query(TranscriptSegment, Job.status)
+        .outerjoin(Job, Job.id == TranscriptSegment.job_id)
+        .filter(TranscriptSegment.room_id == room_id, TranscriptSegment.user_id == user_id)
+        .order_by(TranscriptSegment.seq)
+        .all()
+    )
+    outstanding = [segment for segment, job_status in rows if segment.status == "pending" and job_status != "failed"]
+    waited = (datetime.utcnow() - ctx.job.created_at).total_seconds()
+    if outstanding and waited < LIVE_SEGMENT_WAIT_SECONDS:
+        raise JobDeferred(f"{len(outstanding)} live segment(s) still transcribing", delay_seconds=2)
+    if outstanding:
+        logger.warning("Finalizing room %s without %d untranscribed segment(s)", room_id, len(outstanding))
+
+    items = [item for segment, _ in rows for item in (segment.segments or [])]
+    transcribed = [segment for segment, _ in rows if segment.status == "transcribed"]
+    envelope = None
+    if transcribed and all(segment.envelope_ref for segment in transcribed):
+        envelopes = read_artifacts(db, [segment.envelope_ref for segment in transcribed])
+        envelope = place_envelopes([(segment.start_ms, envelopes[segment.envelope_ref]) for segment in transcribed])
+    return items, sum(segment.end_ms - segment.start_ms for segment, _ in rows if segment.end_ms is not None), envelope
+
+
+@register_handler("process_interview")
+def run_interview_job(ctx: JobContext, db: Session) -> dict:
+    """Decode and transcribe one participant's recording, then submit it to the room's rendezvous."""
+    payload = ctx.payload
+    room = db.get(Room, payload["room_id"])
+    current_user = db.get(User, payload["user_id"])
+    audio_path = payload.get("audio_path")
+
+    if not ctx.stage_done("transcribe"):
+        if audio_path:
+            with ctx.stage("decode"):
+                audio = decode_pcm(audio_path)
+            with ctx.stage("transcribe"):
+                segments = transcribe_segments(
+                    audio,
+                    on_progress=lambda completed, total: ctx.progress("transcribe", completed, total),
+                )
+                ctx.checkpoint(
+                    raw_text=join_segments(segments),
+                    segments=segments,
+                    audio_ms=len(audio),
+                    # Segment times are relative to this recording; the envelope lets the merge line it up with the other one.
+                    timeline="recording",
+                    envelope_ref=store_artifact(db, energy_envelope(audio)),
+                )
+            del audio
         else:
-            # ── SECOND UPLOAD: merge both transcripts and evaluate ──
-            first_text = pending.full_transcript or ""
-            second_text = raw_text or ""
+            # Live segments were transcribed during the call; just collect them.
+            with ctx.stage("transcribe"):
+                segments, audio_ms, envelope = collect_live_segments(ctx, db, room.id, current_user.id)
+                # Segments are on the call's clock only if their recording start was registered;
+                # earlier ones are relative to this recording and, with no envelope, can't be aligned.
+                on_call_clock = call_offset_ms(room, current_user.id) is not None
+                ctx.checkpoint(
+                    raw_text=join_segments(segments),
+                    segments=segments,
+                    audio_ms=audio_ms,
+                    timeline="call" if on_call_clock else "recording",
+                    envelope_ref=store_artifact(db, envelope) if on_call_clock else None,
+                )
+
+    return submit_recording(ctx, db, room, current_user)
+
+
+def open_submission(db: Session, room: Room, current_user: User, audio_path: Optional[str]) -> RoomSubmission:
+    """Return the room's rendezvous record, creating it with its pending interview on first use.
+
+    ``room_submissions.room_id`` is unique, so when both participants get here
+    at once exactly one insert succeeds and the other reads the winner's row.
+    """
+    submission = db.query(RoomSubmission).filter(RoomSubmission.room_id == room.id).first()
+    if submission:
+        return submission
+
+    interview = Interview(
+        room_id=room.id,
+        interviewer_id=room.interviewer_id,
+        candidate_id=room.candidate_id,
+        created_by_id=current_user.id,
+        audio_file=audio_path,
+        status="pending_merge",
+    )
+    db.add(interview)
+    db.flush()
+    submission = RoomSubmission(room_id=room.id, interview_id=interview.id)
+    db.add(submission)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return db.query(RoomSubmission).filter(RoomSubmission.room_id == room.id).one()
+
+    # Evaluate whichever side arrived if the other participant never uploads.
+    enqueue(
+        db,
+        "rendezvous_timeout",
+        {"submission_id": submission.id},
+        room_id=room.id,
+        run_after=datetime.utcnow() + timedelta(seconds=RENDEZVOUS_TIMEOUT_SECONDS),
+        commit=False,
+    )
+    db.commit()
+    return submission
 
-            # Determine which transcript is the interviewer's and which is the candidate's
-            if pending.created_by_id == room.interviewer_id:
-                interviewer_text, candidate_text = first_text, second_text
-            else:
-                interviewer_text, candidate_text = second_text, first_text
 
-            should_evaluate = evaluate.lower() != "false"
+def schedule_merge(db: Session, submission: RoomSubmission, use_cache: bool, require_both: bool) -> Optional[Job]:
+    """Queue the room's merge job unless another participant or the timeout already did.
 
-            if should_evaluate:
+    The job is inserted and claimed in one transaction; the conditional UPDATE
+    on ``merge_job_id`` lets exactly one caller win.
+    """
+    job = enqueue(
+        db,
+        "merge_interview",
+        {"submission_id": submission.id, "use_cache": use_cache},
+        room_id=submission.room_id,
+        commit=False,
+    )
+    conditions = [RoomSubmission.id == submission.id, RoomSubmission.merge_job_id.is_(None)]
+    if require_both:
+        conditions += [
+            RoomSubmission.interviewer_submitted_at.is_not(None),
+            RoomSubmission.candidate_submitted_at.is_not(None),
+        ]
+    claimed = db.execute(
+        update(RoomSubmission)
+        .where(*conditions)
+        .values(merge_job_id=job.id, status="merging", updated_at=datetime.utcnow())
+    )
+    if claimed.rowcount != 1:
+        db.rollback()
+        return None
+    db.commit()
+    return job
+
+
+def submit_recording(ctx: JobContext, db: Session, room: Room, current_user: User) -> dict:
+    """Fill this participant's slot and queue the merge once both slots are filled."""
+    payload = ctx.payload
+    submission = open_submission(db, room, current_user, payload.get("audio_path"))
+    ctx.annotate(**{"interview.id": submission.interview_id})
+    slot = participant_slot(room, current_user.id)
+    values = {
+        f"{slot}_job_id": ctx.job.id,
+        f"{slot}_transcript": ctx.state.get("raw_text", ""),
+        f"{slot}_submitted_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+    if slot == "interviewer":
+        # The interviewer decides at hang-up whether the interview is evaluated.
+        values["evaluate"] = payload.get("evaluate", True)
+    filled = db.execute(
+        update(RoomSubmission)
+        .where(RoomSubmission.id == submission.id, RoomSubmission.merge_job_id.is_(None))
+        .values(**values)
+    )
+    if filled.rowcount == 1:
+        speech = speech_summary(ctx.state.get("segments", []), ctx.state.get("audio_ms", 0))
+        db.execute(
+            update(Interview)
+            .where(Interview.id == submission.interview_id)
+            .values(**{f"{slot}_talk_ms": speech["talk_ms"], f"{slot}_speech_ratio": speech["speech_ratio"]})
+        )
+    db.commit()
+    db.refresh(submission)
+
+    if filled.rowcount != 1 and getattr(submission, f"{slot}_job_id") != ctx.job.id:
+        logger.warning(
+            "Submission from %s for room %s arrived after the merge started; it is not included.",
+            current_user.email, room.code,
+        )
+        return {"status": "late", "interview_id": submission.interview_id, "room_id": room.id}
+
+    merge_job = schedule_merge(db, submission, payload.get("use_cache", True), require_both=True)
+    if merge_job is None and submission.merge_job_id is None:
+        logger.info(
+            "Submission for room %s by %s (%s). Waiting for second participant.",
+            room.code, current_user.email, current_user.role,
+        )
+        return {"status": "pending_merge", "interview_id": submission.interview_id, "room_id": room.id}
+
+    return {
+        "status": "merging",
+        "interview_id": submission.interview_id,
+        "room_id": room.id,
+        "merge_job_id": merge_job.id if merge_job else submission.merge_job_id,
+    }
+
+
+@register_handler("rendezvous_timeout")
+def run_rendezvous_timeout(ctx: JobContext, db: Session) -> dict:
+    """Merge a room with a single submission once the other participant has had their chance."""
+    submission = db.get(RoomSubmission, ctx.payload["submission_id"])
+    if submission.merge_job_id:
+        return {"status": "merged", "merge_job_id": submission.merge_job_id}
+
+    in_flight = (
+        db.query(Job.id)
+        .filter(
+            Job.room_id == submission.room_id,
+            Job.kind == "process_interview",
+            Job.status.in_(("queued", "running")),
+        )
+        .first()
+    )
+    if in_flight:
+        raise JobDeferred("A participant's recording is still being processed", delay_seconds=RENDEZVOUS_RECHECK_SECONDS)
+
+    merge_job = schedule_merge(db, submission, use_cache=True, require_both=False)
+    if merge_job is None:
+        db.refresh(submission)
+        return {"status": "merged", "merge_job_id": submission.merge_job_id}
+    logger.info("Rendezvous for room %s timed out; evaluating the submitted side only.", submission.room_id)
+    return {"status": "timed_out", "merge_job_id": merge_job.id}
+
+
+def align_submission(db: Session, submission: RoomSubmission) -> Optional[dict]:
+    """Put both participants' timed segments on one clock as speaker turns, or return None when they can't be.
+
+    Live segments are shifted onto the call's clock when uploaded, using each
+    participant's registered recording start, so they need no offset search.
+    That start is off by the request's latency, well within
+    TURN_OVERLAP_TOLERANCE_MS. Uploaded recordings each start whenever their
+    participant pressed record. The offset between them is found by
+    cross-correlating their energy envelopes. Either way, segments in which a
+    microphone only picked up the other speaker are then dropped, which needs
+    both envelopes.
+    """
+    jobs = [db.get(Job, job_id) if job_id else None for job_id in (submission.interviewer_job_id, submission.candidate_job_id)]
+    states = [(job.state or {}) if job else {} for job in jobs]
+    if not all(state.get("segments") for state in states):
+        return None
+    interviewer, candidate = (state["segments"] for state in states)
+    timelines = {state.get("timeline") for state in states}
+
+    if timelines not in ({"call"}, {"recording"}) or not all(state.get("envelope_ref") for state in states):
+        return None
+
+    envelopes = read_artifacts(db, [state["envelope_ref"] for state in states])
+    interviewer_envelope, candidate_envelope = (np.asarray(envelopes[state["envelope_ref"]], dtype=np.float32) for state in states)
+    if timelines == {"call"}:
+        offset_ms, peak_z = 0, None
+    else:
+        offset_ms, peak_z = estimate_offset(interviewer_envelope, candidate_envelope)
+        if peak_z < ALIGN_MIN_PEAK_Z:
+            logger.info("Could not align the recordings of room %s (peak z-score %.1f)", submission.room_id, peak_z)
+            return None
+    interviewer, interviewer_dropped = suppress_bleed(interviewer, interviewer_envelope, candidate_envelope, -offset_ms)
+    candidate, candidate_dropped = suppress_bleed(candidate, candidate_envelope, interviewer_envelope, offset_ms)
+    return {
+        "turns": build_turns(interviewer, candidate, offset_ms),
+        "offset_ms": offset_ms,
+        "peak_z": round(peak_z, 1) if peak_z is not None else None,
+        "dropped": {"interviewer": interviewer_dropped, "candidate": candidate_dropped},
+    }
+
+
+def turn_windows(turns: list[dict]) -> list[list[dict]]:
+    """Token-budgeted windows of the turn list, each opening on an interviewer turn where possible."""
+    ranges = plan_windows(
+        [estimate_tokens(format_turns([turn])) for turn in turns],
+        can_start=lambda index: turns[index]["speaker"] == "interviewer",
+    )
+    return [turns[start:end] for start, end in ranges]
+
+
+def merge_in_windows(ctx: JobContext, windows: list, extract: Callable[[object, bool], list[dict]]) -> list[dict]:
+    """Extract Q&A pairs from each window concurrently and stitch them together.
+
+    ``extract(window, excerpt)`` is told whether the window is only part of
+    the transcript. Each window's pairs are checkpointed as it finishes, so a
+    retried job only sends the windows without a result.
+    """
+    results = list(ctx.state.get("merge_windows") or [])
+    if len(results) != len(windows):
+        results = [None] * len(windows)
+    remaining = [index for index, result in enumerate(results) if result is None]
+    ctx.progress("merge", len(windows) - len(remaining), len(windows))
+
+    def record_window(offset: int, pairs: list[dict]) -> None:
+        results[remaining[offset]] = pairs
+        ctx.checkpoint(merge_windows=list(results))
+        ctx.progress("merge", sum(1 for item in results if item is not None), len(windows))
+
+    excerpt = len(windows) > 1
+    map_windows([windows[index] for index in remaining], lambda window: extract(window, excerpt), on_result=record_window)
+    if excerpt:
+        logger.info("Extracted Q&A from %d transcript windows (%d resumed)", len(windows), len(windows) - len(remaining))
+    return stitch_pairs(results)
+
+
+@register_handler("merge_interview")
+def run_merge_job(ctx: JobContext, db: Session) -> dict:
+    """Merge the submitted transcripts of a room and evaluate the Q&A pairs."""
+    submission = db.get(RoomSubmission, ctx.payload["submission_id"])
+    use_cache = ctx.payload.get("use_cache", True)
+    ctx.annotate(**{"interview.id": submission.interview_id})
+    room = db.get(Room, submission.room_id)
+    pending = db.get(Interview, submission.interview_id)
+    interviewer_text = submission.interviewer_transcript or ""
+    candidate_text = submission.candidate_transcript or ""
+
+    if submission.evaluate:
+        if interviewer_text and candidate_text and not ctx.stage_done("align"):
+            with ctx.stage("align"):
+                alignment = align_submission(db, submission)
+                if alignment:
+                    logger.info(
+                        "Aligned room %s: candidate offset %d ms, %d turns, bleed dropped %s",
+                        room.code, alignment["offset_ms"], len(alignment["turns"]), alignment["dropped"],
+                    )
+                ctx.checkpoint(alignment=alignment)
+        alignment = ctx.state.get("alignment")
+
+        if not ctx.stage_done("merge"):
+            with ctx.stage("merge"):
                 logger.info(
-                    "Second submission for room %s. Merging transcripts (interviewer: %d chars, candidate: %d chars).",
+                    "Merging transcripts for room %s (interviewer: %d chars, candidate: %d chars).",
                     room.code, len(interviewer_text), len(candidate_text),
                 )
 
-                # Merge transcripts into Q&A pairs using LLM
                 if interviewer_text and candidate_text:
-                    qa_pairs = _merge_transcripts_with_llm(interviewer_text, candidate_text)
+                    if alignment and turns_are_unambiguous(alignment["turns"]):
+                        # Every question is followed by its answer, so the turns pair up without the LLM.
+                        qa_pairs = pair_turns(alignment["turns"])
+                    elif alignment:
+                        qa_pairs = merge_in_windows(
+                            ctx, turn_windows(alignment["turns"]),
+                            lambda turns, excerpt: _merge_turns_with_llm(turns, use_cache, excerpt),
+                        )
+                    else:
+                        # No common timeline: let the LLM match the two transcripts as a whole.
+                        qa_pairs = merge_in_windows(
+                            ctx, transcript_pair_windows(interviewer_text, candidate_text),
+                            lambda texts, excerpt: _merge_transcripts_with_llm(*texts, use_cache, excerpt),
+                        )
                     full_text = " ".join(
                         f"{p['question']} {p['answer']}" for p in qa_pairs
                     ).strip()
                 elif interviewer_text or candidate_text:
                     # Only one side has audio — fall back to single-transcript extraction
-                    full_text, qa_pairs = process_qa(interviewer_text or candidate_text)
+                    raw_text = interviewer_text or candidate_text
+                    qa_pairs = merge_in_windows(
+                        ctx, text_windows(raw_text),
+                        lambda text, excerpt: _extract_qa_with_llm(text, use_cache, excerpt),
+                    )
+                    full_text = " ".join(
+                        f"{p['question']} {p['answer']}" for p in qa_pairs
+                    ).strip() or raw_text
                 else:
                     full_text = ""
                     qa_pairs = []
+                ctx.checkpoint(full_text=full_text, qa_pairs=qa_pairs)
+        full_text = ctx.state.get("full_text", "")
+        qa_pairs = ctx.state.get("qa_pairs", [])
 
-                # Evaluate the merged Q&A pairs
-                if qa_pairs:
-                    results = []
-                    total = 0
-                    for pair in qa_pairs:
-                        result = evaluate_single_pair(pair, room.job_role, room.position)
-                        results.append(
-                            {
-                                "question": pair["question"],
-                                "candidate_answer": pair["answer"],
-                                **result,
-                            }
-                        )
-                        total += result["score"]
-                        time.sleep(1)
-
-                    average_score = total / len(results) if results else 0
-                    evaluation_report = {"total_score": average_score, "results": results}
-                    process_status = "success"
-                else:
-                    evaluation_report = {
-                        "total_score": 0,
-                        "results": [],
-                        "note": "Unable to extract Q&A pairs from the recordings.",
+        # Evaluate the merged Q&A pairs
+        if qa_pairs:
+            with ctx.stage("evaluate"):
+                # Resumed jobs only evaluate the pairs without a checkpointed result.
+                results = list(ctx.state.get("results") or [None] * len(qa_pairs))
+                remaining = [index for index, result in enumerate(results) if result is None]
+
+                def publish_partial_report() -> None:
+                    # The verdicts themselves are streamed from the job's checkpointed results;
+                    # the row only carries the running score. Committed with the next checkpoint.
+                    pending.total_score = average_score([item for item in results if item is not None])
+                    pending.status = "evaluating"
+
+                publish_partial_report()
+                ctx.progress("evaluate", len(qa_pairs) - len(remaining), len(qa_pairs))
+
+                # A resumed job adds its calls to those of the earlier attempts.
+                usage = LLMUsage()
+                earlier_usage = ctx.state.get("evaluation_usage") or {}
+
+                def total_usage() -> dict:
+                    return {"mode": EVALUATION_MODE, **{name: earlier_usage.get(name, 0) + value for name, value in usage.as_dict().items()}}
+
+                def record_result(offset: int, result: dict) -> None:
+                    index = remaining[offset]
+                    pair = qa_pairs[index]
+                    results[index] = {
+                        "question": pair["question"],
+                        "candidate_answer": pair["answer"],
+                        **result,
                     }
-                    process_status = "partial"
-            else:
-                logger.info(
-                    "Second submission for room %s. Evaluation skipped by interviewer.",
-                    room.code,
-                )
-                full_text = f"{first_text} {second_text}".strip()
-                qa_pairs = []
-                evaluation_report = {
-                    "total_score": 0,
-                    "results": [],
-                    "note": "Evaluation was skipped by the interviewer.",
-                }
-                process_status = "skipped"
-
-            # Write merged result JSON
-            json_file_name = f"{os.path.splitext(os.path.basename(file.filename))[0]}-{uid}.json"
-            json_file_path = os.path.join(audio_dir, json_file_name)
-
-            with open(json_file_path, "w", encoding="utf-8") as handle:
-                json.dump(
-                    {
-                        "audioFile": audio_file_name,
-                        "roomId": room.id,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "status": process_status,
-                        "interviewer_transcript": interviewer_text,
-                        "candidate_transcript": candidate_text,
-                        "full_transcript": full_text,
-                        "qa_pairs": qa_pairs,
-                        "evaluation_report": evaluation_report,
-                    },
-                    handle,
-                    indent=2,
+                    publish_partial_report()
+                    ctx.checkpoint(results=results, evaluation_usage=total_usage())
+                    ctx.progress("evaluate", sum(1 for item in results if item is not None), len(qa_pairs))
+
+                evaluate_pairs(
+                    [qa_pairs[index] for index in remaining],
+                    room.job_role,
+                    room.position,
+                    on_result=record_result,
+                    usage=usage,
+                    use_cache=use_cache,
                 )
+                logger.info("Evaluated %d pairs for room %s in %s mode: %s", len(remaining), room.code, EVALUATION_MODE, usage.as_dict())
+                ctx.checkpoint(evaluation_usage=total_usage())
 
-            # Update the pending interview record with merged results
-            pending.full_transcript = full_text
-            pending.qa_pairs = qa_pairs
-            pending.evaluation_report = evaluation_report
-            pending.json_file = json_file_path
-            pending.status = "completed"
-            pending.completed_at = datetime.utcnow()
-            pending.candidate_id = room.candidate_id
-
-            room.status = "completed"
-            room.updated_at = datetime.utcnow()
-            db.commit()
-            db.refresh(pending)
-
-            return {
-                "status": process_status,
-                "interview_id": pending.id,
-                "room_id": room.id,
-                "full_transcript": full_text,
-                "qa_pairs": qa_pairs,
-                "evaluation_report": evaluation_report,
+            evaluation_report = {
+                "total_score": average_score(results),
+                "results": results,
+                "usage": ctx.state.get("evaluation_usage", {}),
+            }
+            unscored = sum(1 for result in results if result["score"] is None)
+            if unscored:
+                evaluation_report["unscored"] = unscored
+            process_status = "success"
+        else:
+            evaluation_report = {
+                "total_score": 0,
+                "results": [],
+                "note": "Unable to extract Q&A pairs from the recordings.",
             }
+            process_status = "partial"
+    else:
+        logger.info("Evaluation of room %s skipped by interviewer.", room.code)
+        full_text = f"{interviewer_text} {candidate_text}".strip()
+        qa_pairs = []
+        evaluation_report = {
+            "total_score": 0,
+            "results": [],
+            "note": "Evaluation was skipped by the interviewer.",
+        }
+        process_status = "skipped"
+
+    # Update the pending interview record with merged results
+    pending.transcript_ref = store_artifact(db, full_text)
+    pending.qa_pairs_ref = store_artifact(db, qa_pairs)
+    pending.report_ref = store_artifact(db, evaluation_report)
+    pending.total_score = evaluation_report["total_score"]
+    pending.status = "completed"
+    pending.completed_at = datetime.utcnow()
+    pending.candidate_id = room.candidate_id
+
+    submission.status = "completed"
+    submission.updated_at = datetime.utcnow()
+    room.status = "completed"
+    room.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(pending)
 
-    except HTTPException:
-        raise
-    except Exception as exc:
-        logger.exception("Interview processing failed")
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
-    finally:
-        if os.path.exists(temp_in):
-            os.remove(temp_in)
-        if os.path.exists(temp_wav):
-            os.remove(temp_wav)
\ No newline at end of file
+    # The transcript and report are served by /interviews/{id}; the job result only points there.
+    return {
+        "status": process_status,
+        "interview_id": pending.id,
+        "room_id": room.id,
+    }
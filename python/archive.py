@@ -0,0 +1,248 @@
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, Union
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session, aliased
+
+# Settings are read at import time, so load .env first when run as a script.
+load_dotenv()
+
+from audio_storage import AUDIO_DIR, ContentAddressedWriter, encode_opus
+from database import SessionLocal
+from jobs import JobContext, enqueue, register_handler, run_job
+from metrics import record_archive, record_error, record_reclaimed
+from models import Interview, Job, TranscriptSegment
+
+
+logger = logging.getLogger(__name__)
+
+# How often the archiver runs; 0 disables it.
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+# Recordings of completed interviews are re-encoded to Opus once they have been finished this long.
+ARCHIVE_AFTER_HOURS = float(os.getenv("ARCHIVE_AFTER_HOURS", "24"))
+ARCHIVE_OPUS_BITRATE = os.getenv("ARCHIVE_OPUS_BITRATE", "24k")
+# Days to keep recordings, by interview status ("abandoned": the room never produced an interview).
+# Statuses left out are kept forever.
+AUDIO_RETENTION_DAYS = {
+    status.strip(): float(days)
+    for status, _, days in (
+        item.partition("=")
+        for item in os.getenv("AUDIO_RETENTION_DAYS", "completed=365,pending_merge=30,evaluating=30,abandoned=30").split(",")
+    )
+    if status.strip() and days.strip()
+}
+# Unreferenced files are only deleted once they are this old, so an upload stored
+# a moment before its job is queued is never taken for an orphan.
+ORPHAN_GRACE_HOURS = float(os.getenv("ORPHAN_GRACE_HOURS", "24"))
+# The Node bridge's old output directory. Earlier bridge versions left result
+# files there that nothing reads, so they are deleted once past the grace period.
+BRIDGE_AUDIO_DIR = os.getenv("BRIDGE_AUDIO_DIR", "")
+
+ARCHIVE_EXTENSION = ".opus"
+ABANDONED = "abandoned"
+ACTIVE_JOB_STATUSES = ("queued", "running")
+
+
+@dataclass
+class AudioReference:
+    """A row that points at a stored recording: an interview, a live segment or an upload's processing job."""
+
+    row: Union[Interview, TranscriptSegment, Job]
+    status: str
+    since: datetime
+    # Still being processed, so the file must stay as it is.
+    active: bool
+
+    @property
+    def path(self) -> Optional[str]:
+        if isinstance(self.row, Job):
+            return (self.row.payload or {}).get("audio_path")
+        return self.row.audio_file
+
+    @path.setter
+    def path(self, value: Optional[str]) -> None:
+        if isinstance(self.row, Job):
+            payload = {key: item for key, item in (self.row.payload or {}).items() if key != "audio_path"}
+            self.row.payload = {**payload, "audio_path": value} if value else payload
+        else:
+            self.row.audio_file = value
+
+
+def audio_references(db: Session) -> list[AudioReference]:
+    """Every reference to a stored recording, with the status of its room's interview."""
+    references = [
+        AudioReference(interview, interview.status, interview.completed_at if interview.status == "completed" else interview.created_at, False)
+        for interview in db.query(Interview).filter(Interview.audio_file.is_not(None))
+    ]
+    segment_job = aliased(Job)
+    segments = (
+        db.query(TranscriptSegment, Interview.status, segment_job.status)
+        .outerjoin(Interview, Interview.room_id == TranscriptSegment.room_id)
+        .outerjoin(segment_job, segment_job.id == TranscriptSegment.job_id)
+        .filter(TranscriptSegment.audio_file.is_not(None))
+    )
+    for segment, status, job_status in segments:
+        references.append(AudioReference(segment, status or ABANDONED, segment.created_at, job_status in ACTIVE_JOB_STATUSES))
+    jobs = db.query(Job, Interview.status).outerjoin(Interview, Interview.room_id == Job.room_id).filter(Job.kind == "process_interview")
+    for job, status in jobs:
+        reference = AudioReference(job, status or ABANDONED, job.finished_at or job.created_at, job.status in ACTIVE_JOB_STATUSES)
+        if reference.path:
+            references.append(reference)
+    return references
+
+
+def expire_recordings(db: Session, references: list[AudioReference], now: datetime) -> int:
+    """Drop references older than their status's retention; the files go once nothing else points at them."""
+    expired = 0
+    for reference in references:
+        days = AUDIO_RETENTION_DAYS.get(reference.status)
+        if reference.path and not reference.active and days is not None and now - reference.since >= timedelta(days=days):
+            reference.path = None
+            expired += 1
+    db.commit()
+    return expired
+
+
+def archive_recordings(ctx: JobContext, db: Session, references: list[AudioReference], now: datetime) -> dict:
+    """Re-encode finished interviews' recordings to Opus and point every reference at the new file.
+
+    Each source file is encoded once however many rows share it, and the
+    output is stored under its own hash, so identical recordings end up in
+    one archive file. The original is left for ``collect_garbage``.
+    """
+    by_path: dict[str, list[AudioReference]] = {}
+    for reference in references:
+        if reference.path:
+            by_path.setdefault(reference.path, []).append(reference)
+    due = [
+        path for path, group in by_path.items()
+        if not path.endswith(ARCHIVE_EXTENSION)
+        and not any(reference.active for reference in group)
+        and any(reference.status == "completed" and now - reference.since >= timedelta(hours=ARCHIVE_AFTER_HOURS) for reference in group)
+        and os.path.exists(path)
+    ]
+
+    report = {"files": 0, "failed": 0, "input_bytes": 0, "output_bytes": 0, "seconds": 0.0}
+    for index, path in enumerate(due):
+        started = time.perf_counter()
+        try:
+            data = encode_opus(path, ARCHIVE_OPUS_BITRATE)
+        except Exception:
+            logger.exception("Could not archive %s", path)
+            record_error("archive")
+            report["failed"] += 1
+            continue
+        writer = ContentAddressedWriter(AUDIO_DIR, ARCHIVE_EXTENSION)
+        writer.write(data)
+        archived = writer.commit()
+        elapsed = time.perf_counter() - started
+
+        # Committed with the progress update, so a crash never leaves rows pointing at a deleted original.
+        for reference in by_path[path]:
+            reference.path = archived
+        ctx.progress("reencode", index + 1, len(due))
+
+        input_bytes = os.path.getsize(path)
+        record_archive(input_bytes, len(data), elapsed)
+        report["files"] += 1
+        report["input_bytes"] += input_bytes
+        report["output_bytes"] += len(data)
+        report["seconds"] += elapsed
+
+    report["seconds"] = round(report["seconds"], 3)
+    report["bytes_per_second"] = round(report["input_bytes"] / report["seconds"]) if report["seconds"] else 0
+    return report
+
+
+def sweep(directory: str, label: str, keep: set[str], cutoff: float) -> dict:
+    """Delete the files in ``directory`` not named in ``keep`` and last modified before ``cutoff``."""
+    files = size = 0
+    if os.path.isdir(directory):
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name in keep or not entry.is_file(follow_symlinks=False):
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime >= cutoff:
+                    continue
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+                files += 1
+                size += stat.st_size
+    record_reclaimed(label, size)
+    return {"files": files, "bytes": size}
+
+
+def collect_garbage(references: list[AudioReference]) -> dict:
+    """Delete unreferenced recordings, stale partial uploads and old bridge output."""
+    # Stored files are named by their hash, so the name alone identifies them
+    # even if AUDIO_DIR was reached through a different relative path.
+    keep = {os.path.basename(reference.path) for reference in references if reference.path}
+    cutoff = time.time() - ORPHAN_GRACE_HOURS * 3600
+    report = {"audio": sweep(AUDIO_DIR, "audio", keep, cutoff)}
+    if BRIDGE_AUDIO_DIR and os.path.realpath(BRIDGE_AUDIO_DIR) != os.path.realpath(AUDIO_DIR):
+        report["bridge"] = sweep(BRIDGE_AUDIO_DIR, "bridge", set(), cutoff)
+    return report
+
+
+def schedule_archive(db: Session, delay_seconds: float = 0, exclude: Optional[str] = None) -> Optional[Job]:
+    """Queue the next archiver run unless one is already queued or running."""
+    if ARCHIVE_INTERVAL_SECONDS <= 0:
+        return None
+    pending = db.query(Job.id).filter(Job.kind == "archive_audio", Job.status.in_(ACTIVE_JOB_STATUSES))
+    if exclude:
+        pending = pending.filter(Job.id != exclude)
+    if pending.first():
+        return None
+    return enqueue(db, "archive_audio", {}, run_after=datetime.utcnow() + timedelta(seconds=delay_seconds))
+
+
+@register_handler("archive_audio")
+def run_archive_job(ctx: JobContext, db: Session) -> dict:
+    """Apply retention, re-encode finished recordings to Opus, then delete orphaned files."""
+    if not ctx.payload.get("once"):
+        schedule_archive(db, ARCHIVE_INTERVAL_SECONDS, exclude=ctx.job.id)
+    started = time.perf_counter()
+    now = datetime.utcnow()
+
+    with ctx.stage("expire"):
+        references = audio_references(db)
+        expired = expire_recordings(db, references, now)
+    with ctx.stage("reencode"):
+        archived = archive_recordings(ctx, db, references, now)
+    with ctx.stage("collect_garbage"):
+        deleted = collect_garbage(references)
+
+    deleted_bytes = sum(item["bytes"] for item in deleted.values())
+    report = {
+        "expired": expired,
+        "archived": archived,
+        "deleted": deleted,
+        # Net disk space freed: deleted files less the Opus copies written.
+        "reclaimed_bytes": deleted_bytes - archived["output_bytes"],
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info(
+        "Audio archive: %d expired, %d re-encoded (%d -> %d bytes), %d files deleted, %d bytes reclaimed",
+        expired, archived["files"], archived["input_bytes"], archived["output_bytes"],
+        sum(item["files"] for item in deleted.values()), report["reclaimed_bytes"],
+    )
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as session:
+        job = enqueue(session, "archive_audio", {"once": True})
+        # Mark it running first so an API worker sharing the database doesn't claim it too.
+        job.status, job.attempts = "running", 1
+        session.commit()
+        run_job(session, job)
+        print(json.dumps(job.result if job.status == "completed" else {"status": job.status, "error": job.error}, indent=2))
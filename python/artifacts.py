@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+from typing import Any, Iterable, Optional
+
+import zstandard
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models import Artifact
+
+
+ARTIFACT_ZSTD_LEVEL = int(os.getenv("ARTIFACT_ZSTD_LEVEL", "3"))
+
+# Dialects whose INSERT can skip a digest that is already stored.
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def encode_artifact(value: Any) -> tuple[str, str, int, bytes]:
+    """Serialize ``value`` canonically and return ``(digest, codec, size, data)``.
+
+    The digest is the SHA-256 of the canonical JSON, so equal values share one
+    row. Payloads that zstd can't shrink (short strings) are stored as is.
+    """
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode()
+    digest = hashlib.sha256(raw).hexdigest()
+    compressed = zstandard.ZstdCompressor(level=ARTIFACT_ZSTD_LEVEL).compress(raw)
+    if len(compressed) < len(raw):
+        return digest, "zstd", len(raw), compressed
+    return digest, "json", len(raw), raw
+
+
+def decode_artifact(artifact: Artifact) -> Any:
+    raw = artifact.data
+    if artifact.codec == "zstd":
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    return json.loads(raw)
+
+
+def store_artifact(db: Session, value: Any) -> Optional[str]:
+    """Add ``value`` to the artifact store in the session's transaction and return its digest."""
+    if value is None:
+        return None
+    digest, codec, size, data = encode_artifact(value)
+    row = {"digest": digest, "codec": codec, "size": size, "data": data}
+    dialect_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        db.execute(dialect_insert(Artifact).values(**row).on_conflict_do_nothing(index_elements=["digest"]))
+    elif db.get(Artifact, digest) is None:
+        db.execute(insert(Artifact).values(**row))
+    return digest
+
+
+def read_artifacts(db: Session, digests: Iterable[Optional[str]]) -> dict[str, Any]:
+    """Load and decode several artifacts in one query; missing or None digests are left out."""
+    wanted = {digest for digest in digests if digest}
+    if not wanted:
+        return {}
+    rows = db.execute(select(Artifact).where(Artifact.digest.in_(wanted))).scalars()
+    return {row.digest: decode_artifact(row) for row in rows}
+
+
+async def read_artifacts_async(db: AsyncSession, digests: Iterable[Optional[str]]) -> dict[str, Any]:
+    wanted = {digest for digest in digests if digest}
+    if not wanted:
+        return {}
+    rows = (await db.execute(select(Artifact).where(Artifact.digest.in_(wanted)))).scalars()
+    return {row.digest: decode_artifact(row) for row in rows}
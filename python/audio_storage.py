@@ -0,0 +1,83 @@
+import hashlib
+import os
+import subprocess
+import uuid
+
+from pydub import AudioSegment
+
+
+AUDIO_DIR = os.getenv("AUDIO_DIR", "./audio")
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+DECODE_SAMPLE_RATE = 16000
+
+
+class ContentAddressedWriter:
+    """Write an upload once, hashing as it streams, then name it by its SHA-256.
+
+    Bytes go to a temporary file inside the destination directory and are
+    renamed into place on ``commit``, so the final file is never copied. An
+    upload whose content is already stored is discarded in favour of the
+    existing file, which is touched so the archiver sees it as fresh.
+    """
+
+    def __init__(self, audio_dir: str = AUDIO_DIR, extension: str = ""):
+        os.makedirs(audio_dir, exist_ok=True)
+        self.audio_dir = audio_dir
+        self.extension = extension.lower()
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._temp_path = os.path.join(audio_dir, f".upload-{uuid.uuid4().hex}.part")
+        self._handle = open(self._temp_path, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self._handle.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> str:
+        self._handle.close()
+        path = os.path.join(self.audio_dir, f"{self._hash.hexdigest()}{self.extension}")
+        if os.path.exists(path):
+            os.remove(self._temp_path)
+            os.utime(path)
+        else:
+            os.replace(self._temp_path, path)
+        return path
+
+    def abort(self) -> None:
+        self._handle.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+def decode_pcm(path: str, sample_rate: int = DECODE_SAMPLE_RATE) -> AudioSegment:
+    """Decode any ffmpeg-readable file to mono 16-bit PCM through a pipe.
+
+    This skips writing an intermediate full-rate WAV; the decoded buffer is
+    a few times smaller than the original sample rate and channel count.
+    """
+    process = subprocess.run(
+        [FFMPEG_BINARY, "-nostdin", "-loglevel", "error", "-i", path, "-f", "s16le", "-ac", "1", "-ar", str(sample_rate), "pipe:1"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not decode {path}: {process.stderr.decode(errors='replace').strip()}")
+    return AudioSegment(data=process.stdout, sample_width=2, frame_rate=sample_rate, channels=1)
+
+
+def encode_opus(path: str, bitrate: str) -> bytes:
+    """Re-encode any ffmpeg-readable file to mono Opus in an Ogg container, returned in memory."""
+    process = subprocess.run(
+        [
+            FFMPEG_BINARY, "-nostdin", "-loglevel", "error", "-i", path, "-vn", "-ac", "1",
+            "-c:a", "libopus", "-b:a", bitrate, "-application", "voip", "-f", "ogg", "pipe:1",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg could not encode {path}: {process.stderr.decode(errors='replace').strip()}")
+    return process.stdout
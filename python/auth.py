@@ -0,0 +1,189 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from database import get_db
+from models import User
+from security import create_access_token, decode_access_token, parse_bearer_token
+
+
+# How long a verified user stays cached; a token version bump on another worker is seen after at most this long.
+AUTH_USER_CACHE_TTL_SECONDS = float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "60"))
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", "4096"))
+# Sign-in attempts allowed per minute for one email address and for one client address; 0 disables the limit.
+LOGIN_ATTEMPTS_PER_MINUTE = int(os.getenv("LOGIN_ATTEMPTS_PER_MINUTE", "10"))
+LOGIN_ATTEMPTS_PER_MINUTE_PER_IP = int(os.getenv("LOGIN_ATTEMPTS_PER_MINUTE_PER_IP", "60"))
+LOGIN_LIMITER_MAX_KEYS = 100_000
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Snapshot of the authenticated user; safe to share across requests and threads."""
+
+    id: str
+    email: str
+    role: str
+    token_version: int
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, user: User) -> "CurrentUser":
+        return cls(user.id, user.email, user.role, user.token_version or 0, user.created_at)
+
+
+class UserCache:
+    """Bounded LRU of user snapshots that expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = AUTH_USER_CACHE_TTL_SECONDS, size: int = AUTH_USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._entries: OrderedDict[str, tuple[float, CurrentUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[CurrentUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user: CurrentUser) -> None:
+        if self.ttl <= 0 or self.size <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class AttemptLimiter:
+    """Per-key token buckets that reject, rather than delay, attempts over ``per_minute``."""
+
+    def __init__(self, per_minute: int, max_keys: int = LOGIN_LIMITER_MAX_KEYS):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str) -> float:
+        """Spend one attempt for ``key``; return 0 if allowed, else seconds until the next one is."""
+        if self.capacity <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+
+login_limiters = (
+    (AttemptLimiter(LOGIN_ATTEMPTS_PER_MINUTE), "email"),
+    (AttemptLimiter(LOGIN_ATTEMPTS_PER_MINUTE_PER_IP), "ip"),
+)
+
+
+def check_login_rate(request: Request, email: str) -> None:
+    """Raise 429 once an email or client address exceeds its sign-in budget, before any hashing."""
+    keys = {"email": email.lower(), "ip": request.client.host if request.client else "unknown"}
+    retry_after = max(limiter.hit(keys[kind]) for limiter, kind in login_limiters)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many sign-in attempts; try again shortly",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+def issue_access_token(user: User) -> str:
+    return create_access_token(user.id, {"role": user.role, "email": user.email, "ver": user.token_version or 0})
+
+
+def revoke_tokens(db: Session, user: User) -> None:
+    """Commit a password or role change on ``user`` and invalidate every token issued before it."""
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    # Only after the commit, so a concurrent request can't re-cache the old version.
+    user_cache.invalidate(user.id)
+
+
+def authenticate(token: str, db: Session) -> CurrentUser:
+    """Verify a bearer token, reading the user row only when it isn't cached.
+
+    The signature vouches for the claims; the cached row only confirms the
+    user still exists and the token's version hasn't been revoked.
+    """
+    try:
+        payload = decode_access_token(token)
+        user_id = payload.get("sub")
+        if not user_id:
+            raise ValueError("Missing subject")
+        # Tokens issued before versioning carry no claim and count as version 0.
+        version = int(payload.get("ver", 0))
+    except Exception as exc:
+        raise HTTPException(status_code=401, detail="Invalid or missing token") from exc
+
+    user = user_cache.get(user_id)
+    if user is None or user.token_version < version:
+        # Missing, expired, or older than a version this token proves was issued elsewhere.
+        row = db.get(User, user_id)
+        user = CurrentUser.from_row(row) if row else None
+        if user:
+            user_cache.put(user)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    if user.token_version != version:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return user
+
+
+def get_current_user(authorization: Optional[str] = Header(default=None), db: Session = Depends(get_db)) -> CurrentUser:
+    try:
+        token = parse_bearer_token(authorization)
+    except ValueError as exc:
+        raise HTTPException(status_code=401, detail="Invalid or missing token") from exc
+    return authenticate(token, db)
+
+
+def get_stream_user(
+    token: Optional[str] = None,
+    authorization: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """Like ``get_current_user``, but EventSource cannot send headers, so ``?token=`` is accepted too."""
+    if token and not authorization:
+        return authenticate(token, db)
+    return get_current_user(authorization, db)
@@ -0,0 +1,130 @@
+"""Seed a database with many interviews and compare the dashboard queries.
+
+Run from the ``python`` directory:
+
+    python -m bench.dashboard_queries --interviews 100000
+
+Without ``--database`` a throwaway SQLite file is used. For each listing it
+prints the query plan and timings of the previous ``OR``-filtered query and
+of the ``UNION``-of-branches query the API now runs, for the first page and
+for a page deep in the user's history.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", help="SQLAlchemy URL to seed (default: a temporary SQLite file)")
+    parser.add_argument("--interviews", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("JOB_WORKERS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import desc, or_, select  # noqa: E402
+
+from app import encode_cursor, interview_summaries_query, user_rooms_query  # noqa: E402
+from bench.fixtures import seed_interviews, seed_users  # noqa: E402
+from database import engine  # noqa: E402
+from init_db import upgrade_database  # noqa: E402
+from models import Interview, Room  # noqa: E402
+
+def legacy_interviews_query(user_id: str, cursor_row, limit: int):
+    query = (
+        select(
+            Interview.id, Interview.room_id, Room.code.label("room_code"), Interview.status,
+            Interview.total_score, Interview.created_at, Interview.completed_at,
+        )
+        .join(Room, Room.id == Interview.room_id)
+        .where(
+            Interview.status != "pending_merge",
+            or_(
+                Interview.interviewer_id == user_id,
+                Interview.candidate_id == user_id,
+                Room.interviewer_id == user_id,
+                Room.candidate_id == user_id,
+            ),
+        )
+    )
+    if cursor_row is not None:
+        query = query.where(Interview.created_at < cursor_row.created_at)
+    return query.order_by(desc(Interview.created_at), desc(Interview.id)).limit(limit + 1)
+
+
+def legacy_rooms_query(user_id: str, cursor_row, limit: int):
+    query = select(Room).where(or_(Room.interviewer_id == user_id, Room.candidate_id == user_id))
+    if cursor_row is not None:
+        query = query.where(Room.created_at < cursor_row.created_at)
+    return query.order_by(desc(Room.created_at), desc(Room.id)).limit(limit + 1)
+
+
+def explain(statement) -> list[str]:
+    with engine.connect() as conn:
+        compiled = statement.compile(conn)
+        if conn.dialect.name == "sqlite":
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+            return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)]
+        return [row[0] for row in conn.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)]
+
+
+def time_query(statement) -> float:
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            conn.execute(statement).all()
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def deep_cursor_row(statement_for_page):
+    """Return the row at roughly 80% of the user's history, to time a deep page."""
+    with engine.connect() as conn:
+        rows = conn.execute(statement_for_page).all()
+    return rows[int(len(rows) * 0.8)] if rows else None
+
+
+def report(title: str, legacy, current) -> None:
+    print(f"\n== {title}")
+    for label, statement in (("OR filter", legacy), ("UNION branches", current)):
+        print(f"  {label}: median {time_query(statement):.2f} ms")
+        for line in explain(statement):
+            print(f"      {line}")
+
+
+def main() -> None:
+    upgrade_database()
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    interviewers, candidates = seed_users(engine, args.users)
+    seed_interviews(engine, interviewers, candidates, args.interviews, rng)
+    interviewer_id, candidate_id = interviewers[0], candidates[0]
+    print(f"Seeded {args.interviews} interviews for {args.users} users in {time.perf_counter() - started:.1f}s ({engine.url})")
+
+    for who, user_id in (("busy interviewer", interviewer_id), ("busy candidate", candidate_id)):
+        report(f"/interviews first page, {who}", legacy_interviews_query(user_id, None, args.limit),
+               interview_summaries_query(user_id, None, args.limit))
+        row = deep_cursor_row(legacy_interviews_query(user_id, None, args.interviews))
+        if row is not None:
+            cursor = encode_cursor(row.created_at, row.id)
+            report(f"/interviews deep page, {who}", legacy_interviews_query(user_id, row, args.limit),
+                   interview_summaries_query(user_id, cursor, args.limit))
+        report(f"/rooms/mine first page, {who}", legacy_rooms_query(user_id, None, args.limit),
+               user_rooms_query(user_id, None, args.limit))
+
+
+if __name__ == "__main__":
+    main()
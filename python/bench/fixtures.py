@@ -0,0 +1,103 @@
+"""Bulk seeding helpers shared by the benchmarks."""
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import insert
+
+from artifacts import encode_artifact
+from models import Artifact, Interview, Room, User
+
+BATCH_SIZE = 5_000
+WORDS = "so the service reads from the queue and we shard by tenant then cache hot keys with a ttl".split()
+
+
+def seed_users(engine, count: int) -> tuple[list[str], list[str]]:
+    """Insert ``count`` users, half interviewers and half candidates, and return their ids."""
+    interviewers = [str(uuid.uuid4()) for _ in range(count // 2)]
+    candidates = [str(uuid.uuid4()) for _ in range(count - len(interviewers))]
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": user_id, "email": f"{user_id}@bench.test", "password_hash": "x", "role": role, "created_at": now}
+            for role, ids in (("interviewer", interviewers), ("candidate", candidates))
+            for user_id in ids
+        ])
+    return interviewers, candidates
+
+
+def interview_batches(
+    interviewers: list[str], candidates: list[str], count: int, rng: random.Random, start: int = 0
+) -> Iterator[tuple[list[dict], list[dict]]]:
+    """Yield ``(rooms, interviews)`` row batches for ``count`` interviews, one room each, a minute apart.
+
+    The first five interviewers and candidates take a large share, like a busy
+    hiring team; ``start`` offsets the timestamps so repeated calls don't collide.
+    Interview rows carry no transcript or report; see ``sample_blobs``.
+    """
+    now = datetime.utcnow()
+    interviewer_weights = [50 if index < 5 else 1 for index in range(len(interviewers))]
+    candidate_weights = [20 if index < 5 else 1 for index in range(len(candidates))]
+    for batch_start in range(start, start + count, BATCH_SIZE):
+        rooms, interviews = [], []
+        for position in range(batch_start, min(batch_start + BATCH_SIZE, start + count)):
+            created_at = now - timedelta(minutes=position)
+            interviewer_id = rng.choices(interviewers, interviewer_weights)[0]
+            candidate_id = rng.choices(candidates, candidate_weights)[0]
+            room_id = str(uuid.uuid4())
+            status = rng.choices(["completed", "pending_merge", "evaluating"], [95, 4, 1])[0]
+            rooms.append({
+                "id": room_id, "code": uuid.uuid4().hex[:12].upper(), "name": "Bench room", "job_role": "Engineer",
+                "position": "Mid", "interviewer_id": interviewer_id, "candidate_id": candidate_id,
+                "status": "completed", "created_at": created_at, "updated_at": created_at,
+            })
+            interviews.append({
+                "id": str(uuid.uuid4()), "room_id": room_id, "interviewer_id": interviewer_id,
+                "candidate_id": candidate_id, "created_by_id": interviewer_id, "status": status,
+                "total_score": rng.randint(0, 100), "created_at": created_at, "completed_at": created_at,
+            })
+        yield rooms, interviews
+
+
+def sample_blobs(rng: random.Random, pairs: int = 8) -> tuple[str, list[dict], dict]:
+    """A plausible ``(full_transcript, qa_pairs, evaluation_report)`` for one interview."""
+    qa_pairs = [
+        {
+            "question": " ".join(rng.choices(WORDS, k=rng.randint(8, 20))).capitalize() + "?",
+            "answer": " ".join(rng.choices(WORDS, k=rng.randint(40, 160))).capitalize() + ".",
+        }
+        for _ in range(pairs)
+    ]
+    results = [
+        {
+            "question": pair["question"], "candidate_answer": pair["answer"], "topic": "Engineer", "position": "Mid",
+            "question_relevance": "Highly Relevant", "difficulty_assessment": "Appropriate",
+            "score": rng.randint(0, 100), "feedback": " ".join(rng.choices(WORDS, k=30)).capitalize() + ".",
+        }
+        for pair in qa_pairs
+    ]
+    report = {"total_score": sum(item["score"] for item in results) / len(results), "results": results}
+    return " ".join(f"{pair['question']} {pair['answer']}" for pair in qa_pairs), qa_pairs, report
+
+
+def seed_interviews(
+    engine, interviewers: list[str], candidates: list[str], count: int, rng: random.Random, start: int = 0, with_blobs: bool = False
+) -> None:
+    """Insert ``count`` interviews with their rooms and, if ``with_blobs``, transcript and report artifacts."""
+    for rooms, interviews in interview_batches(interviewers, candidates, count, rng, start):
+        artifacts = {}
+        for interview in interviews if with_blobs else []:
+            transcript, qa_pairs, report = sample_blobs(rng)
+            interview["total_score"] = report["total_score"]
+            refs = []
+            for value in (transcript, qa_pairs, report):
+                digest, codec, size, data = encode_artifact(value)
+                artifacts[digest] = {"digest": digest, "codec": codec, "size": size, "data": data, "created_at": interview["created_at"]}
+                refs.append(digest)
+            interview["transcript_ref"], interview["qa_pairs_ref"], interview["report_ref"] = refs
+        with engine.begin() as conn:
+            conn.execute(insert(Room), rooms)
+            if artifacts:
+                conn.execute(insert(Artifact), list(artifacts.values()))
+            conn.execute(insert(Interview), interviews)
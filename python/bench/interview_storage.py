@@ -0,0 +1,150 @@
+"""Measure interview row size and query speed before and after moving the blobs into artifacts.
+
+Run from the ``python`` directory:
+
+    python -m bench.interview_storage --interviews 50000
+
+It migrates a throwaway database to the revision before artifacts (0003)
+and seeds it with interviews whose transcript, Q&A pairs and report are
+stored inline, as they used to be. It then measures the table size and
+three queries:
+- the dashboard listing (``interview_summaries_query``);
+- loading a page of whole interview rows, as ``select(Interview)`` did;
+- a scan over the whole table.
+
+Next it runs the 0004 migration, vacuums the database, and measures again.
+The artifacts table, which holds the compressed blobs, is reported
+separately.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", help="SQLAlchemy URL to seed (default: a temporary SQLite file)")
+    parser.add_argument("--interviews", type=int, default=50_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("JOB_WORKERS", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlalchemy as sa  # noqa: E402
+from alembic import command  # noqa: E402
+
+from app import interview_summaries_query  # noqa: E402
+from bench.fixtures import interview_batches, sample_blobs, seed_users  # noqa: E402
+from database import engine  # noqa: E402
+from init_db import alembic_config  # noqa: E402
+from models import Room  # noqa: E402
+
+LEGACY_INTERVIEWS = sa.table(
+    "interviews",
+    *(sa.column(name) for name in (
+        "id", "room_id", "interviewer_id", "candidate_id", "created_by_id", "status", "total_score", "created_at", "completed_at",
+    )),
+    sa.column("full_transcript", sa.Text()),
+    sa.column("qa_pairs", sa.JSON()),
+    sa.column("evaluation_report", sa.JSON()),
+    sa.column("json_file", sa.String()),
+)
+
+
+def seed_legacy(interviewers: list[str], candidates: list[str], rng: random.Random) -> None:
+    for rooms, interviews in interview_batches(interviewers, candidates, args.interviews, rng):
+        for interview in interviews:
+            transcript, qa_pairs, report = sample_blobs(rng)
+            interview.update(
+                full_transcript=transcript, qa_pairs=qa_pairs, evaluation_report=report,
+                total_score=report["total_score"], json_file=f"./audio/{interview['id']}.json",
+            )
+        with engine.begin() as conn:
+            conn.execute(sa.insert(Room), rooms)
+            conn.execute(LEGACY_INTERVIEWS.insert(), interviews)
+
+
+def table_bytes(table: str) -> int:
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            return conn.execute(sa.text("SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name = :name"), {"name": table}).scalar()
+        if engine.dialect.name == "postgresql":
+            return conn.execute(sa.text("SELECT pg_total_relation_size(:name)"), {"name": table}).scalar()
+    return 0
+
+
+def timed(statement, params: dict) -> float:
+    """Median milliseconds to run ``statement`` and fetch every row."""
+    durations = []
+    with engine.connect() as conn:
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            conn.execute(statement, params).all()
+            durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
+
+
+def measure(user_id: str) -> dict:
+    rows = sa.text(
+        "SELECT * FROM interviews WHERE interviewer_id = :user_id ORDER BY created_at DESC, id DESC LIMIT :limit"
+    )
+    # Nothing indexes created_by_id, so this reads every page of the table.
+    scan = sa.text("SELECT count(*) FROM interviews WHERE created_by_id = :user_id")
+    with engine.connect() as conn:
+        count = conn.execute(sa.text("SELECT count(*) FROM interviews")).scalar()
+    size = table_bytes("interviews")
+    return {
+        "interviews_bytes": size,
+        "bytes_per_row": round(size / count, 1) if count else 0,
+        "artifacts_bytes": table_bytes("artifacts"),
+        "list_ms": round(timed(interview_summaries_query(user_id, None, args.limit, None), {}), 3),
+        "page_of_rows_ms": round(timed(rows, {"user_id": user_id, "limit": args.limit}), 3),
+        "table_scan_ms": round(timed(scan, {"user_id": user_id}), 3),
+    }
+
+
+def vacuum() -> None:
+    if engine.dialect.name in ("sqlite", "postgresql"):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(sa.text("VACUUM"))
+
+
+def main() -> None:
+    config = alembic_config()
+    command.upgrade(config, "0003")
+    rng = random.Random(args.seed)
+    interviewers, candidates = seed_users(engine, args.users)
+    started = time.perf_counter()
+    seed_legacy(interviewers, candidates, rng)
+    print(f"Seeded {args.interviews} interviews with inline blobs in {time.perf_counter() - started:.1f}s")
+    vacuum()
+    before = measure(interviewers[0])
+
+    started = time.perf_counter()
+    command.upgrade(config, "head")
+    migration_seconds = time.perf_counter() - started
+    vacuum()
+    after = measure(interviewers[0])
+
+    print(f"Migration to artifacts took {migration_seconds:.1f}s\n")
+    print(f"{'':<18} {'inline blobs':>14} {'artifacts':>14} {'change':>8}")
+    for key in before:
+        change = f"{(after[key] - before[key]) / before[key] * 100:+.0f}%" if before[key] else ""
+        print(f"{key:<18} {before[key]:>14} {after[key]:>14} {change:>8}")
+    print(json.dumps({"before": before, "after": after, "migration_seconds": round(migration_seconds, 2)}))
+
+
+if __name__ == "__main__":
+    main()
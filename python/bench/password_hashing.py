@@ -0,0 +1,60 @@
+"""Measure pbkdf2_sha256 throughput to choose PASSWORD_HASH_ROUNDS and PASSWORD_HASH_WORKERS.
+
+Run from the ``python`` directory:
+
+    python -m bench.password_hashing --rounds 29000 100000 300000 --workers 1 2 4
+
+For each rounds setting it reports the latency of one hash, and the hashes
+per second with each worker count, in total and per worker. A sign-in costs
+one verification, so with N hashing workers the server can sustain roughly
+N x (hashes/s per worker) sign-ins per second. Beyond that, PASSWORD_HASH_QUEUE_LIMIT
+requests wait and the rest get a 503.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.hash import pbkdf2_sha256
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[29000, 100000, 300000])
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--seconds", type=float, default=3.0, help="Measuring time per configuration")
+    return parser.parse_args()
+
+
+def hash_for(rounds: int, seconds: float) -> int:
+    """Hash repeatedly for ``seconds`` and return how many hashes completed."""
+    hasher = pbkdf2_sha256.using(rounds=rounds)
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        hasher.hash("correct horse battery staple")
+        count += 1
+    return count
+
+
+def main() -> None:
+    args = parse_args()
+    print(f"{os.cpu_count()} CPUs; each configuration runs for {args.seconds:.1f}s")
+    print(f"{'rounds':>8} {'one hash':>10} {'workers':>8} {'hashes/s':>10} {'per worker':>11}")
+    context = multiprocessing.get_context("spawn")
+    for rounds in args.rounds:
+        started = time.perf_counter()
+        pbkdf2_sha256.using(rounds=rounds).hash("warm up")
+        latency_ms = (time.perf_counter() - started) * 1000
+        for workers in args.workers:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                # Start every process before measuring, so spawn time isn't counted.
+                list(executor.map(hash_for, [rounds] * workers, [0.0] * workers))
+                total = sum(executor.map(hash_for, [rounds] * workers, [args.seconds] * workers))
+            rate = total / args.seconds
+            print(f"{rounds:>8} {latency_ms:>8.1f}ms {workers:>8} {rate:>10.1f} {rate / workers:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
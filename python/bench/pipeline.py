@@ -0,0 +1,540 @@
+"""Offline benchmark of the interview pipeline and API with Gemini and speech recognition faked.
+
+Run from the ``python`` directory (ffmpeg must be on the PATH):
+
+    python -m bench.pipeline --output bench-results.json
+    python -m bench.pipeline --baseline bench-results.json --output new.json
+
+The Gemini client pool is replaced by one local model that sleeps
+``--llm-latency-ms`` and returns well-formed JSON.
+``speech_recognition.Recognizer`` is replaced by one that sleeps ``--stt-latency-ms`` per chunk, plus a share of the chunk's
+length. The API runs under uvicorn on a throwaway SQLite database, with its
+real job workers. Concurrent clients drive it over HTTP.
+
+Scenarios:
+- ``parse_output`` extracts and validates typical model replies in-process.
+- ``transcribe`` runs ``transcribe_audio`` on synthetic recordings of each ``--audio-seconds`` length.
+- ``pipeline`` uploads both sides of ``--interviews`` interviews and waits for the evaluation.
+- ``list_interviews`` and ``list_rooms`` fetch dashboard pages after seeding each ``--db-sizes``.
+- ``event_stream`` opens the evaluation event stream of completed interviews and reads it to the end.
+
+Each scenario reports throughput, p50/p95/p99 latency and peak RSS. The
+results go to ``--output`` as JSON, and ``--baseline`` prints the change
+against an earlier run.
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+SCENARIOS = ("parse_output", "transcribe", "pipeline", "list_interviews", "list_rooms", "event_stream")
+PIPELINE_TIMEOUT_SECONDS = 900
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--llm-latency-ms", type=float, default=400)
+    parser.add_argument("--stt-latency-ms", type=float, default=150, help="Fixed recognizer latency per chunk")
+    parser.add_argument("--stt-realtime-factor", type=float, default=0.05, help="Extra recognizer latency per second of audio")
+    parser.add_argument("--pairs", type=int, default=8, help="Q&A pairs the fake model extracts per interview")
+    parser.add_argument("--audio-seconds", type=int, nargs="+", default=[30, 120, 600])
+    parser.add_argument("--pipeline-audio-seconds", type=int, default=60)
+    parser.add_argument("--interviews", type=int, default=8, help="Interviews run through the pipeline scenario")
+    parser.add_argument("--db-sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per list-endpoint scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per transcription length")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    return parser.parse_args()
+
+
+def configure_environment(workdir: str) -> None:
+    """Point the app at scratch storage before any of its modules read their settings."""
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{workdir}/bench.db",
+        AUDIO_DIR=os.path.join(workdir, "audio"),
+        LLM_CACHE_PATH=os.path.join(workdir, "llm_cache.db"),
+        # Every run should pay for its model calls rather than hit earlier answers.
+        LLM_CACHE_ENABLED="false",
+        LLM_REQUESTS_PER_MINUTE="1000000",
+        STT_BACKEND="google",
+        JOB_POLL_INTERVAL="0.1",
+        LOGIN_ATTEMPTS_PER_MINUTE_PER_IP="0",
+    )
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeResponse:
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        self.usage_metadata = type("UsageMetadata", (), {
+            "prompt_token_count": max(1, len(prompt) // 4),
+            "candidates_token_count": max(1, len(text) // 4),
+        })()
+
+
+class FakeGeminiModel:
+    """Answers the pipeline's prompts with plausible JSON after a configurable delay."""
+
+    def __init__(self, latency_ms: float, pairs: int, seed: int):
+        self.latency = latency_ms / 1000
+        self.pairs = pairs
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt: str, *args, **kwargs) -> FakeResponse:
+        with self.lock:
+            jitter = self.rng.uniform(0.8, 1.2)
+            score = self.rng.randint(40, 95)
+        time.sleep(self.latency * jitter)
+        verdict = {
+            "question_relevance": "Highly Relevant",
+            "difficulty_assessment": "Appropriate",
+            "score": score,
+            "feedback": "Clear answer that covers the main trade-offs.",
+        }
+        if "Exchanges:" in prompt:
+            text = json.dumps([{"id": int(index), **verdict} for index in re.findall(r"\[id (\d+)\]", prompt)])
+        elif '"question": "..."' in prompt:
+            text = json.dumps([
+                {"question": f"Question {index} about the system design?", "answer": f"Answer {index} with some detail."}
+                for index in range(self.pairs)
+            ])
+        else:
+            text = json.dumps(verdict)
+        return FakeResponse(f"```json\n{text}\n```", prompt)
+
+
+class FakeRecognizer:
+    """Stands in for ``speech_recognition.Recognizer``; latency grows with the chunk's length."""
+
+    latency = 0.15
+    realtime_factor = 0.05
+
+    def recognize_google(self, audio_data, language=None, **kwargs) -> str:
+        seconds = len(audio_data.frame_data) / (audio_data.sample_rate * audio_data.sample_width)
+        time.sleep(self.latency + seconds * self.realtime_factor)
+        return " ".join(["word"] * max(1, int(seconds * 2.5)))
+
+
+def install_fakes(args) -> None:
+    import speech_recognition
+
+    import llm
+    from llm_pool import CircuitBreaker, ClientPool, GeminiClient
+
+    fake = GeminiClient(
+        "bench", llm.GEMINI_MODEL, FakeGeminiModel(args.llm_latency_ms, args.pairs, args.seed),
+        requests_per_minute=llm.LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute=llm.LLM_TOKENS_PER_MINUTE,
+        breaker=CircuitBreaker(llm.LLM_CIRCUIT_FAILURES, llm.LLM_CIRCUIT_COOLDOWN_SECONDS),
+    )
+    llm.pool = ClientPool([fake], [llm.GEMINI_MODEL])
+    FakeRecognizer.latency = args.stt_latency_ms / 1000
+    FakeRecognizer.realtime_factor = args.stt_realtime_factor
+    speech_recognition.Recognizer = FakeRecognizer
+
+
+def synthetic_audio(seconds: int, seed: int) -> bytes:
+    """A WAV of tone bursts separated by pauses, so silence detection finds speech-like regions."""
+    from pydub import AudioSegment
+    from pydub.generators import Sine
+
+    rng = random.Random(seed)
+    bursts = [Sine(rng.choice((180, 220, 260))).to_audio_segment(duration=ms, volume=-12) for ms in (900, 1600, 2400, 3200)]
+    pauses = [AudioSegment.silent(duration=ms, frame_rate=16000) for ms in (300, 800, 1500)]
+    audio = AudioSegment.silent(duration=200, frame_rate=16000)
+    while len(audio) < seconds * 1000:
+        audio += rng.choice(bursts).set_frame_rate(16000) + rng.choice(pauses)
+    buffer = io.BytesIO()
+    audio[: seconds * 1000].set_channels(1).export(buffer, format="wav")
+    return buffer.getvalue()
+
+
+def read_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        # ru_maxrss is the lifetime peak (KiB on Linux, bytes on macOS); the best available without /proc.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Track this process's peak resident set size while a scenario runs."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, read_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, read_rss_bytes())
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+
+def summarize(name: str, params: dict, latencies: list[float], errors: int, elapsed: float, rss: RssSampler) -> dict:
+    result = {
+        "name": name,
+        "params": params,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_rss_mb": round(rss.peak / 2**20, 1),
+    }
+    print(
+        f"{name:<40} {result['throughput_per_s']:>10.2f}/s  p50 {result['p50_ms']:>9.2f}ms  "
+        f"p95 {result['p95_ms']:>9.2f}ms  p99 {result['p99_ms']:>9.2f}ms  rss {result['peak_rss_mb']:>7.1f}MB  errors {errors}"
+    )
+    return result
+
+
+def run_concurrently(task, count: int, concurrency: int) -> tuple[list[float], int, float]:
+    """Call ``task(index)`` ``count`` times from ``concurrency`` threads; return latencies, errors and wall time."""
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def timed(index: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            task(index)
+        except Exception as exc:
+            with lock:
+                errors += 1
+            print(f"  request {index} failed: {exc}", file=sys.stderr)
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed, range(count)))
+    return latencies, errors, time.perf_counter() - started
+
+
+class ApiServer:
+    """Run the app under uvicorn in a background thread, with its lifespan and job workers."""
+
+    def __init__(self):
+        import uvicorn
+
+        from app import app
+
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "ApiServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        self.port = self.server.servers[0].sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=30)
+
+
+class ApiClient:
+    """One keep-alive HTTP connection per thread."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self.local = threading.local()
+
+    def request(self, method: str, path: str, body=None, token: str | None = None, expect: int = 200) -> dict:
+        payload = self.request_raw(method, path, body, token, expect)
+        return json.loads(payload) if payload else {}
+
+    def request_raw(self, method: str, path: str, body=None, token: str | None = None, expect: int = 200) -> bytes:
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=600)
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if isinstance(body, dict):
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (http.client.HTTPException, OSError):
+            self.local.connection = None
+            raise
+        if response.status != expect:
+            raise RuntimeError(f"{method} {path} returned {response.status}: {payload[:200]!r}")
+        return payload
+
+
+def bench_parse_output(args) -> list[dict]:
+    from structured import BatchVerdict, QAPair, Verdict, parse_items, parse_object
+
+    verdict = {"question_relevance": "Highly Relevant", "difficulty_assessment": "Appropriate", "score": 80, "feedback": "Solid"}
+    merged = [{"question": f"Question {index}?", "answer": "An answer with {braces} and [brackets] " * 20} for index in range(200)]
+    samples = [
+        (f"```json\n{json.dumps(verdict)}\n```", lambda text: parse_object(text, Verdict)),
+        (f"Here is the result: {json.dumps(verdict)} Hope this helps.", lambda text: parse_object(text, Verdict)),
+        (json.dumps([{"id": index, **verdict} for index in range(20)]), lambda text: parse_items(text, BatchVerdict)),
+        # A long merged transcript, cut off mid-way as when the output token limit is hit.
+        (json.dumps(merged)[:-500], lambda text: parse_items(text, QAPair)),
+    ]
+    results = []
+    for (text, parse), name in zip(samples, ("fenced_object", "object_in_prose", "batch_verdicts", "truncated_transcript")):
+        latencies = []
+        with RssSampler() as rss:
+            started = time.perf_counter()
+            for _ in range(2_000):
+                call_started = time.perf_counter()
+                parse(text)
+                latencies.append(time.perf_counter() - call_started)
+            elapsed = time.perf_counter() - started
+        results.append(summarize(f"parse_output[{name}]", {"calls": len(latencies), "chars": len(text)}, latencies, 0, elapsed, rss))
+    return results
+
+
+def bench_transcribe(args, workdir: str) -> list[dict]:
+    from transcription import transcribe_audio
+
+    results = []
+    for seconds in args.audio_seconds:
+        path = os.path.join(workdir, f"speech-{seconds}s.wav")
+        with open(path, "wb") as handle:
+            handle.write(synthetic_audio(seconds, args.seed + seconds))
+        latencies = []
+        with RssSampler() as rss:
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                call_started = time.perf_counter()
+                text, segments = transcribe_audio(path)
+                if not segments:
+                    raise RuntimeError(f"transcribe_audio returned nothing for {path}")
+                latencies.append(time.perf_counter() - call_started)
+            elapsed = time.perf_counter() - started
+        results.append(summarize(f"transcribe[{seconds}s]", {"audio_seconds": seconds, "runs": args.repeat}, latencies, 0, elapsed, rss))
+    return results
+
+
+def wait_until(deadline: float, what: str) -> None:
+    if time.monotonic() > deadline:
+        raise TimeoutError(f"Timed out waiting for {what}")
+    time.sleep(0.1)
+
+
+def bench_pipeline(args, client: ApiClient) -> list[dict]:
+    """Upload both sides of each interview concurrently and time until its evaluation completes."""
+    recordings = []
+    for index in range(args.interviews):
+        interviewer = client.request("POST", "/auth/signup", {"email": f"i{index}@pipeline.bench", "password": "benchmark", "role": "interviewer"})
+        candidate = client.request("POST", "/auth/signup", {"email": f"c{index}@pipeline.bench", "password": "benchmark", "role": "candidate"})
+        room = client.request("POST", "/rooms/create", {"job_role": "Backend Engineer", "position": "Mid"}, interviewer["access_token"])
+        client.request("POST", "/rooms/join", {"room_code": room["code"]}, candidate["access_token"])
+        recordings.append((
+            room["code"],
+            [
+                (interviewer["access_token"], synthetic_audio(args.pipeline_audio_seconds, args.seed * 1000 + index * 2)),
+                (candidate["access_token"], synthetic_audio(args.pipeline_audio_seconds, args.seed * 1000 + index * 2 + 1)),
+            ],
+        ))
+
+    def run_interview(index: int) -> None:
+        room_code, sides = recordings[index]
+        job_ids = [
+            client.request("POST", f"/process-interview/stream?room_id={room_code}&filename=side.wav", audio, token, expect=202)["job_id"]
+            for token, audio in sides
+        ]
+        token = sides[0][0]
+        deadline = time.monotonic() + PIPELINE_TIMEOUT_SECONDS
+        interview_id = None
+        for job_id in job_ids:
+            while True:
+                job = client.request("GET", f"/jobs/{job_id}", token=token)
+                if job["status"] == "failed":
+                    raise RuntimeError(f"Job {job_id} failed: {job['error']}")
+                if job["status"] == "completed":
+                    interview_id = job["result"]["interview_id"]
+                    break
+                wait_until(deadline, f"job {job_id}")
+        # The merge and evaluation run as a separate job once both sides are in.
+        while client.request("GET", f"/interviews/{interview_id}", token=token)["status"] != "completed":
+            wait_until(deadline, f"interview {interview_id}")
+
+    with RssSampler() as rss:
+        latencies, errors, elapsed = run_concurrently(run_interview, args.interviews, args.concurrency)
+    params = {"interviews": args.interviews, "concurrency": args.concurrency, "audio_seconds": args.pipeline_audio_seconds, "pairs": args.pairs}
+    return [summarize("pipeline", params, latencies, errors, elapsed, rss)]
+
+
+def bench_list_endpoints(args, client: ApiClient) -> list[dict]:
+    """Seed the database up to each size and time the dashboard listings for its busiest users."""
+    from auth import issue_access_token
+    from bench.fixtures import seed_interviews, seed_users
+    from database import SessionLocal, engine
+    from models import User
+
+    rng = random.Random(args.seed)
+    interviewers, candidates = seed_users(engine, 200)
+    with SessionLocal() as db:
+        tokens = [issue_access_token(db.get(User, user_id)) for user_id in interviewers[:5] + candidates[:5]]
+
+    results = []
+    seeded = 0
+    for size in sorted(args.db_sizes):
+        seed_interviews(engine, interviewers, candidates, size - seeded, rng, start=seeded)
+        seeded = size
+        for scenario, path in (("list_interviews", "/interviews?limit=20"), ("list_rooms", "/rooms/mine?limit=20")):
+            if scenario not in args.scenarios:
+                continue
+            with RssSampler() as rss:
+                latencies, errors, elapsed = run_concurrently(
+                    lambda index: client.request("GET", path, token=tokens[index % len(tokens)]),
+                    args.requests,
+                    args.concurrency,
+                )
+            params = {"db_interviews": size, "requests": args.requests, "concurrency": args.concurrency}
+            results.append(summarize(f"{scenario}[{size}]", params, latencies, errors, elapsed, rss))
+    return results
+
+
+def bench_event_stream(args, client: ApiClient) -> list[dict]:
+    """Read the whole event stream of seeded, completed interviews: the async session path on SQLite."""
+    from sqlalchemy import select
+
+    from auth import issue_access_token
+    from bench.fixtures import seed_interviews, seed_users
+    from database import SessionLocal, engine
+    from models import Interview, User
+
+    rng = random.Random(args.seed)
+    interviewers, candidates = seed_users(engine, 20)
+    seed_interviews(engine, interviewers, candidates, 200, rng, with_blobs=True)
+    with SessionLocal() as db:
+        streams = [
+            (interview_id, issue_access_token(db.get(User, interviewer_id)))
+            for interview_id, interviewer_id in db.execute(
+                select(Interview.id, Interview.interviewer_id).where(Interview.status == "completed").limit(50)
+            )
+        ]
+
+    def read_stream(index: int) -> None:
+        interview_id, token = streams[index % len(streams)]
+        body = client.request_raw("GET", f"/interviews/{interview_id}/events", token=token)
+        if b"event: complete" not in body:
+            raise RuntimeError(f"Stream for {interview_id} ended without completing: {body[:200]!r}")
+
+    with RssSampler() as rss:
+        latencies, errors, elapsed = run_concurrently(read_stream, args.requests, args.concurrency)
+    params = {"requests": args.requests, "concurrency": args.concurrency}
+    return [summarize("event_stream", params, latencies, errors, elapsed, rss)]
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline_path: str, scenarios: list[dict]) -> None:
+    with open(baseline_path) as handle:
+        baseline = {item["name"]: item for item in json.load(handle)["scenarios"]}
+    print(f"\nChange against {baseline_path} (negative p95 and positive throughput are improvements):")
+    for item in scenarios:
+        before = baseline.get(item["name"])
+        if not before:
+            continue
+
+        def change(key: str) -> str:
+            return f"{(item[key] - before[key]) / before[key] * 100:+.1f}%" if before[key] else "n/a"
+
+        print(f"  {item['name']:<40} throughput {change('throughput_per_s'):>8}  p95 {change('p95_ms'):>8}  rss {change('peak_rss_mb'):>8}")
+
+
+def main() -> None:
+    args = parse_args()
+    needs_ffmpeg = {"transcribe", "pipeline"} & set(args.scenarios)
+    if needs_ffmpeg and not shutil.which(os.getenv("FFMPEG_BINARY", "ffmpeg")):
+        raise SystemExit(f"ffmpeg is required for the {', '.join(sorted(needs_ffmpeg))} scenario(s)")
+
+    workdir = tempfile.mkdtemp(prefix="fairview-bench-")
+    configure_environment(workdir)
+    install_fakes(args)
+    from init_db import upgrade_database
+
+    upgrade_database()
+
+    scenarios: list[dict] = []
+    if "parse_output" in args.scenarios:
+        scenarios += bench_parse_output(args)
+    if "transcribe" in args.scenarios:
+        scenarios += bench_transcribe(args, workdir)
+    if {"pipeline", "list_interviews", "list_rooms", "event_stream"} & set(args.scenarios):
+        with ApiServer() as server:
+            client = ApiClient(server.port)
+            if "pipeline" in args.scenarios:
+                scenarios += bench_pipeline(args, client)
+            if {"list_interviews", "list_rooms"} & set(args.scenarios):
+                scenarios += bench_list_endpoints(args, client)
+            if "event_stream" in args.scenarios:
+                scenarios += bench_event_stream(args, client)
+
+    report = {
+        "revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "scenarios": scenarios,
+    }
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\nWrote {args.output}")
+    if args.baseline:
+        compare(args.baseline, scenarios)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,61 @@
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./fair_view.db")
+# Derived from DATABASE_URL when unset: aiosqlite for SQLite, asyncpg for Postgres.
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() != "false"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "30000"))
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args, future=True)
+
+def engine_options(url: str) -> dict:
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        # sqlite3's timeout is its busy handler: writers wait for the lock instead of failing.
+        connect_args = {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if parsed.get_driver_name() == "pysqlite":
+            connect_args["check_same_thread"] = False
+        options["connect_args"] = connect_args
+        if parsed.database in (None, "", ":memory:"):
+            return options
+        if parsed.get_driver_name() == "aiosqlite":
+            # aiosqlite file databases default to NullPool, which rejects the sizing options below.
+            options["poolclass"] = AsyncAdaptedQueuePool
+    options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+
+def configure_sqlite(engine) -> None:
+    """Use WAL so readers never wait for the job workers' writes."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+
+engine = create_engine(DATABASE_URL, future=True, **engine_options(DATABASE_URL))
+configure_sqlite(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
@@ -18,4 +65,37 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def async_database_url() -> str:
+    if ASYNC_DATABASE_URL:
+        return ASYNC_DATABASE_URL
+    url = make_url(DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for {backend!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """Create the async engine on first use, so the sync-only paths don't need an async driver."""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = async_database_url()
+        async_engine = create_async_engine(url, **engine_options(url))
+        configure_sqlite(async_engine.sync_engine)
+        _async_sessionmaker = async_sessionmaker(async_engine, expire_on_commit=False)
+    return _async_sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    global _async_sessionmaker
+    if _async_sessionmaker is not None:
+        await _async_sessionmaker.kw["bind"].dispose()
+        _async_sessionmaker = None
@@ -0,0 +1,254 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+from llm import GEMINI_MODEL, LLMUsage, estimate_tokens, generate_validated
+from llm_cache import cache_key, read_cache, write_cache
+from structured import BATCH_VERDICTS_SCHEMA, VERDICT_SCHEMA, BatchVerdict, Verdict, parse_items, parse_object
+
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_CONCURRENCY = int(os.getenv("EVALUATION_CONCURRENCY", "4"))
+# "per_pair" sends one prompt per Q&A pair; "batch" packs many pairs into one prompt.
+EVALUATION_MODE = os.getenv("EVALUATION_MODE", "per_pair").strip().lower()
+EVALUATION_BATCH_TOKEN_BUDGET = int(os.getenv("EVALUATION_BATCH_TOKEN_BUDGET", "8000"))
+
+# Bump when the rubric or prompts change so cached verdicts are not reused.
+EVALUATE_PAIR_TEMPLATE = "evaluate_pair/v1"
+
+RELEVANCE_VALUES = '"Highly Relevant" | "Somewhat Relevant" | "Not Relevant"'
+DIFFICULTY_VALUES = '"Too Easy" | "Appropriate" | "Too Hard"'
+
+
+def _rubric(job_role: str, position: str) -> str:
+    return f"""1. **Question Relevance** – Is this question relevant to the target job role ({job_role})?
+   Rate as: "Highly Relevant", "Somewhat Relevant", or "Not Relevant".
+
+2. **Question Difficulty** – Given the position level ({position}), is this question's difficulty appropriate?
+   Rate as: "Too Easy", "Appropriate", or "Too Hard".
+
+3. **Answer Score** – Score the candidate's answer from 0-100.
+   - 90-100: Excellent, thorough and accurate
+   - 70-89: Good, mostly correct with minor gaps
+   - 50-69: Partial understanding, missing key details
+   - 0-49: Poor or incorrect
+
+4. **Feedback** – Give brief, specific technical feedback on the answer."""
+
+
+def _verdict(data: dict, job_role: str, position: str) -> dict:
+    return {
+        "topic": job_role,
+        "position": position,
+        "question_relevance": data.get("question_relevance", "Unknown"),
+        "difficulty_assessment": data.get("difficulty_assessment", "Unknown"),
+        "score": data.get("score", 0),
+        "feedback": data.get("feedback", ""),
+    }
+
+
+def _failed_verdict(error: str, job_role: str, position: str) -> dict:
+    # Unscored rather than 0, so a parsing failure can't pass for a poor answer in the average.
+    return {
+        **_verdict({"score": None, "feedback": "This answer could not be evaluated."}, job_role, position),
+        "error": error,
+    }
+
+
+def _verdict_cache_key(pair: dict, job_role: str, position: str, model_name: str = GEMINI_MODEL) -> str:
+    return cache_key(model_name, EVALUATE_PAIR_TEMPLATE, job_role, position, pair["question"], pair["answer"])
+
+
+def _store_verdict(pair: dict, job_role: str, position: str, verdict: Verdict, model_name: str) -> dict:
+    # Keyed on the model that answered, so a fallback model's verdict is never served as the primary's.
+    data = verdict.model_dump(include=set(Verdict.model_fields))
+    write_cache(_verdict_cache_key(pair, job_role, position, model_name), data)
+    return _verdict(data, job_role, position)
+
+
+def evaluate_single_pair(pair: dict, job_role: str, position: str, usage: Optional[LLMUsage] = None, use_cache: bool = True) -> dict:
+    """Evaluate a single Q&A pair using Gemini, considering job role and position level."""
+    cached = read_cache(_verdict_cache_key(pair, job_role, position), use_cache)
+    if cached is not None:
+        return _verdict(cached, job_role, position)
+
+    prompt = f"""You are a strict technical interview evaluator.
+
+Context:
+- Target Job Role: {job_role}
+- Position Level: {position}
+
+Interviewer's Question:
+{pair["question"]}
+
+Candidate's Answer:
+{pair["answer"]}
+
+Evaluate TWO things:
+
+{_rubric(job_role, position)}
+
+Return ONLY a JSON object (no markdown, no explanation):
+{{
+  "question_relevance": {RELEVANCE_VALUES},
+  "difficulty_assessment": {DIFFICULTY_VALUES},
+  "score": <int 0-100>,
+  "feedback": "<brief feedback>"
+}}
+"""
+    try:
+        verdict, model_name = generate_validated(
+            prompt,
+            lambda text: parse_object(text, Verdict),
+            usage,
+            operation="evaluate_pair",
+            response_schema=VERDICT_SCHEMA,
+        )
+    except Exception as exc:
+        logger.warning("Evaluation of a pair failed: %s", exc)
+        return _failed_verdict(str(exc), job_role, position)
+    return _store_verdict(pair, job_role, position, verdict, model_name)
+
+
+def _batch_header(job_role: str, position: str) -> str:
+    return f"""You are a strict technical interview evaluator.
+
+Context:
+- Target Job Role: {job_role}
+- Position Level: {position}
+
+Below are several interview exchanges, each with a numeric "id". Evaluate every
+exchange independently on these criteria:
+
+{_rubric(job_role, position)}
+
+Return ONLY a JSON array (no markdown, no explanation) with exactly one object
+per exchange, in any order:
+[
+  {{
+    "id": <the exchange id>,
+    "question_relevance": {RELEVANCE_VALUES},
+    "difficulty_assessment": {DIFFICULTY_VALUES},
+    "score": <int 0-100>,
+    "feedback": "<brief feedback>"
+  }}
+]
+
+Exchanges:
+"""
+
+
+def _format_exchange(index: int, pair: dict) -> str:
+    return f"""
+[id {index}]
+Interviewer's Question:
+{pair["question"]}
+
+Candidate's Answer:
+{pair["answer"]}
+"""
+
+
+def chunk_pairs(pairs: list[dict], header: str, token_budget: int = EVALUATION_BATCH_TOKEN_BUDGET) -> list[list[int]]:
+    """Group pair indices so each batch prompt stays within ``token_budget`` tokens."""
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = estimate_tokens(header)
+    for index, pair in enumerate(pairs):
+        pair_tokens = estimate_tokens(_format_exchange(index, pair))
+        if current and current_tokens + pair_tokens > token_budget:
+            chunks.append(current)
+            current = []
+            current_tokens = estimate_tokens(header)
+        current.append(index)
+        current_tokens += pair_tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _evaluate_one(pairs: list[dict], index: int, job_role: str, position: str, usage: Optional[LLMUsage], use_cache: bool) -> dict[int, dict]:
+    return {index: evaluate_single_pair(pairs[index], job_role, position, usage, use_cache)}
+
+
+def _evaluate_batch(pairs: list[dict], indices: list[int], header: str, job_role: str, position: str, usage: Optional[LLMUsage], use_cache: bool) -> dict[int, dict]:
+    verdicts: dict[int, dict] = {}
+    for index in indices:
+        cached = read_cache(_verdict_cache_key(pairs[index], job_role, position), use_cache)
+        if cached is not None:
+            verdicts[index] = _verdict(cached, job_role, position)
+    indices = [index for index in indices if index not in verdicts]
+    if not indices:
+        return verdicts
+
+    prompt = header + "".join(_format_exchange(index, pairs[index]) for index in indices)
+    parsed: list[BatchVerdict] = []
+    model_name = GEMINI_MODEL
+    try:
+        (parsed, rejected), model_name = generate_validated(
+            prompt,
+            lambda text: parse_items(text, BatchVerdict),
+            usage,
+            operation="evaluate_batch",
+            response_schema=BATCH_VERDICTS_SCHEMA,
+        )
+        if rejected:
+            logger.warning("Batch evaluation returned %d malformed verdicts", rejected)
+    except Exception as exc:
+        logger.warning("Batch evaluation of %d pairs failed: %s", len(indices), exc)
+
+    for item in parsed:
+        if item.id in indices and item.id not in verdicts:
+            verdicts[item.id] = _store_verdict(pairs[item.id], job_role, position, item, model_name)
+
+    # Only the entries the model dropped or garbled are re-asked one by one.
+    missing = [index for index in indices if index not in verdicts]
+    if missing:
+        logger.info("Batch evaluation fell back to per-pair calls for %d of %d pairs", len(missing), len(indices))
+    for index in missing:
+        verdicts[index] = evaluate_single_pair(pairs[index], job_role, position, usage, use_cache)
+    return verdicts
+
+
+def evaluate_pairs(
+    pairs: list[dict],
+    job_role: str,
+    position: str,
+    on_result: Optional[Callable[[int, dict], None]] = None,
+    concurrency: int = EVALUATION_CONCURRENCY,
+    mode: str = EVALUATION_MODE,
+    usage: Optional[LLMUsage] = None,
+    use_cache: bool = True,
+) -> list[dict]:
+    """Evaluate pairs concurrently and return the results in the original pair order.
+
+    Throughput is bounded by ``concurrency`` and by the shared Gemini rate
+    limiter in ``llm``. In ``batch`` mode each request scores a token-budgeted
+    chunk of pairs. ``on_result`` is called from the calling thread as each
+    pair finishes, so it may safely use the caller's database session.
+    """
+    results: list[Optional[dict]] = [None] * len(pairs)
+    if not pairs:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="evaluate") as executor:
+        if mode == "batch":
+            header = _batch_header(job_role, position)
+            futures = [
+                executor.submit(_evaluate_batch, pairs, indices, header, job_role, position, usage, use_cache)
+                for indices in chunk_pairs(pairs, header)
+            ]
+        else:
+            futures = [
+                executor.submit(_evaluate_one, pairs, index, job_role, position, usage, use_cache)
+                for index in range(len(pairs))
+            ]
+        for future in as_completed(futures):
+            for index, result in sorted(future.result().items()):
+                results[index] = result
+                if on_result:
+                    on_result(index, result)
+
+    return results
@@ -0,0 +1,64 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from anyio import to_thread
+
+
+T = TypeVar("T")
+
+# Threads shared by sync endpoints and run_in_threadpool calls (Starlette's default is 40).
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+# Processes reserved for password hashing; 0 hashes on the API threadpool instead.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Hashes running or waiting before further sign-ins are turned away with a 503.
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+_executor_lock = threading.Lock()
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_slots = threading.BoundedSemaphore(max(1, PASSWORD_HASH_QUEUE_LIMIT))
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised instead of queueing work behind a full pool."""
+
+
+def configure_threadpool(size: int = API_THREADPOOL_SIZE) -> None:
+    """Resize the threadpool that keeps blocking database and file work off the event loop."""
+    to_thread.current_default_thread_limiter().total_tokens = size
+
+
+def get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    with _executor_lock:
+        if _hash_executor is None:
+            # Spawn rather than fork: forking a process that runs worker threads can copy held locks.
+            _hash_executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _hash_executor
+
+
+async def run_password_hash(func: Callable[..., T], *args) -> T:
+    """Await a password hash or verification without holding an API thread while it runs.
+
+    A separate pool keeps a login burst from starving the threadpool; past
+    ``PASSWORD_HASH_QUEUE_LIMIT`` callers get ExecutorSaturated.
+    """
+    if not _hash_slots.acquire(blocking=False):
+        raise ExecutorSaturated("Password hashing queue is full")
+    try:
+        if PASSWORD_HASH_WORKERS <= 0:
+            return await to_thread.run_sync(func, *args)
+        return await asyncio.wrap_future(get_hash_executor().submit(func, *args))
+    finally:
+        _hash_slots.release()
+
+
+def shutdown_cpu_executor() -> None:
+    global _hash_executor
+    with _executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(cancel_futures=True)
+        _hash_executor = None
@@ -1,6 +1,24 @@
-from database import Base, engine
-from models import Interview, Room, User
+import os
 
-Base.metadata.create_all(bind=engine)
+from alembic import command
+from alembic.config import Config
 
-print("DB Ready.")
\ No newline at end of file
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    # Resolve the scripts relative to this file so the app can start from any directory.
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    return config
+
+
+def upgrade_database() -> None:
+    """Apply any pending schema migrations."""
+    command.upgrade(alembic_config(), "head")
+
+
+if __name__ == "__main__":
+    upgrade_database()
+    print("DB Ready.")
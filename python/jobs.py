@@ -0,0 +1,332 @@
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from metrics import JOB_DURATION, STAGE_DURATION, record_error, set_span_attributes, span
+from models import Job
+
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# A failed attempt is retried after this many seconds, doubling with each further attempt.
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "5"))
+# How often a running job's lease is renewed while its handler works.
+JOB_HEARTBEAT_SECONDS = JOB_LEASE_SECONDS / 3
+
+
+class JobDeferred(Exception):
+    """Raised by a handler to run the job again later without using up an attempt."""
+
+    def __init__(self, reason: str, delay_seconds: float = JOB_POLL_INTERVAL):
+        super().__init__(reason)
+        self.delay_seconds = delay_seconds
+
+
+class JobLeaseLost(Exception):
+    """The job's lease expired and another worker claimed it, so this run must stop without writing."""
+
+
+_handlers: dict[str, Callable[["JobContext", Session], dict]] = {}
+
+
+def register_handler(kind: str):
+    """Register the function that runs jobs of the given kind."""
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: dict,
+    room_id: Optional[str] = None,
+    created_by_id: Optional[str] = None,
+    run_after: Optional[datetime] = None,
+    commit: bool = True,
+) -> Job:
+    """Add a job to the queue; with ``commit=False`` it is only flushed into the caller's transaction."""
+    job = Job(
+        kind=kind,
+        status="queued",
+        payload=payload,
+        stages={},
+        state={},
+        room_id=room_id,
+        created_by_id=created_by_id,
+        run_after=run_after,
+        updated_at=datetime.utcnow(),
+    )
+    db.add(job)
+    if commit:
+        db.commit()
+        db.refresh(job)
+    else:
+        db.flush()
+    return job
+
+
+class JobContext:
+    """Tracks stage progress and checkpointed state for a running job.
+
+    Every update is committed immediately so ``/jobs/{id}`` reflects it and a
+    resumed job can skip the stages that already finished.
+    """
+
+    def __init__(self, db: Session, job: Job):
+        self.db = db
+        self.job = job
+        self.attempt = job.attempts
+        self.attributes = {"job.id": job.id, "job.kind": job.kind, "room.id": job.room_id}
+
+    def annotate(self, **attributes: Any) -> None:
+        """Attach attributes, such as the interview id, to the job's span and its stage spans."""
+        self.attributes.update(attributes)
+        set_span_attributes(**attributes)
+
+    @property
+    def payload(self) -> dict:
+        return self.job.payload or {}
+
+    @property
+    def state(self) -> dict:
+        return self.job.state or {}
+
+    def stage_done(self, name: str) -> bool:
+        return (self.job.stages or {}).get(name, {}).get("status") == "completed"
+
+    def checkpoint(self, **values: Any) -> None:
+        self.job.state = {**self.state, **values}
+        self._commit()
+
+    def progress(self, name: str, completed: int, total: int) -> None:
+        self._update_stage(name, completed=completed, total=total)
+        self._commit()
+
+    @contextmanager
+    def stage(self, name: str):
+        self.job.stage = name
+        self._update_stage(name, status="running", started_at=datetime.utcnow().isoformat())
+        self._commit()
+        started = time.perf_counter()
+        outcome = "failed"
+        try:
+            with span(f"{self.job.kind}.{name}", **self.attributes):
+                yield
+            outcome = "completed"
+        except JobLeaseLost:
+            self.db.rollback()
+            raise
+        except JobDeferred:
+            outcome = "waiting"
+            self.db.rollback()
+            self._update_stage(name, status="waiting")
+            self._commit()
+            raise
+        except Exception:
+            self.db.rollback()
+            self._update_stage(name, status="failed")
+            self._commit()
+            raise
+        finally:
+            STAGE_DURATION.labels(self.job.kind, name, outcome).observe(time.perf_counter() - started)
+        self._update_stage(name, status="completed", finished_at=datetime.utcnow().isoformat())
+        self._commit()
+
+    def _update_stage(self, name: str, **values: Any) -> None:
+        stages = dict(self.job.stages or {})
+        stages[name] = {**stages.get(name, {}), **values}
+        self.job.stages = stages
+
+    def _commit(self) -> None:
+        # Renewing the lease first takes the row's write lock, so the pending
+        # changes are only written if this run still owns the job.
+        if self.db.execute(renew_lease(self.job.id, self.attempt)).rowcount != 1:
+            self.db.rollback()
+            raise JobLeaseLost(f"Job {self.job.id} was claimed by another worker")
+        self.job.updated_at = datetime.utcnow()
+        self.db.commit()
+
+
+def renew_lease(job_id: str, attempt: int):
+    """UPDATE extending the lease of a running job, matching only while ``attempt`` is its latest claim."""
+    return (
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.attempts == attempt)
+        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS))
+        .execution_options(synchronize_session=False)
+    )
+
+
+class LeaseHeartbeat:
+    """Renews a running job's lease from a background thread.
+
+    A single LLM call with its retries can outlast the lease without a
+    checkpoint; without this another worker would claim the job meanwhile.
+    """
+
+    def __init__(self, job_id: str, attempt: int, interval: float = JOB_HEARTBEAT_SECONDS):
+        self.job_id = job_id
+        self.attempt = attempt
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-{job_id[:8]}", daemon=True)
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                with SessionLocal() as db:
+                    renewed = db.execute(renew_lease(self.job_id, self.attempt)).rowcount == 1
+                    db.commit()
+            except Exception:
+                logger.exception("Could not renew the lease of job %s", self.job_id)
+                continue
+            if not renewed:
+                logger.warning("Job %s lost its lease on attempt %d", self.job_id, self.attempt)
+                return
+
+
+def claim_next_job(db: Session) -> Optional[Job]:
+    """Atomically claim the oldest runnable job.
+
+    Queued jobs are runnable, and so are running jobs whose lease expired,
+    which is how work left behind by a crashed or restarted worker resumes.
+    """
+    now = datetime.utcnow()
+    runnable = or_(
+        (Job.status == "queued") & or_(Job.run_after.is_(None), Job.run_after <= now),
+        (Job.status == "running") & (Job.lease_expires_at < now),
+    )
+    candidates = db.query(Job.id).filter(runnable).order_by(Job.created_at).limit(JOB_WORKERS + 1).all()
+    for (job_id,) in candidates:
+        claimed = db.execute(
+            update(Job)
+            .where(Job.id == job_id, runnable)
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                lease_expires_at=now + timedelta(seconds=JOB_LEASE_SECONDS),
+                updated_at=now,
+            )
+        )
+        db.commit()
+        if claimed.rowcount == 1:
+            return db.get(Job, job_id)
+    return None
+
+
+def finish_attempt(db: Session, job_id: str, attempt: int, **values: Any) -> bool:
+    """Write a run's outcome, unless another worker claimed the job since; returns whether it was written."""
+    finished = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.attempts == attempt)
+        .values(updated_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if finished.rowcount != 1:
+        logger.warning("Job %s was claimed by another worker; dropping the outcome of attempt %d", job_id, attempt)
+        return False
+    return True
+
+
+def run_job(db: Session, job: Job) -> None:
+    handler = _handlers.get(job.kind)
+    job_id, kind, attempt = job.id, job.kind, job.attempts
+    started = time.perf_counter()
+    try:
+        if handler is None:
+            raise RuntimeError(f"No handler registered for job kind {kind!r}")
+        ctx = JobContext(db, job)
+        with LeaseHeartbeat(job_id, attempt), span(f"job.{kind}", **ctx.attributes):
+            result = handler(ctx, db)
+    except JobLeaseLost:
+        JOB_DURATION.labels(kind, "lost").observe(time.perf_counter() - started)
+        db.rollback()
+        logger.warning("Job %s (%s) stopped on attempt %d: another worker claimed it", job_id, kind, attempt)
+        return
+    except JobDeferred as deferred:
+        JOB_DURATION.labels(kind, "deferred").observe(time.perf_counter() - started)
+        db.rollback()
+        logger.info("Job %s (%s) deferred: %s", job_id, kind, deferred)
+        finish_attempt(
+            db, job_id, attempt,
+            status="queued",
+            attempts=attempt - 1,
+            run_after=datetime.utcnow() + timedelta(seconds=deferred.delay_seconds),
+        )
+        return
+    except Exception as exc:
+        JOB_DURATION.labels(kind, "failed").observe(time.perf_counter() - started)
+        record_error(f"job.{kind}")
+        db.rollback()
+        logger.error("Job %s (%s) failed on attempt %d:\n%s", job_id, kind, attempt, traceback.format_exc())
+        error = getattr(exc, "detail", None) or str(exc)
+        if attempt < JOB_MAX_ATTEMPTS:
+            delay = JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            finish_attempt(db, job_id, attempt, status="queued", error=error, run_after=datetime.utcnow() + timedelta(seconds=delay))
+        else:
+            finish_attempt(db, job_id, attempt, status="failed", error=error, finished_at=datetime.utcnow())
+        return
+
+    JOB_DURATION.labels(kind, "completed").observe(time.perf_counter() - started)
+    finish_attempt(db, job_id, attempt, status="completed", stage=None, result=result, error=None, finished_at=datetime.utcnow())
+
+
+class JobWorkerPool:
+    """Background threads that claim jobs from the database and run them."""
+
+    def __init__(self, size: int = JOB_WORKERS, poll_interval: float = JOB_POLL_INTERVAL):
+        self.size = size
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for index in range(self.size):
+            thread = threading.Thread(target=self._loop, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Started %d job worker(s)", self.size)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            db = SessionLocal()
+            try:
+                job = claim_next_job(db)
+                if job is not None:
+                    run_job(db, job)
+                    continue
+            except Exception:
+                logger.exception("Job worker loop error")
+            finally:
+                db.close()
+            self._stop.wait(self.poll_interval)
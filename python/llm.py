@@ -0,0 +1,216 @@
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+
+from llm_pool import CircuitBreaker, ClientPool, GeminiClient, MockModel
+from metrics import record_circuit_open, record_error, record_llm_call, record_llm_client, span
+from structured import OutputError
+
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated keys (from different projects) multiply the quota; GEMINI_API_KEY alone still works.
+GEMINI_API_KEYS = [key.strip() for key in os.getenv("GEMINI_API_KEYS", os.getenv("GEMINI_API_KEY", "")).split(",") if key.strip()]
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# Used when every client of GEMINI_MODEL is failing or has failed the call; empty disables failover.
+GEMINI_FALLBACK_MODEL = os.getenv("GEMINI_FALLBACK_MODEL", "")
+# Answer from a local mock shaped by each call's response schema instead of calling Gemini.
+GEMINI_MOCK = os.getenv("GEMINI_MOCK", "false").lower() == "true"
+GEMINI_MOCK_LATENCY_MS = float(os.getenv("GEMINI_MOCK_LATENCY_MS", "200"))
+# Quota of each API key for each model.
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "15"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "2.0"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "60.0"))
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", "120"))
+# A client is skipped for LLM_CIRCUIT_COOLDOWN_SECONDS after this many consecutive failures.
+LLM_CIRCUIT_FAILURES = int(os.getenv("LLM_CIRCUIT_FAILURES", "5"))
+LLM_CIRCUIT_COOLDOWN_SECONDS = float(os.getenv("LLM_CIRCUIT_COOLDOWN_SECONDS", "30"))
+# Ask Gemini for schema-constrained JSON; turn off for models without JSON mode.
+LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "true").lower() != "false"
+# Times a reply that fails validation is re-asked before giving up on it.
+LLM_PARSE_RETRIES = int(os.getenv("LLM_PARSE_RETRIES", "1"))
+
+Parsed = TypeVar("Parsed")
+
+pool: Optional[ClientPool] = None
+pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    global pool
+    with pool_lock:
+        if pool is None:
+            models = [GEMINI_MODEL] + ([GEMINI_FALLBACK_MODEL] if GEMINI_FALLBACK_MODEL not in ("", GEMINI_MODEL) else [])
+
+            def limits() -> dict:
+                return {
+                    "requests_per_minute": LLM_REQUESTS_PER_MINUTE,
+                    "tokens_per_minute": LLM_TOKENS_PER_MINUTE,
+                    "breaker": CircuitBreaker(LLM_CIRCUIT_FAILURES, LLM_CIRCUIT_COOLDOWN_SECONDS),
+                }
+
+            if GEMINI_MOCK:
+                clients = [GeminiClient(f"mock/{name}", name, MockModel(GEMINI_MOCK_LATENCY_MS / 1000), **limits()) for name in models]
+            elif GEMINI_API_KEYS:
+                clients = [
+                    GeminiClient.for_key(f"key{number}/{name}", key, name, **limits())
+                    for number, key in enumerate(GEMINI_API_KEYS, 1)
+                    for name in models
+                ]
+            else:
+                raise HTTPException(status_code=503, detail="GEMINI_API_KEY is not configured")
+            pool = ClientPool(clients, models)
+            logger.info("Gemini client pool: %d client(s) for models %s%s", len(clients), models, " (mock)" if GEMINI_MOCK else "")
+        return pool
+
+
+def estimate_tokens(text: str) -> int:
+    # Gemini averages roughly four characters per token for English text.
+    return max(1, len(text) // 4)
+
+
+def is_rate_limit_error(exc: Exception) -> bool:
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return code == 429 or "429" in str(exc) or "ResourceExhausted" in type(exc).__name__
+
+
+def is_request_error(exc: Exception) -> bool:
+    """A malformed request fails the same way on every client, so it isn't worth failing over."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return code == 400 or type(exc).__name__ == "InvalidArgument"
+
+
+def backoff(attempt: int) -> None:
+    time.sleep(random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt)))
+
+
+def token_counts(prompt: str, response) -> tuple[int, int]:
+    """Return (prompt, output) tokens from the response metadata, estimating what it lacks."""
+    metadata = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(metadata, "prompt_token_count", None) or estimate_tokens(prompt)
+    output_tokens = getattr(metadata, "candidates_token_count", None)
+    if output_tokens is None:
+        output_tokens = estimate_tokens(getattr(response, "text", "") or "")
+    return prompt_tokens, output_tokens
+
+
+class LLMUsage:
+    """Thread-safe tally of Gemini calls and tokens for one unit of work."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.lock = threading.Lock()
+
+    def record(self, prompt: str, response) -> None:
+        prompt_tokens, output_tokens = token_counts(prompt, response)
+        with self.lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.output_tokens += output_tokens
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "output_tokens": self.output_tokens,
+            }
+
+
+def generate_content(prompt: str, usage: Optional[LLMUsage] = None, operation: str = "generate", response_schema: Optional[dict] = None):
+    """Call Gemini through the client pool, failing over between keys and models.
+
+    Each attempt goes to the healthy client with the most quota left that
+    hasn't already failed this call; once all have, it backs off and starts
+    over. ``operation`` labels the call's metrics, e.g. "merge_transcripts" or
+    "evaluate_pair". With ``response_schema`` (and LLM_JSON_MODE on) the
+    reply is constrained to that JSON shape. Returns the response and the
+    name of the model that gave it, which differs from GEMINI_MODEL after a failover.
+    """
+    clients = get_client_pool()
+    options = {"request_options": {"timeout": LLM_CALL_TIMEOUT_SECONDS}}
+    if response_schema is not None and LLM_JSON_MODE:
+        options["generation_config"] = {"response_mime_type": "application/json", "response_schema": response_schema}
+    tried: set[str] = set()
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        client = clients.choose(tried)
+        if client is None:
+            if attempt == LLM_MAX_RETRIES:
+                record_error("llm")
+                raise HTTPException(status_code=503, detail="No Gemini client is available")
+            logger.warning("No Gemini client available (attempt %d), backing off", attempt + 1)
+            tried.clear()
+            backoff(attempt)
+            continue
+        started = time.perf_counter()
+        client.requests.acquire()
+        client.tokens.acquire(estimate_tokens(prompt))
+        try:
+            attributes = {"llm.model": client.model_name, "llm.client": client.name, "llm.attempt": attempt + 1}
+            with span(f"llm.{operation}", **attributes):
+                response = client.model.generate_content(prompt, **options)
+        except Exception as exc:
+            rate_limited = is_rate_limit_error(exc)
+            outcome = "rate_limited" if rate_limited else "error"
+            record_llm_call(operation, time.perf_counter() - started, outcome)
+            record_llm_client(client.name, outcome)
+            if rate_limited or is_request_error(exc):
+                # The service answered, so the client is healthy; a 429 just means its quota is spent for now.
+                client.breaker.record_success()
+                if rate_limited:
+                    client.requests.drain()
+            elif client.breaker.record_failure():
+                record_circuit_open(client.name)
+                logger.warning("Circuit opened for Gemini client %s", client.name)
+            if is_request_error(exc) or attempt == LLM_MAX_RETRIES:
+                record_error("llm")
+                raise
+            logger.warning("Gemini call on %s failed (attempt %d): %s", client.name, attempt + 1, exc)
+            tried.add(client.name)
+            continue
+        client.breaker.record_success()
+        record_llm_client(client.name, "ok")
+        record_llm_call(operation, time.perf_counter() - started, "ok", *token_counts(prompt, response))
+        if usage is not None:
+            usage.record(prompt, response)
+        return response, client.model_name
+
+
+def generate_validated(
+    prompt: str,
+    parse: Callable[[str], Parsed],
+    usage: Optional[LLMUsage] = None,
+    operation: str = "generate",
+    response_schema: Optional[dict] = None,
+) -> tuple[Parsed, str]:
+    """Generate and ``parse`` a reply, re-asking up to LLM_PARSE_RETRIES times while parsing raises OutputError.
+
+    Each retry tells the model what was wrong with its previous reply. The
+    last OutputError propagates once the retries are spent. Returns the parsed
+    reply and the name of the model that gave it, to key its cache entry on.
+    """
+    attempt_prompt = prompt
+    for attempt in range(LLM_PARSE_RETRIES + 1):
+        response, model_name = generate_content(attempt_prompt, usage, operation, response_schema)
+        try:
+            text = response.text
+        except ValueError:
+            # Replies blocked by safety filters have no text; treat them like unparseable ones.
+            text = ""
+        try:
+            return parse(text), model_name
+        except OutputError as exc:
+            record_error("llm_output")
+            if attempt == LLM_PARSE_RETRIES:
+                raise
+            logger.warning("Unusable %s reply (attempt %d): %s", operation, attempt + 1, exc)
+            attempt_prompt = f"{prompt}\n\nYour previous reply could not be used: {exc}. Reply again with only the JSON described above."
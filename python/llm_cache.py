@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from metrics import record_cache_lookup, record_error
+
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() != "false"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./llm_cache.db")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+# Eviction trims the cache to this share of the maximum, so the next writes don't each trigger it.
+EVICT_TO_FRACTION = 0.9
+
+
+def normalize_text(value: Any) -> str:
+    return " ".join(str(value or "").split())
+
+
+def cache_key(model_name: str, template: str, *inputs: Any) -> str:
+    """Hash the model, prompt template version and whitespace-normalized inputs."""
+    material = json.dumps([model_name, template, [normalize_text(item) for item in inputs]], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Persistent SQLite cache of parsed LLM outputs with TTL and LRU eviction."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl_seconds: int = LLM_CACHE_TTL_SECONDS, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)")
+        # Upper bound on the row count: every write adds one, even a replace or
+        # another process's entry, so the table is only counted once it may be over the limit.
+        (self.entries,) = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self.entries -= 1
+                return None
+            self.conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self.entries += 1
+            if self.entries <= self.max_entries:
+                return
+            (count,) = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            target = int(self.max_entries * EVICT_TO_FRACTION)
+            if count > self.max_entries:
+                self.conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY accessed_at LIMIT ?)",
+                    (count - target,),
+                )
+                count = target
+            self.entries = count
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache, or ``None`` when caching is disabled."""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+    return _cache
+
+
+def read_cache(key: str, use_cache: bool = True) -> Optional[Any]:
+    cache = get_response_cache()
+    if cache is None or not use_cache:
+        return None
+    try:
+        value = cache.get(key)
+    except sqlite3.Error as exc:
+        logger.warning("LLM cache read failed: %s", exc)
+        record_error("llm_cache")
+        return None
+    record_cache_lookup(value is not None)
+    return value
+
+
+def write_cache(key: str, value: Any) -> None:
+    # Bypassed requests still write, so a forced refresh replaces stale entries.
+    cache = get_response_cache()
+    if cache is None:
+        return
+    try:
+        cache.set(key, value)
+    except sqlite3.Error as exc:
+        logger.warning("LLM cache write failed: %s", exc)
+        record_error("llm_cache")
@@ -0,0 +1,208 @@
+import json
+import re
+import threading
+import time
+from typing import Optional
+
+import google.ai.generativelanguage as glm
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills continuously up to ``capacity``."""
+
+    def __init__(self, capacity: float, per_seconds: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / per_seconds
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1.0) -> None:
+        amount = min(float(amount), self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def level(self) -> float:
+        """Fraction of the capacity available right now."""
+        with self.lock:
+            self._refill()
+            return self.tokens / self.capacity
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server reports the quota is spent."""
+        with self.lock:
+            self._refill()
+            self.tokens = 0.0
+
+
+class CircuitBreaker:
+    """Opens after ``failures`` consecutive errors; after ``cooldown`` seconds lets one trial call through."""
+
+    def __init__(self, failures: int, cooldown: float):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.consecutive = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.consecutive = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failed call; return True if this opened (or re-opened) the circuit."""
+        with self.lock:
+            self.consecutive += 1
+            if self.probing or (self.opened_at is None and self.consecutive >= self.failures):
+                self.opened_at = time.monotonic()
+                self.probing = False
+                return True
+            return False
+
+
+class GeminiClient:
+    """One API key and model, with its own quota buckets and circuit breaker."""
+
+    def __init__(self, name: str, model_name: str, model, requests_per_minute: int, tokens_per_minute: int, breaker: CircuitBreaker):
+        self.name = name
+        self.model_name = model_name
+        self.model = model
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.breaker = breaker
+
+    @classmethod
+    def for_key(cls, name: str, api_key: str, model_name: str, **limits) -> "GeminiClient":
+        return cls(name, model_name, KeyedModel(model_name, api_key), **limits)
+
+
+def to_schema(schema: dict) -> glm.Schema:
+    """Convert the JSON Schema subset used for response schemas into the API's ``Schema`` message."""
+    return glm.Schema(
+        type_=glm.Type[schema["type"].upper()],
+        enum=schema.get("enum", []),
+        properties={name: to_schema(field) for name, field in schema.get("properties", {}).items()},
+        items=to_schema(schema["items"]) if "items" in schema else None,
+        required=schema.get("required", []),
+    )
+
+
+class KeyedResponse:
+    """The parts of a ``GenerateContentResponse`` the callers read: its ``text`` and ``usage_metadata``."""
+
+    def __init__(self, response: glm.GenerateContentResponse):
+        self.response = response
+        self.usage_metadata = response.usage_metadata
+
+    @property
+    def text(self) -> str:
+        parts = self.response.candidates[0].content.parts if self.response.candidates else []
+        if not parts:
+            # Like the SDK's response: a reply blocked by the safety filters has no text.
+            raise ValueError("The reply has no text parts")
+        return "".join(part.text for part in parts)
+
+
+class KeyedModel:
+    """Calls one model with one API key through its own ``GenerativeServiceClient``.
+
+    The SDK's ``GenerativeModel`` always uses the client of the process-wide
+    key set by ``genai.configure()``, so each key gets a client of its own.
+    """
+
+    def __init__(self, model_name: str, api_key: str):
+        self.model = f"models/{model_name}"
+        self.client = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+
+    def generate_content(self, prompt: str, generation_config: Optional[dict] = None, request_options: Optional[dict] = None) -> KeyedResponse:
+        config = dict(generation_config or {})
+        if "response_schema" in config:
+            config["response_schema"] = to_schema(config["response_schema"])
+        request = glm.GenerateContentRequest(
+            model=self.model,
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+            generation_config=glm.GenerationConfig(**config),
+        )
+        return KeyedResponse(self.client.generate_content(request, **(request_options or {})))
+
+
+class ClientPool:
+    """Spread calls over clients by remaining quota, preferring the primary model.
+
+    ``models`` lists model names in failover order. A call goes to the
+    healthiest client of the first model that has one whose circuit is closed
+    and that the call hasn't already failed on.
+    """
+
+    def __init__(self, clients: list[GeminiClient], models: list[str]):
+        self.clients = clients
+        self.models = models
+
+    def choose(self, tried: set[str]) -> Optional[GeminiClient]:
+        for model_name in self.models:
+            candidates = [client for client in self.clients if client.model_name == model_name and client.name not in tried]
+            # Most remaining request quota first; a half-open breaker admits only one caller.
+            for client in sorted(candidates, key=lambda client: client.requests.level(), reverse=True):
+                if client.breaker.allow():
+                    return client
+        return None
+
+
+class MockModel:
+    """Offline stand-in for ``GenerativeModel`` that answers with JSON shaped by the request's response schema.
+
+    An array whose items carry an integer ``id`` gets one item per ``[id N]``
+    marker in the prompt, as the batch evaluation prompt expects.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def generate_content(self, prompt: str, generation_config: Optional[dict] = None, **kwargs):
+        time.sleep(self.latency)
+        schema = (generation_config or {}).get("response_schema") or {"type": "object", "properties": {}}
+        text = json.dumps(self._sample(schema, prompt))
+        usage = type("UsageMetadata", (), {"prompt_token_count": max(1, len(prompt) // 4), "candidates_token_count": max(1, len(text) // 4)})()
+        return type("MockResponse", (), {"text": text, "usage_metadata": usage})()
+
+    def _sample(self, schema: dict, prompt: str, index: int = 0):
+        kind = schema.get("type")
+        if kind == "array":
+            items = schema.get("items", {})
+            if items.get("properties", {}).get("id", {}).get("type") == "integer":
+                return [{**self._sample(items, prompt), "id": int(found)} for found in re.findall(r"\[id (\d+)\]", prompt)]
+            return [self._sample(items, prompt, position) for position in range(3)]
+        if kind == "object":
+            return {name: self._sample(field, prompt, index) for name, field in schema.get("properties", {}).items()}
+        if kind == "integer":
+            return 50 + index
+        if kind == "number":
+            return 0.5
+        if kind == "boolean":
+            return True
+        if schema.get("enum"):
+            return schema["enum"][0]
+        return f"Mock text {index + 1}."
@@ -0,0 +1,123 @@
+import os
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+
+try:
+    from opentelemetry import trace
+except ImportError:  # Spans are optional; install opentelemetry-api (and an SDK/exporter) to emit them.
+    trace = None
+
+
+# Set (to an empty directory) when several worker processes serve /metrics; see DEPLOYMENT.md.
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+# Pipeline stages run from milliseconds (cached merges) to many minutes (long recordings).
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+STAGE_DURATION = Histogram(
+    "fairview_job_stage_duration_seconds",
+    "Time spent in one stage of a background job.",
+    ["kind", "stage", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+JOB_DURATION = Histogram(
+    "fairview_job_duration_seconds",
+    "Time spent running a background job attempt.",
+    ["kind", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+LLM_CALLS = Counter("fairview_llm_calls_total", "Gemini requests by operation and outcome.", ["operation", "outcome"])
+LLM_DURATION = Histogram(
+    "fairview_llm_call_duration_seconds",
+    "Latency of one Gemini request, including rate-limit waits.",
+    ["operation"],
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter("fairview_llm_tokens_total", "Gemini tokens by operation and direction.", ["operation", "direction"])
+LLM_CLIENT_CALLS = Counter("fairview_llm_client_calls_total", "Gemini requests by pool client (key/model) and outcome.", ["client", "outcome"])
+LLM_CIRCUIT_OPENS = Counter("fairview_llm_circuit_opens_total", "Times a Gemini client's circuit breaker opened.", ["client"])
+LLM_CACHE_LOOKUPS = Counter("fairview_llm_cache_lookups_total", "LLM response cache lookups.", ["result"])
+AUDIO_PROCESSED = Counter("fairview_audio_processed_seconds_total", "Seconds of audio transcribed.", ["backend"])
+AUDIO_RECOGNIZED = Counter(
+    "fairview_audio_recognized_seconds_total", "Seconds of detected speech sent to the speech recognizer.", ["backend"]
+)
+ARCHIVE_BYTES = Counter("fairview_audio_archive_bytes_total", "Bytes read and written re-encoding recordings to Opus.", ["direction"])
+ARCHIVE_ENCODE_SECONDS = Counter("fairview_audio_archive_encode_seconds_total", "Time spent re-encoding recordings to Opus.")
+AUDIO_RECLAIMED = Counter("fairview_audio_reclaimed_bytes_total", "Bytes of audio and result files deleted by the archiver.", ["directory"])
+ERRORS = Counter("fairview_errors_total", "Handled errors by component.", ["component"])
+
+
+def _tracer():
+    return trace.get_tracer("fair_view") if trace else None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Open an OpenTelemetry span when the API is installed; otherwise do nothing."""
+    tracer = _tracer()
+    if tracer is None:
+        yield None
+        return
+    with tracer.start_as_current_span(name, attributes={key: value for key, value in attributes.items() if value is not None}) as current:
+        yield current
+
+
+def set_span_attributes(**attributes) -> None:
+    if trace is None:
+        return
+    current = trace.get_current_span()
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(key, value)
+
+
+def record_llm_call(operation: str, seconds: float, outcome: str, prompt_tokens: int = 0, output_tokens: int = 0) -> None:
+    LLM_CALLS.labels(operation, outcome).inc()
+    LLM_DURATION.labels(operation).observe(seconds)
+    if prompt_tokens:
+        LLM_TOKENS.labels(operation, "prompt").inc(prompt_tokens)
+    if output_tokens:
+        LLM_TOKENS.labels(operation, "output").inc(output_tokens)
+
+
+def record_llm_client(client: str, outcome: str) -> None:
+    LLM_CLIENT_CALLS.labels(client, outcome).inc()
+
+
+def record_circuit_open(client: str) -> None:
+    LLM_CIRCUIT_OPENS.labels(client).inc()
+
+
+def record_cache_lookup(hit: bool) -> None:
+    LLM_CACHE_LOOKUPS.labels("hit" if hit else "miss").inc()
+
+
+def record_audio(seconds: float, backend: str, recognized_seconds: float) -> None:
+    AUDIO_PROCESSED.labels(backend).inc(seconds)
+    AUDIO_RECOGNIZED.labels(backend).inc(recognized_seconds)
+
+
+def record_archive(input_bytes: int, output_bytes: int, seconds: float) -> None:
+    ARCHIVE_BYTES.labels("input").inc(input_bytes)
+    ARCHIVE_BYTES.labels("output").inc(output_bytes)
+    ARCHIVE_ENCODE_SECONDS.inc(seconds)
+
+
+def record_reclaimed(directory: str, size: int) -> None:
+    AUDIO_RECLAIMED.labels(directory).inc(size)
+
+
+def record_error(component: str) -> None:
+    ERRORS.labels(component).inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the Prometheus text exposition and its content type."""
+    registry = REGISTRY
+    if PROMETHEUS_MULTIPROC_DIR:
+        # Each worker process writes its samples to files in the directory; aggregate them all.
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,26 @@
+import os
+import sys
+
+from alembic import context
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+load_dotenv()
+
+from database import Base, engine  # noqa: E402
+import models  # noqa: E402,F401  (registers the tables on Base.metadata)
+
+
+def run_migrations() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=Base.metadata,
+            # SQLite can't ALTER most constraints; batch mode rebuilds the table instead.
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+run_migrations()
@@ -0,0 +1,138 @@
+"""Initial schema
+
+Databases created before migrations existed already have some or all of
+these tables (the API used to call ``create_all`` at startup), so only the
+missing ones are created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("email", sa.String(255), nullable=False),
+            sa.Column("password_hash", sa.String(255), nullable=False),
+            sa.Column("role", sa.String(32), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "rooms" not in existing:
+        op.create_table(
+            "rooms",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("code", sa.String(32), nullable=False),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("job_role", sa.String(255), nullable=False),
+            sa.Column("position", sa.String(64), nullable=False),
+            sa.Column("interviewer_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("candidate_id", sa.String(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_rooms_code", "rooms", ["code"], unique=True)
+
+    if "interviews" not in existing:
+        op.create_table(
+            "interviews",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("room_id", sa.String(), sa.ForeignKey("rooms.id"), nullable=False),
+            sa.Column("interviewer_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("candidate_id", sa.String(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("created_by_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("audio_file", sa.String(512), nullable=True),
+            sa.Column("json_file", sa.String(512), nullable=True),
+            sa.Column("full_transcript", sa.Text(), nullable=True),
+            sa.Column("qa_pairs", sa.JSON(), nullable=True),
+            sa.Column("evaluation_report", sa.JSON(), nullable=True),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("completed_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_interviews_room_id", "interviews", ["room_id"])
+        op.create_index("ix_interviews_interviewer_id", "interviews", ["interviewer_id"])
+        op.create_index("ix_interviews_candidate_id", "interviews", ["candidate_id"])
+
+    if "jobs" not in existing:
+        op.create_table(
+            "jobs",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("kind", sa.String(64), nullable=False),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("stage", sa.String(64), nullable=True),
+            sa.Column("stages", sa.JSON(), nullable=True),
+            sa.Column("payload", sa.JSON(), nullable=True),
+            sa.Column("state", sa.JSON(), nullable=True),
+            sa.Column("result", sa.JSON(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("room_id", sa.String(), sa.ForeignKey("rooms.id"), nullable=True),
+            sa.Column("created_by_id", sa.String(), sa.ForeignKey("users.id"), nullable=True),
+            sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+            sa.Column("run_after", sa.DateTime(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.Column("finished_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_jobs_status", "jobs", ["status"])
+        op.create_index("ix_jobs_room_id", "jobs", ["room_id"])
+
+    if "transcript_segments" not in existing:
+        op.create_table(
+            "transcript_segments",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("room_id", sa.String(), sa.ForeignKey("rooms.id"), nullable=False),
+            sa.Column("user_id", sa.String(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("seq", sa.Integer(), nullable=False),
+            sa.Column("start_ms", sa.Integer(), nullable=False),
+            sa.Column("end_ms", sa.Integer(), nullable=True),
+            sa.Column("audio_file", sa.String(512), nullable=True),
+            sa.Column("job_id", sa.String(), sa.ForeignKey("jobs.id"), nullable=True),
+            sa.Column("text", sa.Text(), nullable=True),
+            sa.Column("segments", sa.JSON(), nullable=True),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("transcribed_at", sa.DateTime(), nullable=True),
+            sa.UniqueConstraint("room_id", "user_id", "seq", name="uq_transcript_segments_room_user_seq"),
+        )
+        op.create_index("ix_transcript_segments_room_id", "transcript_segments", ["room_id"])
+
+    if "room_submissions" not in existing:
+        op.create_table(
+            "room_submissions",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("room_id", sa.String(), sa.ForeignKey("rooms.id"), nullable=False, unique=True),
+            sa.Column("interview_id", sa.String(), sa.ForeignKey("interviews.id"), nullable=False),
+            sa.Column("interviewer_job_id", sa.String(), sa.ForeignKey("jobs.id"), nullable=True),
+            sa.Column("interviewer_transcript", sa.Text(), nullable=True),
+            sa.Column("interviewer_submitted_at", sa.DateTime(), nullable=True),
+            sa.Column("candidate_job_id", sa.String(), sa.ForeignKey("jobs.id"), nullable=True),
+            sa.Column("candidate_transcript", sa.Text(), nullable=True),
+            sa.Column("candidate_submitted_at", sa.DateTime(), nullable=True),
+            sa.Column("evaluate", sa.Boolean(), nullable=False),
+            sa.Column("merge_job_id", sa.String(), sa.ForeignKey("jobs.id"), nullable=True),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in ("room_submissions", "transcript_segments", "jobs", "interviews", "rooms", "users"):
+        op.drop_table(table)
@@ -0,0 +1,78 @@
+"""Composite indexes and a typed total_score column for dashboard queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+INDEXES = [
+    ("ix_rooms_interviewer_created", "rooms", ["interviewer_id", "created_at", "id"]),
+    ("ix_rooms_candidate_created", "rooms", ["candidate_id", "created_at", "id"]),
+    ("ix_interviews_interviewer_created", "interviews", ["interviewer_id", "created_at", "id"]),
+    ("ix_interviews_candidate_created", "interviews", ["candidate_id", "created_at", "id"]),
+    ("ix_interviews_room_status", "interviews", ["room_id", "status"]),
+    ("ix_interviews_status_score", "interviews", ["status", "total_score"]),
+]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("interviews") as batch:
+        batch.add_column(sa.Column("total_score", sa.Float(), nullable=True))
+
+    # Copy the average score out of the report JSON, in batches to bound memory.
+    bind = op.get_bind()
+    interviews = sa.table(
+        "interviews",
+        sa.column("id", sa.String()),
+        sa.column("evaluation_report", sa.Text()),
+        sa.column("total_score", sa.Float()),
+    )
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(interviews.c.id, interviews.c.evaluation_report)
+            .where(interviews.c.id > last_id, interviews.c.evaluation_report.is_not(None))
+            .order_by(interviews.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            report = row.evaluation_report
+            if isinstance(report, str):
+                try:
+                    report = json.loads(report)
+                except ValueError:
+                    report = None
+            score = report.get("total_score") if isinstance(report, dict) else None
+            if isinstance(score, (int, float)):
+                updates.append({"row_id": row.id, "score": float(score)})
+        if updates:
+            bind.execute(
+                interviews.update().where(interviews.c.id == sa.bindparam("row_id")).values(total_score=sa.bindparam("score")),
+                updates,
+            )
+        last_id = rows[-1].id
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    with op.batch_alter_table("interviews") as batch:
+        batch.drop_column("total_score")
@@ -0,0 +1,165 @@
+"""Move interview transcripts, Q&A pairs and reports into compressed content-addressed artifacts
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+import hashlib
+import json
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+import zstandard
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+ZSTD_LEVEL = 3
+
+# Blob column on interviews -> digest column that replaces it.
+BLOBS = [("full_transcript", "transcript_ref"), ("qa_pairs", "qa_pairs_ref"), ("evaluation_report", "report_ref")]
+
+artifacts = sa.table(
+    "artifacts",
+    sa.column("digest", sa.String()),
+    sa.column("codec", sa.String()),
+    sa.column("size", sa.Integer()),
+    sa.column("data", sa.LargeBinary()),
+    sa.column("created_at", sa.DateTime()),
+)
+
+
+def _json_value(column: str, value):
+    # JSON columns come back as text on SQLite and already parsed on Postgres.
+    if column != "full_transcript" and isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _encode(value) -> dict:
+    # Same canonical form and codecs as artifacts.encode_artifact, frozen here for this migration.
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode()
+    compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    codec, data = ("zstd", compressed) if len(compressed) < len(raw) else ("json", raw)
+    return {"digest": hashlib.sha256(raw).hexdigest(), "codec": codec, "size": len(raw), "data": data}
+
+
+def _decode(codec: str, data: bytes):
+    if codec == "zstd":
+        data = zstandard.ZstdDecompressor().decompress(data)
+    return json.loads(data)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "artifacts",
+        sa.Column("digest", sa.String(64), primary_key=True),
+        sa.Column("codec", sa.String(16), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    with op.batch_alter_table("interviews") as batch:
+        for _, ref in BLOBS:
+            batch.add_column(sa.Column(ref, sa.String(64), nullable=True))
+
+    bind = op.get_bind()
+    interviews = sa.table(
+        "interviews",
+        sa.column("id", sa.String()),
+        *(sa.column(blob, sa.Text()) for blob, _ in BLOBS),
+        *(sa.column(ref, sa.String()) for _, ref in BLOBS),
+    )
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(interviews.c.id, *(interviews.c[blob] for blob, _ in BLOBS))
+            .where(interviews.c.id > last_id)
+            .order_by(interviews.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        pending: dict[str, dict] = {}
+        updates = []
+        for row in rows:
+            refs = {"row_id": row.id}
+            for blob, ref in BLOBS:
+                value = _json_value(blob, getattr(row, blob))
+                refs[f"new_{ref}"] = None
+                if value is not None:
+                    artifact = _encode(value)
+                    pending.setdefault(artifact["digest"], artifact)
+                    refs[f"new_{ref}"] = artifact["digest"]
+            updates.append(refs)
+        stored = set(bind.execute(sa.select(artifacts.c.digest).where(artifacts.c.digest.in_(pending))).scalars())
+        fresh = [artifact for digest, artifact in pending.items() if digest not in stored]
+        if fresh:
+            now = datetime.utcnow()
+            bind.execute(artifacts.insert(), [{**artifact, "created_at": now} for artifact in fresh])
+        bind.execute(
+            interviews.update()
+            .where(interviews.c.id == sa.bindparam("row_id"))
+            .values({ref: sa.bindparam(f"new_{ref}") for _, ref in BLOBS}),
+            updates,
+        )
+        last_id = rows[-1].id
+
+    # The pretty-printed <id>.json copies in AUDIO_DIR are no longer written or read; delete them at will.
+    with op.batch_alter_table("interviews") as batch:
+        for blob, _ in BLOBS:
+            batch.drop_column(blob)
+        batch.drop_column("json_file")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("interviews") as batch:
+        batch.add_column(sa.Column("json_file", sa.String(512), nullable=True))
+        batch.add_column(sa.Column("full_transcript", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("qa_pairs", sa.JSON(), nullable=True))
+        batch.add_column(sa.Column("evaluation_report", sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    interviews = sa.table(
+        "interviews",
+        sa.column("id", sa.String()),
+        sa.column("full_transcript", sa.Text()),
+        sa.column("qa_pairs", sa.JSON()),
+        sa.column("evaluation_report", sa.JSON()),
+        *(sa.column(ref, sa.String()) for _, ref in BLOBS),
+    )
+    last_id = ""
+    while True:
+        rows = bind.execute(
+            sa.select(interviews.c.id, *(interviews.c[ref] for _, ref in BLOBS))
+            .where(interviews.c.id > last_id)
+            .order_by(interviews.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        digests = {getattr(row, ref) for row in rows for _, ref in BLOBS} - {None}
+        values = {
+            row.digest: _decode(row.codec, row.data)
+            for row in bind.execute(sa.select(artifacts.c.digest, artifacts.c.codec, artifacts.c.data).where(artifacts.c.digest.in_(digests)))
+        }
+        bind.execute(
+            interviews.update()
+            .where(interviews.c.id == sa.bindparam("row_id"))
+            .values({blob: sa.bindparam(f"old_{blob}") for blob, _ in BLOBS}),
+            [{"row_id": row.id, **{f"old_{blob}": values.get(getattr(row, ref)) for blob, ref in BLOBS}} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("interviews") as batch:
+        for _, ref in BLOBS:
+            batch.drop_column(ref)
+    op.drop_table("artifacts")
@@ -0,0 +1,33 @@
+"""Talk time and speech ratio of each participant on interviews
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ("interviewer_talk_ms", sa.Integer()),
+    ("interviewer_speech_ratio", sa.Float()),
+    ("candidate_talk_ms", sa.Integer()),
+    ("candidate_speech_ratio", sa.Float()),
+]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("interviews") as batch:
+        for name, type_ in COLUMNS:
+            batch.add_column(sa.Column(name, type_, nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("interviews") as batch:
+        for name, _ in COLUMNS:
+            batch.drop_column(name)
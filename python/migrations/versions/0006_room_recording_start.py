@@ -0,0 +1,28 @@
+"""When each participant's live recording started, to share one call clock
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ["interviewer_recording_started_at", "candidate_recording_started_at"]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("rooms") as batch:
+        for name in COLUMNS:
+            batch.add_column(sa.Column(name, sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("rooms") as batch:
+        for name in COLUMNS:
+            batch.drop_column(name)
@@ -0,0 +1,24 @@
+"""Energy envelope of each live segment, for cross-talk removal on the call's clock
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("transcript_segments") as batch:
+        batch.add_column(sa.Column("envelope_ref", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("transcript_segments") as batch:
+        batch.drop_column("envelope_ref")
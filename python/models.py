@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, JSON, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, JSON, LargeBinary, String, Text, UniqueConstraint
 
 from database import Base
 
@@ -17,11 +17,17 @@ class User(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     role = Column(String(32), nullable=False)
+    # Bumped on password or role changes; tokens carrying an older version are rejected.
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        Index("ix_rooms_interviewer_created", "interviewer_id", "created_at", "id"),
+        Index("ix_rooms_candidate_created", "candidate_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, default=new_uuid)
     code = Column(String(32), unique=True, nullable=False, index=True)
@@ -33,10 +39,20 @@ class Room(Base):
     status = Column(String(32), nullable=False, default="waiting")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # When each participant's live recording started, by the server's clock.
+    # Their segment times are shifted by it onto the call's clock (ms since created_at).
+    interviewer_recording_started_at = Column(DateTime, nullable=True)
+    candidate_recording_started_at = Column(DateTime, nullable=True)
 
 
 class Interview(Base):
     __tablename__ = "interviews"
+    __table_args__ = (
+        Index("ix_interviews_interviewer_created", "interviewer_id", "created_at", "id"),
+        Index("ix_interviews_candidate_created", "candidate_id", "created_at", "id"),
+        Index("ix_interviews_room_status", "room_id", "status"),
+        Index("ix_interviews_status_score", "status", "total_score"),
+    )
 
     id = Column(String, primary_key=True, default=new_uuid)
     room_id = Column(String, ForeignKey("rooms.id"), nullable=False, index=True)
@@ -44,10 +60,95 @@ class Interview(Base):
     candidate_id = Column(String, ForeignKey("users.id"), nullable=True, index=True)
     created_by_id = Column(String, ForeignKey("users.id"), nullable=False)
     audio_file = Column(String(512), nullable=True)
-    json_file = Column(String(512), nullable=True)
-    full_transcript = Column(Text, nullable=True)
-    qa_pairs = Column(JSON, nullable=True)
-    evaluation_report = Column(JSON, nullable=True)
+    # Digests of the transcript, Q&A pairs and evaluation report in ``artifacts``,
+    # so listing and updating interviews never reads or rewrites the blobs.
+    transcript_ref = Column(String(64), nullable=True)
+    qa_pairs_ref = Column(String(64), nullable=True)
+    report_ref = Column(String(64), nullable=True)
+    # Per participant: milliseconds of detected speech, and that as a share of their recording.
+    interviewer_talk_ms = Column(Integer, nullable=True)
+    interviewer_speech_ratio = Column(Float, nullable=True)
+    candidate_talk_ms = Column(Integer, nullable=True)
+    candidate_speech_ratio = Column(Float, nullable=True)
+    # Copy of the report's total_score that can be sorted and filtered on.
+    total_score = Column(Float, nullable=True)
     status = Column(String(32), nullable=False, default="completed")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    completed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    completed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Artifact(Base):
+    """Immutable JSON blob, zstd-compressed and keyed by the SHA-256 of its canonical form."""
+
+    __tablename__ = "artifacts"
+
+    digest = Column(String(64), primary_key=True)
+    codec = Column(String(16), nullable=False)
+    # Uncompressed size in bytes.
+    size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, default=new_uuid)
+    kind = Column(String(64), nullable=False)
+    status = Column(String(32), nullable=False, default="queued", index=True)
+    stage = Column(String(64), nullable=True)
+    stages = Column(JSON, nullable=True)
+    payload = Column(JSON, nullable=True)
+    state = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    room_id = Column(String, ForeignKey("rooms.id"), nullable=True, index=True)
+    created_by_id = Column(String, ForeignKey("users.id"), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    run_after = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class TranscriptSegment(Base):
+    __tablename__ = "transcript_segments"
+    __table_args__ = (UniqueConstraint("room_id", "user_id", "seq", name="uq_transcript_segments_room_user_seq"),)
+
+    id = Column(String, primary_key=True, default=new_uuid)
+    room_id = Column(String, ForeignKey("rooms.id"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    start_ms = Column(Integer, nullable=False, default=0)
+    end_ms = Column(Integer, nullable=True)
+    audio_file = Column(String(512), nullable=True)
+    job_id = Column(String, ForeignKey("jobs.id"), nullable=True)
+    text = Column(Text, nullable=True)
+    segments = Column(JSON, nullable=True)
+    # Energy envelope of the segment's audio, so the merge can drop cross-talk from live recordings.
+    envelope_ref = Column(String(64), nullable=True)
+    status = Column(String(32), nullable=False, default="pending")
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    transcribed_at = Column(DateTime, nullable=True)
+
+
+class RoomSubmission(Base):
+    """Rendezvous of the two participants' recordings for one room."""
+
+    __tablename__ = "room_submissions"
+
+    id = Column(String, primary_key=True, default=new_uuid)
+    room_id = Column(String, ForeignKey("rooms.id"), nullable=False, unique=True)
+    interview_id = Column(String, ForeignKey("interviews.id"), nullable=False)
+    interviewer_job_id = Column(String, ForeignKey("jobs.id"), nullable=True)
+    interviewer_transcript = Column(Text, nullable=True)
+    interviewer_submitted_at = Column(DateTime, nullable=True)
+    candidate_job_id = Column(String, ForeignKey("jobs.id"), nullable=True)
+    candidate_transcript = Column(Text, nullable=True)
+    candidate_submitted_at = Column(DateTime, nullable=True)
+    evaluate = Column(Boolean, nullable=False, default=True)
+    merge_job_id = Column(String, ForeignKey("jobs.id"), nullable=True)
+    status = Column(String(32), nullable=False, default="open")
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
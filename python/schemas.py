@@ -24,6 +24,11 @@ class AuthSigninIn(BaseModel):
     password: str
 
 
+class PasswordChangeIn(BaseModel):
+    current_password: str
+    new_password: str = Field(min_length=6)
+
+
 class AuthResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -63,10 +68,75 @@ class InterviewOut(BaseModel):
     candidate_id: Optional[str] = None
     created_by_id: str
     audio_file: Optional[str] = None
-    json_file: Optional[str] = None
+    interviewer_talk_ms: Optional[int] = None
+    interviewer_speech_ratio: Optional[float] = None
+    candidate_talk_ms: Optional[int] = None
+    candidate_speech_ratio: Optional[float] = None
     full_transcript: Optional[str] = None
     qa_pairs: list[dict[str, Any]] = Field(default_factory=list)
     evaluation_report: dict[str, Any] = Field(default_factory=dict)
     status: str
     created_at: datetime
-    completed_at: Optional[datetime] = None
\ No newline at end of file
+    completed_at: Optional[datetime] = None
+
+
+class InterviewSummaryOut(BaseModel):
+    id: str
+    room_id: str
+    room_code: Optional[str] = None
+    status: str
+    total_score: float = 0
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+class InterviewPage(BaseModel):
+    items: list[InterviewSummaryOut]
+    next_cursor: Optional[str] = None
+
+
+class RoomPage(BaseModel):
+    items: list[RoomOut]
+    next_cursor: Optional[str] = None
+
+
+class JobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    kind: str
+    status: str
+    stage: Optional[str] = None
+    stages: dict[str, Any] = Field(default_factory=dict)
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int
+    room_id: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class RoomRecordingIn(BaseModel):
+    # Time since the recording started when the request was sent, so a retried request still marks the right moment.
+    elapsed_ms: int = Field(default=0, ge=0)
+
+
+class RoomFinalizeIn(BaseModel):
+    evaluate: bool = True
+    use_cache: bool = True
+
+
+class TranscriptSegmentOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    room_id: str
+    user_id: str
+    seq: int
+    start_ms: int
+    end_ms: Optional[int] = None
+    status: str
+    text: Optional[str] = None
+    created_at: datetime
+    transcribed_at: Optional[datetime] = None
@@ -8,6 +8,8 @@ from passlib.context import CryptContext
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-secret-change-me")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "720"))
+# pbkdf2_sha256 iterations for new hashes; existing hashes are upgraded on the next sign-in.
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
 
 if SECRET_KEY == "dev-secret-change-me":
     import warnings
@@ -17,7 +19,13 @@ if SECRET_KEY == "dev-secret-change-me":
         stacklevel=1,
     )
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=PASSWORD_HASH_ROUNDS,
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -28,6 +36,11 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return pwd_context.verify(password, hashed_password)
 
 
+def verify_and_update(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password, returning a replacement hash when the stored one uses other rounds or schemes."""
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
 def create_access_token(subject: str, claims: dict | None = None) -> str:
     payload = {"sub": subject, "exp": datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)}
     if claims:
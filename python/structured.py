@@ -0,0 +1,218 @@
+import json
+import re
+from typing import Iterator, Literal, Optional, TypeVar, get_args
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+
+Relevance = Literal["Highly Relevant", "Somewhat Relevant", "Not Relevant"]
+Difficulty = Literal["Too Easy", "Appropriate", "Too Hard"]
+
+Model = TypeVar("Model", bound=BaseModel)
+
+CLOSERS = {"{": "}", "[": "]"}
+# Only these characters change the scanner's state; everything between them is skipped.
+STRUCTURAL = re.compile(r'[\[\]{}",]')
+STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+class OutputError(ValueError):
+    """The model's reply held no usable JSON of the expected shape."""
+
+
+class QAPair(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    question: str = Field(min_length=1)
+    answer: str = ""
+
+    @field_validator("question", "answer", mode="before")
+    @classmethod
+    def _as_text(cls, value):
+        return "" if value is None else str(value)
+
+
+def _canonical(value, choices: tuple[str, ...]):
+    # Models drift in casing and spacing ("highly relevant"); map those onto the allowed labels.
+    if isinstance(value, str):
+        wanted = " ".join(value.split()).lower()
+        for choice in choices:
+            if choice.lower() == wanted:
+                return choice
+    return value
+
+
+class Verdict(BaseModel):
+    question_relevance: Relevance
+    difficulty_assessment: Difficulty
+    score: int = Field(ge=0, le=100)
+    feedback: str = ""
+
+    @field_validator("question_relevance", mode="before")
+    @classmethod
+    def _relevance(cls, value):
+        return _canonical(value, get_args(Relevance))
+
+    @field_validator("difficulty_assessment", mode="before")
+    @classmethod
+    def _difficulty(cls, value):
+        return _canonical(value, get_args(Difficulty))
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def _round_score(cls, value):
+        return round(value) if isinstance(value, float) else value
+
+
+class BatchVerdict(Verdict):
+    id: int
+
+
+# Response schemas in the OpenAPI subset Gemini accepts for schema-constrained output.
+QA_PAIRS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"question": {"type": "string"}, "answer": {"type": "string"}},
+        "required": ["question", "answer"],
+    },
+}
+VERDICT_PROPERTIES = {
+    "question_relevance": {"type": "string", "enum": list(get_args(Relevance))},
+    "difficulty_assessment": {"type": "string", "enum": list(get_args(Difficulty))},
+    "score": {"type": "integer"},
+    "feedback": {"type": "string"},
+}
+VERDICT_SCHEMA = {"type": "object", "properties": VERDICT_PROPERTIES, "required": list(VERDICT_PROPERTIES)}
+BATCH_VERDICTS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"id": {"type": "integer"}, **VERDICT_PROPERTIES},
+        "required": ["id", *VERDICT_PROPERTIES],
+    },
+}
+
+
+def _spans(text: str) -> Iterator[tuple[int, Optional[int], list[tuple[int, int]]]]:
+    """Yield ``(start, end, items)`` for each top-level ``{...}`` or ``[...]`` in one pass over ``text``.
+
+    Prose, markdown fences and trailing commentary around the JSON are
+    skipped. ``items`` are the spans of an array's direct elements, so a
+    malformed element doesn't cost the others. A value cut off by the end of
+    the text is yielded last with ``end=None``.
+    """
+    stack: list[str] = []
+    start = item_start = 0
+    items: list[tuple[int, int]] = []
+    position = 0
+    while match := STRUCTURAL.search(text, position):
+        char = match.group()
+        position = match.end()
+        if not stack:
+            if char in CLOSERS:
+                stack.append(CLOSERS[char])
+                start, item_start, items = match.start(), position, []
+            continue
+        if char == '"':
+            string = STRING.match(text, match.start())
+            if string is None:
+                break
+            position = string.end()
+        elif char in CLOSERS:
+            stack.append(CLOSERS[char])
+        elif char == ",":
+            if len(stack) == 1 and text[start] == "[":
+                items.append((item_start, match.start()))
+                item_start = position
+        elif char != stack[-1]:
+            # Mismatched bracket: this wasn't JSON after all (e.g. "[see above}").
+            stack.clear()
+        else:
+            stack.pop()
+            if not stack:
+                if text[start] == "[":
+                    items.append((item_start, match.start()))
+                yield start, position, items
+    if stack:
+        # The last element may still be whole if only the closing bracket was lost.
+        yield start, None, (items + [(item_start, len(text))] if text[start] == "[" else items)
+
+
+def extract_json(text: str, expect: Optional[type] = None):
+    """Return the first complete JSON object or array in ``text`` (an instance of ``expect``, if given), or None."""
+    for start, end, _ in _spans(text or ""):
+        if end is None:
+            break
+        try:
+            value = json.loads(text[start:end])
+        except ValueError:
+            continue
+        if expect is None or isinstance(value, expect):
+            return value
+    return None
+
+
+def json_items(text: str) -> Optional[list]:
+    """Return the elements of the first JSON array in ``text``, or None if it has none.
+
+    Elements that are malformed, or lost because the reply was truncated, are dropped.
+    """
+    for start, end, items in _spans(text or ""):
+        if text[start] != "[":
+            continue
+        if end is not None:
+            try:
+                return json.loads(text[start:end])
+            except ValueError:
+                pass
+        values = []
+        for item_start, item_end in items:
+            chunk = text[item_start:item_end].strip()
+            if not chunk:
+                continue
+            try:
+                values.append(json.loads(chunk))
+            except ValueError:
+                continue
+        return values
+    return None
+
+
+def parse_object(text: str, model: type[Model]) -> Model:
+    """Validate the first JSON object in ``text`` as ``model``; raise OutputError if there is none."""
+    data = extract_json(text, dict)
+    if data is None:
+        raise OutputError("reply contained no JSON object")
+    try:
+        return model.model_validate(data)
+    except ValidationError as exc:
+        raise OutputError(f"reply did not match the schema: {exc.errors()[0]['msg']}") from exc
+
+
+def parse_items(text: str, model: type[Model]) -> tuple[list[Model], int]:
+    """Validate each element of the first JSON array in ``text`` as ``model``.
+
+    Returns the valid items and how many were rejected. Raises OutputError
+    when the reply has no array, either bare or as the one list in an object,
+    or when none of its items is valid, so that the reply is re-asked.
+    """
+    values = json_items(text)
+    if values is None:
+        wrapper = extract_json(text, dict)
+        # {"pairs": [...]}: some models wrap the array despite the instructions.
+        lists = [value for value in (wrapper or {}).values() if isinstance(value, list)]
+        if len(lists) != 1:
+            raise OutputError("reply contained no JSON array")
+        values = lists[0]
+    valid = []
+    first_error: Optional[ValidationError] = None
+    for value in values:
+        try:
+            valid.append(model.model_validate(value))
+        except ValidationError as exc:
+            first_error = first_error or exc
+    if values and not valid:
+        error = first_error.errors()[0]
+        raise OutputError(f"none of its {len(values)} items was valid ({'.'.join(map(str, error['loc']))}: {error['msg']})")
+    return valid, len(values) - len(valid)
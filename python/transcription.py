@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional
+
+import numpy as np
+import speech_recognition as sr
+from pydub import AudioSegment
+
+from audio_storage import decode_pcm
+from metrics import record_audio, record_error
+from vad import detect_speech, region_levels, speech_features
+
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIBE_CONCURRENCY = int(os.getenv("TRANSCRIBE_CONCURRENCY", "4"))
+TRANSCRIBE_MAX_CHUNK_MS = int(os.getenv("TRANSCRIBE_MAX_CHUNK_MS", "30000"))
+TRANSCRIBE_MIN_SILENCE_MS = int(os.getenv("TRANSCRIBE_MIN_SILENCE_MS", "700"))
+TRANSCRIBE_PADDING_MS = int(os.getenv("TRANSCRIBE_PADDING_MS", "200"))
+# A pause this long usually means the other participant is talking, so it
+# always starts a new chunk: each segment then stays within one turn and keeps its own timestamps.
+TRANSCRIBE_TURN_GAP_MS = int(os.getenv("TRANSCRIBE_TURN_GAP_MS", "2000"))
+# The other participant's voice bleeding into a microphone is quieter than its
+# own speaker, so a jump in level this large also starts a new chunk.
+TRANSCRIBE_LEVEL_CHANGE_DB = float(os.getenv("TRANSCRIBE_LEVEL_CHANGE_DB", "6"))
+TRANSCRIBE_SAMPLE_RATE = 16000
+
+# Speech-to-text backend: google (remote), vosk or faster_whisper (local CPU), or stub.
+STT_BACKEND = os.getenv("STT_BACKEND", "google").strip().lower()
+STT_MODEL = os.getenv("STT_MODEL", "")
+STT_LANGUAGE = os.getenv("STT_LANGUAGE", "en-US")
+
+
+def plan_chunks(audio: AudioSegment, max_chunk_ms: int = TRANSCRIBE_MAX_CHUNK_MS) -> list[list[tuple[int, int, int]]]:
+    """Group a recording's speech into chunks of at most ``max_chunk_ms`` of audio.
+
+    Each chunk is a list of padded ``(start_ms, end_ms, speech_ms)`` regions
+    found by voice-activity detection. Only those spans are sent to the
+    recognizer, joined end to end, so the silence between them is never
+    transcribed. A region longer than ``max_chunk_ms`` is cut at fixed offsets,
+    and a likely change of speaker (a long pause or a jump in level) always
+    starts a new chunk.
+    """
+    if len(audio) == 0:
+        return []
+
+    samples = np.frombuffer(_to_pcm(audio).raw_data, dtype=np.int16)
+    chunks: list[list[tuple[int, int, int]]] = []
+    size = previous_end = 0
+    previous_speech_end = previous_level = None
+    # One pass over the recording serves both the detector and the speaker-change check.
+    energy, zcr = speech_features(samples, TRANSCRIBE_SAMPLE_RATE)
+    regions = detect_speech(samples, TRANSCRIBE_SAMPLE_RATE, TRANSCRIBE_MIN_SILENCE_MS, (energy, zcr))
+    for (speech_start, speech_end), level in zip(regions, region_levels(energy, regions)):
+        new_turn = previous_speech_end is not None and (
+            speech_start - previous_speech_end >= TRANSCRIBE_TURN_GAP_MS or abs(level - previous_level) >= TRANSCRIBE_LEVEL_CHANGE_DB
+        )
+        previous_speech_end, previous_level = speech_end, level
+        start = max(previous_end, speech_start - TRANSCRIBE_PADDING_MS)
+        end = previous_end = min(len(audio), speech_end + TRANSCRIBE_PADDING_MS)
+        for offset in range(start, end, max_chunk_ms):
+            piece_end = min(end, offset + max_chunk_ms)
+            piece = (offset, piece_end, max(0, min(piece_end, speech_end) - max(offset, speech_start)))
+            if chunks and not (new_turn and offset == start) and size + piece_end - offset <= max_chunk_ms:
+                chunks[-1].append(piece)
+                size += piece_end - offset
+            else:
+                chunks.append([piece])
+                size = piece_end - offset
+    return chunks
+
+
+def _chunk_audio(audio: AudioSegment, chunk: list[tuple[int, int, int]]) -> AudioSegment:
+    pieces = [audio[start:end] for start, end, _ in chunk]
+    return sum(pieces[1:], pieces[0])
+
+
+def _to_pcm(chunk: AudioSegment) -> AudioSegment:
+    return chunk.set_channels(1).set_frame_rate(TRANSCRIBE_SAMPLE_RATE).set_sample_width(2)
+
+
+class Transcriber:
+    """Speech-to-text backend that recognizes one chunk of audio at a time.
+
+    Implementations load their models in ``__init__`` and must be safe to call
+    from several threads, since chunks are recognized concurrently.
+    """
+
+    name = "base"
+    concurrency = TRANSCRIBE_CONCURRENCY
+
+    def recognize(self, chunk: AudioSegment) -> str:
+        raise NotImplementedError
+
+
+class GoogleTranscriber(Transcriber):
+    name = "google"
+
+    def recognize(self, chunk: AudioSegment) -> str:
+        chunk = _to_pcm(chunk)
+        audio = sr.AudioData(chunk.raw_data, chunk.frame_rate, chunk.sample_width)
+        try:
+            return sr.Recognizer().recognize_google(audio, language=STT_LANGUAGE)
+        except sr.UnknownValueError:
+            return ""
+
+
+class VoskTranscriber(Transcriber):
+    """Offline Kaldi recognizer; ``STT_MODEL`` is the path to an unpacked Vosk model."""
+
+    name = "vosk"
+
+    def __init__(self):
+        try:
+            import vosk
+        except ImportError as exc:
+            raise RuntimeError("STT_BACKEND=vosk requires the 'vosk' package") from exc
+        if not STT_MODEL:
+            raise RuntimeError("STT_BACKEND=vosk requires STT_MODEL to point at a Vosk model directory")
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(STT_MODEL)
+
+    def recognize(self, chunk: AudioSegment) -> str:
+        recognizer = self.vosk.KaldiRecognizer(self.model, TRANSCRIBE_SAMPLE_RATE)
+        recognizer.AcceptWaveform(_to_pcm(chunk).raw_data)
+        return json.loads(recognizer.FinalResult()).get("text", "")
+
+
+class FasterWhisperTranscriber(Transcriber):
+    """Local Whisper on CPU via CTranslate2; ``STT_MODEL`` is a model size or path."""
+
+    name = "faster_whisper"
+
+    def __init__(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as exc:
+            raise RuntimeError("STT_BACKEND=faster_whisper requires the 'faster-whisper' package") from exc
+        self.model = WhisperModel(
+            STT_MODEL or "base.en",
+            device="cpu",
+            compute_type=os.getenv("STT_COMPUTE_TYPE", "int8"),
+            num_workers=self.concurrency,
+        )
+
+    def recognize(self, chunk: AudioSegment) -> str:
+        samples = np.frombuffer(_to_pcm(chunk).raw_data, dtype=np.int16)
+        segments, _ = self.model.transcribe(
+            samples.astype(np.float32) / 32768.0,
+            language=STT_LANGUAGE.split("-")[0] or None,
+            beam_size=1,
+            vad_filter=False,
+        )
+        return " ".join(segment.text.strip() for segment in segments)
+
+
+class StubTranscriber(Transcriber):
+    """Deterministic offline backend for tests and benchmarks."""
+
+    name = "stub"
+
+    def recognize(self, chunk: AudioSegment) -> str:
+        return os.getenv("STT_STUB_TEXT") or f"speech lasting {len(chunk)} milliseconds"
+
+
+TRANSCRIBERS = {
+    backend.name: backend
+    for backend in (GoogleTranscriber, VoskTranscriber, FasterWhisperTranscriber, StubTranscriber)
+}
+
+_transcriber: Optional[Transcriber] = None
+_transcriber_lock = threading.Lock()
+
+
+def get_transcriber() -> Transcriber:
+    """Return the configured backend, loading it once and keeping it warm."""
+    global _transcriber
+    with _transcriber_lock:
+        if _transcriber is None:
+            if STT_BACKEND not in TRANSCRIBERS:
+                raise RuntimeError(f"Unknown STT_BACKEND {STT_BACKEND!r}; expected one of {sorted(TRANSCRIBERS)}")
+            _transcriber = TRANSCRIBERS[STT_BACKEND]()
+            logger.info("Loaded %s speech-to-text backend", _transcriber.name)
+    return _transcriber
+
+
+def transcribe_segments(
+    audio: AudioSegment,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    transcriber: Optional[Transcriber] = None,
+) -> list[dict]:
+    """Transcribe the speech in a recording, chunk by chunk in parallel, with the configured backend.
+
+    Returns ``{"start_ms", "end_ms", "speech_ms", "text"}`` segments in
+    recording order; ``speech_ms`` is the talk time the chunk covers. Chunks
+    are passed to the recognizer as in-memory PCM. ``on_progress`` is called
+    from the calling thread with (completed, total) chunk counts.
+    """
+    transcriber = transcriber or get_transcriber()
+    # Voice-activity detection is vectorized, so it runs in this thread.
+    chunks = plan_chunks(audio)
+    record_audio(len(audio) / 1000, transcriber.name, sum(end - start for chunk in chunks for start, end, _ in chunk) / 1000)
+    segments: list[Optional[dict]] = [None] * len(chunks)
+    if not chunks:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, transcriber.concurrency), thread_name_prefix="transcribe") as executor:
+        futures = {
+            executor.submit(transcriber.recognize, _chunk_audio(audio, chunk)): index
+            for index, chunk in enumerate(chunks)
+        }
+        completed = 0
+        for future in as_completed(futures):
+            index = futures[future]
+            start, end = chunks[index][0][0], chunks[index][-1][1]
+            try:
+                text = future.result()
+            except Exception as exc:
+                logger.warning("Transcription of chunk %d-%dms failed: %s", start, end, exc)
+                record_error("transcription")
+                text = ""
+            speech_ms = sum(speech for _, _, speech in chunks[index])
+            segments[index] = {"start_ms": start, "end_ms": end, "speech_ms": speech_ms, "text": text.strip()}
+            completed += 1
+            if on_progress:
+                on_progress(completed, len(chunks))
+
+    return [segment for segment in segments if segment["text"]]
+
+
+def join_segments(segments: list[dict]) -> str:
+    return " ".join(segment["text"] for segment in segments).strip()
+
+
+def speech_summary(segments: list[dict], audio_ms: int) -> dict:
+    """Talk time and the share of the recording that is speech, from transcribed segments."""
+    talk_ms = sum(segment.get("speech_ms", segment["end_ms"] - segment["start_ms"]) for segment in segments)
+    return {"talk_ms": talk_ms, "speech_ratio": round(talk_ms / audio_ms, 4) if audio_ms else None}
+
+
+def transcribe_audio(path: str, on_progress: Optional[Callable[[int, int], None]] = None) -> tuple[str, list[dict]]:
+    """Transcribe an audio file, returning the joined transcript and its timed segments."""
+    try:
+        segments = transcribe_segments(decode_pcm(path), on_progress)
+    except Exception as exc:
+        logger.warning("Transcription of %s failed: %s", path, exc)
+        record_error("transcription")
+        return "", []
+    return join_segments(segments), segments
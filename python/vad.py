@@ -0,0 +1,77 @@
+import os
+from typing import Optional
+
+import numpy as np
+
+
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))
+# A frame is speech when its energy is this many dB above the recording's noise floor...
+VAD_ENERGY_OFFSET_DB = float(os.getenv("VAD_ENERGY_OFFSET_DB", "12"))
+# ...and never when it is quieter than this, however quiet the floor (digital silence).
+VAD_MIN_DBFS = float(os.getenv("VAD_MIN_DBFS", "-50"))
+# Speech regions shorter than this (clicks, knocks, coughs) are dropped.
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "200"))
+# Unvoiced consonants (s, f, sh) are quiet but cross zero often; frames up to
+# this many dB under the threshold count as speech if their zero-crossing rate is high.
+VAD_UNVOICED_DB = 6.0
+VAD_UNVOICED_ZCR = 0.3
+# The quietest 10% of frames set the noise floor.
+NOISE_FLOOR_PERCENTILE = 10
+# Frames are analysed this many at a time to bound the float copy of long recordings.
+FRAMES_PER_BLOCK = 8192
+
+
+def frame_features(samples: np.ndarray, frame_length: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame energy in dBFS and zero-crossing rate of 16-bit mono PCM, over non-overlapping frames."""
+    count = len(samples) // frame_length
+    energy = np.empty(count, dtype=np.float32)
+    zcr = np.empty(count, dtype=np.float32)
+    for first in range(0, count, FRAMES_PER_BLOCK):
+        last = min(count, first + FRAMES_PER_BLOCK)
+        frames = samples[first * frame_length:last * frame_length].reshape(last - first, frame_length).astype(np.float32) / 32768.0
+        energy[first:last] = 10 * np.log10(np.einsum("ij,ij->i", frames, frames) / frame_length + 1e-10)
+        # Remove each frame's DC offset so a biased microphone doesn't hide zero crossings.
+        signs = np.signbit(frames - frames.mean(axis=1, keepdims=True))
+        zcr[first:last] = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frame_length - 1)
+    return energy, zcr
+
+
+def speech_features(samples: np.ndarray, sample_rate: int) -> tuple[np.ndarray, np.ndarray]:
+    """``frame_features`` over VAD_FRAME_MS frames, for ``detect_speech`` and ``region_levels`` to share."""
+    return frame_features(samples, sample_rate * VAD_FRAME_MS // 1000)
+
+
+def detect_speech(
+    samples: np.ndarray, sample_rate: int, min_silence_ms: int, features: Optional[tuple[np.ndarray, np.ndarray]] = None
+) -> list[tuple[int, int]]:
+    """Return the ``(start_ms, end_ms)`` speech regions of 16-bit mono PCM, in order.
+
+    Pauses shorter than ``min_silence_ms`` don't split a region. Every step
+    works on whole arrays of frames, so an hour-long recording is classified
+    in a fraction of a second. Pass ``features`` from ``speech_features`` to
+    reuse a pass already made over the recording.
+    """
+    energy, zcr = features if features is not None else speech_features(samples, sample_rate)
+    if not len(energy):
+        return []
+
+    threshold = max(float(np.percentile(energy, NOISE_FLOOR_PERCENTILE)) + VAD_ENERGY_OFFSET_DB, VAD_MIN_DBFS)
+    speech = (energy > threshold) | ((energy > threshold - VAD_UNVOICED_DB) & (zcr > VAD_UNVOICED_ZCR))
+
+    # Runs of speech frames as [start, end) frame indices.
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    if len(starts) > 1:
+        split = (starts[1:] - ends[:-1]) * VAD_FRAME_MS >= min_silence_ms
+        starts = np.concatenate((starts[:1], starts[1:][split]))
+        ends = np.concatenate((ends[:-1][split], ends[-1:]))
+    long_enough = (ends - starts) * VAD_FRAME_MS >= VAD_MIN_SPEECH_MS
+    return list(zip((starts[long_enough] * VAD_FRAME_MS).tolist(), (ends[long_enough] * VAD_FRAME_MS).tolist()))
+
+
+def region_levels(energy: np.ndarray, regions: list[tuple[int, int]]) -> list[float]:
+    """Median frame energy in dBFS of each ``(start_ms, end_ms)`` region, from ``speech_features`` energies."""
+    return [
+        float(np.median(energy[start // VAD_FRAME_MS:max(end // VAD_FRAME_MS, start // VAD_FRAME_MS + 1)])) if len(energy) else VAD_MIN_DBFS
+        for start, end in regions
+    ]
@@ -0,0 +1,147 @@
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
+from typing import Callable, Optional, Sequence
+
+
+# Transcript tokens sent in one extraction or merge prompt; longer transcripts are split into windows.
+LLM_WINDOW_TOKENS = int(os.getenv("LLM_WINDOW_TOKENS", "4000"))
+# Tokens each window repeats from the end of the previous one, so an exchange cut by the boundary is seen whole.
+LLM_WINDOW_OVERLAP_TOKENS = int(os.getenv("LLM_WINDOW_OVERLAP_TOKENS", "800"))
+LLM_WINDOW_CONCURRENCY = int(os.getenv("LLM_WINDOW_CONCURRENCY", "4"))
+# Questions from neighbouring windows this similar (0-1) are the same question, extracted twice from the overlap.
+DUPLICATE_QUESTION_RATIO = 0.8
+# Matches llm.estimate_tokens: roughly four characters per token.
+CHARS_PER_TOKEN = 4
+
+
+def plan_windows(
+    costs: Sequence[float],
+    budget: float = LLM_WINDOW_TOKENS,
+    overlap: float = LLM_WINDOW_OVERLAP_TOKENS,
+    can_start: Optional[Callable[[int], bool]] = None,
+) -> list[tuple[int, int]]:
+    """Split items with the given token ``costs`` into ``[start, end)`` windows of at most ``budget`` tokens.
+
+    Each window after the first starts ``overlap`` tokens before the end of
+    the previous one. With ``can_start``, it moves further back to the nearest
+    item where a window may start, as long as it still moves forward.
+    """
+    windows: list[tuple[int, int]] = []
+    start = 0
+    while start < len(costs):
+        end, size = start, 0.0
+        # A single item over budget still gets a window of its own.
+        while end < len(costs) and (end == start or size + costs[end] <= budget):
+            size += costs[end]
+            end += 1
+        windows.append((start, end))
+        if end >= len(costs):
+            break
+        back, size = end, 0.0
+        while back - 1 > start and size + costs[back - 1] <= overlap:
+            back -= 1
+            size += costs[back]
+        if can_start:
+            preferred = next((index for index in range(back, start, -1) if can_start(index)), None)
+            back = preferred if preferred is not None else back
+        start = back
+    return windows
+
+
+def text_windows(text: str, budget: float = LLM_WINDOW_TOKENS, overlap: float = LLM_WINDOW_OVERLAP_TOKENS) -> list[str]:
+    """Split a transcript into overlapping windows of whole words."""
+    if len(text) / CHARS_PER_TOKEN <= budget:
+        return [text] if text.strip() else []
+    words = text.split()
+    costs = [(len(word) + 1) / CHARS_PER_TOKEN for word in words]
+    return [" ".join(words[start:end]) for start, end in plan_windows(costs, budget, overlap)]
+
+
+def transcript_pair_windows(
+    first: str, second: str, budget: float = LLM_WINDOW_TOKENS, overlap: float = LLM_WINDOW_OVERLAP_TOKENS
+) -> list[tuple[str, str]]:
+    """Split two transcripts of the same conversation into matching windows.
+
+    With no timestamps to line them up, the n-th window takes the same share of
+    each transcript, plus the overlap, on the assumption that both cover the
+    conversation at a similar pace.
+    """
+    words = [first.split(), second.split()]
+    total = sum(len(text) for text in (first, second)) / CHARS_PER_TOKEN
+    if total <= budget:
+        return [(first, second)]
+    count = math.ceil(total / max(1.0, budget - overlap))
+    share = overlap / total
+    windows = []
+    for index in range(count):
+        low, high = max(0.0, index / count - share), (index + 1) / count
+        windows.append(tuple(" ".join(items[round(low * len(items)):round(high * len(items))]) for items in words))
+    return windows
+
+
+def _normalize(question: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9']+", question.lower()))
+
+
+def same_question(first: str, second: str) -> bool:
+    first, second = _normalize(first), _normalize(second)
+    if not first or not second:
+        return False
+    # A question cut by the window boundary is a prefix or suffix of the whole one.
+    if first in second or second in first:
+        return True
+    return SequenceMatcher(None, first, second, autojunk=False).ratio() >= DUPLICATE_QUESTION_RATIO
+
+
+def stitch_pairs(windows: list[list[dict]]) -> list[dict]:
+    """Concatenate the Q&A pairs of consecutive windows, dropping the ones extracted twice from an overlap.
+
+    A pair is only compared with the previous window's pairs, so a question the
+    interviewer genuinely repeats later on is kept. Of two copies, the one with
+    the longer answer wins: the other was usually cut off by a window boundary.
+    """
+    stitched: list[dict] = []
+    previous = 0
+    for pairs in windows:
+        current = len(stitched)
+        for pair in pairs:
+            match = next((index for index in range(previous, current) if same_question(stitched[index]["question"], pair["question"])), None)
+            if match is None:
+                stitched.append(pair)
+            elif len(pair["answer"]) > len(stitched[match]["answer"]):
+                stitched[match] = pair
+        previous = current
+    return stitched
+
+
+def map_windows(
+    windows: list,
+    extract: Callable[[object], list[dict]],
+    on_result: Optional[Callable[[int, list[dict]], None]] = None,
+    concurrency: int = LLM_WINDOW_CONCURRENCY,
+) -> list[list[dict]]:
+    """Run ``extract`` over the windows concurrently and return their pairs in window order.
+
+    ``on_result`` is called from the calling thread as each window finishes, so
+    it may use the caller's database session. A failed window doesn't stop the
+    others; the first error is raised once they are done, after their results were reported.
+    """
+    results: list[Optional[list[dict]]] = [None] * len(windows)
+    error: Optional[BaseException] = None
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="window") as executor:
+        futures = {executor.submit(extract, window): index for index, window in enumerate(windows)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as exc:
+                error = error or exc
+                continue
+            if on_result:
+                on_result(index, results[index])
+    if error:
+        raise error
+    return results